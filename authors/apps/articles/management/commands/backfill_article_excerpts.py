@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from authors.apps.articles.models import Article
+from authors.apps.articles.utils import make_excerpt
+
+
+class Command(BaseCommand):
+    help = 'Stores the excerpt of every article that does not have one yet.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        articles = Article.objects.filter(excerpt='').exclude(
+            body='').order_by().values_list('pk', 'body')
+        batch, updated = [], 0
+        for row in articles.iterator(chunk_size=options['batch_size']):
+            batch.append(row)
+            if len(batch) == options['batch_size']:
+                updated += self.store(batch)
+                batch = []
+        updated += self.store(batch)
+        self.stdout.write('Stored {} excerpts.'.format(updated))
+
+    def store(self, batch):
+        # an update per row, without Article.save() and its side effects
+        with transaction.atomic():
+            for pk, body in batch:
+                Article.objects.filter(pk=pk).update(
+                    excerpt=make_excerpt(body))
+        return len(batch)
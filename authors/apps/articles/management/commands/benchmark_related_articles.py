@@ -0,0 +1,94 @@
+import time
+from contextlib import contextmanager
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from authors.apps.articles import related
+
+
+class Command(BaseCommand):
+    help = ('Times finding related articles for a synthetic corpus, '
+            'without the database, and checks the neighbours found '
+            'against exact TF-IDF cosine similarities for a sample.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--articles', type=int, default=100000)
+        parser.add_argument('--words', type=int, default=300,
+                            help='Words per article body.')
+        parser.add_argument('--topics', type=int, default=200)
+        parser.add_argument('--sample', type=int, default=100,
+                            help='Articles checked against exact scores.')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        random = np.random.RandomState(options['seed'])
+        count = settings.RELATED_ARTICLES_COUNT
+
+        with self.timed('Generated {} articles'.format(options['articles'])):
+            texts = list(self.texts(random, options))
+        with self.timed('Counted terms'):
+            corpus = related.Corpus()
+            for title, body in texts:
+                corpus.add(related.document_terms(title, '', body))
+        with self.timed('Chose vocabulary'):
+            vocabulary, counts = corpus.vocabulary(
+                settings.RELATED_ARTICLES_TERMS)
+            rows = related.SparseRows.weigh(counts, vocabulary.idf)
+        with self.timed('Found {} neighbours of every article'.format(count)):
+            found = related.neighbours(rows, count, len(vocabulary))
+        with self.timed('Scored one new article against the others'):
+            top = rows.top(related.TOP_TERMS)
+            exclude = np.array([0])
+            picked = related.candidates(
+                related.SparseRows.stack([top.row(0)]),
+                related.Postings(top, len(vocabulary)), related.CANDIDATES,
+                exclude)
+            related.rerank(related.SparseRows.stack([rows.row(0)]), picked,
+                           rows, count, len(vocabulary),
+                           excluded=picked == exclude[:, None])
+
+        sample = random.choice(len(rows), options['sample'], replace=False)
+        exact = self.exact_scores(rows, sample, len(vocabulary))
+        best = -np.sort(-exact, axis=1)[:, :count]
+        self.stdout.write(
+            'Mean similarity of the neighbours found: {:.3f}, of the most '
+            'similar articles: {:.3f}'.format(
+                np.mean([scores.sum() for _, scores in
+                         (found[query] for query in sample)]) / count,
+                best[best >= related.MIN_SCORE].sum() / best.size))
+
+    def texts(self, random, options):
+        """Articles on one topic each, drawing on a Zipf-like shared
+        vocabulary and a few hundred words of their topic."""
+        words = np.array(['w{}'.format(word) for word in range(50000)])
+        topical = options['words'] // 3
+        shared = 1 / np.arange(1, len(words) + 1)
+        topics = random.randint(options['topics'], size=options['articles'])
+        topic_words = (topics[:, None] * 250 + random.randint(
+            250, size=(options['articles'], topical))) % len(words)
+        shared_words = random.choice(
+            len(words), (options['articles'], options['words'] - topical),
+            p=shared / shared.sum())
+        for article_words, article_shared in zip(topic_words, shared_words):
+            yield (' '.join(words[article_words[:5]]),
+                   ' '.join(words[np.concatenate(
+                       [article_words, article_shared])]))
+
+    def exact_scores(self, rows, sample, width):
+        """Similarities of the `sample` rows to all rows, by brute force."""
+        queries = rows.dense(sample, width)
+        scores = np.empty((len(sample), len(rows)), np.float32)
+        for row in range(len(rows)):
+            columns, weights = rows.row(row)
+            scores[:, row] = queries[:, columns] @ weights
+        scores[np.arange(len(sample)), sample] = 0
+        return scores
+
+    @contextmanager
+    def timed(self, message):
+        started = time.monotonic()
+        yield
+        self.stdout.write('{}: {:.2f}s'.format(
+            message, time.monotonic() - started))
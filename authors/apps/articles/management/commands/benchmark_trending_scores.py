@@ -0,0 +1,87 @@
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import (setup_test_environment,
+                               teardown_test_environment)
+
+from authors.apps.articles import trending
+from authors.apps.core.benchmarks import plans
+from authors.apps.core.testing import local_caches
+
+
+class Command(BaseCommand):
+    help = ('Times scoring a synthetic corpus by trending, without the '
+            'database, and checks the scores of a sample against a plain '
+            'sum of decayed weights. Then times recomputing the scores end '
+            'to end, from the event counts to the saved scores, on a '
+            'throwaway seeded database.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--articles', type=int, default=100000)
+        parser.add_argument('--events', type=int, default=5000000,
+                            help='Hourly event counts, as grouped queries '
+                                 'return them.')
+        parser.add_argument('--days', type=int, default=365,
+                            help='How far back events go.')
+        parser.add_argument('--sample', type=int, default=100)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--seeded-articles', type=int, default=20000,
+                            help='Articles seeded for the end to end run, '
+                                 'with likes, comments and reviews.')
+
+    def handle(self, *args, **options):
+        random = np.random.RandomState(options['seed'])
+        articles, events = options['articles'], options['events']
+        now = 2000.0
+        span = options['days'] * 24 / 48
+        created = now - random.uniform(0, span, articles)
+        # popular articles get most events, after they were created
+        owners = random.zipf(1.3, events) % articles
+        indices = np.concatenate([np.arange(articles), owners])
+        times = np.concatenate([created, created[owners] + random.uniform(
+            0, 1, events) * (now - created[owners])])
+        weights = np.concatenate([np.ones(articles), random.choice(
+            [1.0, 2.0, 3.0], events)])
+
+        started = time.monotonic()
+        scores = trending.decayed_scores(indices, times, weights, articles)
+        self.stdout.write('Scored {} articles with {} events: {:.2f}s'.format(
+            articles, events, time.monotonic() - started))
+
+        sample = random.choice(articles, options['sample'], replace=False)
+        worst = 0
+        for article in sample:
+            mine = indices == article
+            # decayed to now, where the plain powers of two fit a float
+            expected = np.sum(weights[mine] * np.exp2(times[mine] - now))
+            worst = max(worst, abs(scores[article] - now - np.log2(expected)))
+        self.stdout.write('Largest difference from the plain sums in the '
+                          'sample: {:.2e} half-lives'.format(worst))
+
+        self.end_to_end(options['seeded_articles'])
+
+    def end_to_end(self, articles):
+        setup_test_environment()
+        caches = local_caches()
+        caches.enable()
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            plans.seed(articles)
+            started = time.monotonic()
+            pks, stored, indices, times, weights = trending.gather()
+            self.stdout.write(
+                'Read {} articles and {} hourly event counts: {:.2f}s'.format(
+                    len(pks), len(indices) - len(pks),
+                    time.monotonic() - started))
+            started = time.monotonic()
+            changed = trending.recompute()
+            self.stdout.write(
+                'Recomputed end to end, {} scores saved: {:.2f}s'.format(
+                    changed, time.monotonic() - started))
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            caches.disable()
+            teardown_test_environment()
@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from authors.apps.articles import trending
+
+
+class Command(BaseCommand):
+    help = ('Recomputes the trending score of every article from its '
+            'likes, comments, favorites, reviews and bookmarks.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--every', type=float, default=None,
+            help='Recompute every this many seconds until interrupted.')
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.monotonic()
+            changed = trending.recompute()
+            self.stdout.write('Updated {} trending scores in {:.1f}s'.format(
+                changed, time.monotonic() - started))
+            if options['every'] is None:
+                return
+            time.sleep(options['every'])
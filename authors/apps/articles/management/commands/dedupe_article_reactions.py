@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Max
+
+from authors.apps.articles.models import LikeArticles
+
+
+class Command(BaseCommand):
+    help = ('Keeps only the latest reaction of each user to an article, '
+            'so the (user, article) unique constraint can be added.')
+
+    def handle(self, *args, **options):
+        # on a fresh database this runs before the articles migrations
+        if LikeArticles._meta.db_table not in \
+                connection.introspection.table_names():
+            self.stdout.write('No reactions table yet, nothing to dedupe.')
+            return
+        latest = LikeArticles.objects.values('user', 'article').annotate(
+            latest=Max('pk')).values('latest').order_by()
+        deleted, _ = LikeArticles.objects.exclude(pk__in=latest).delete()
+        self.stdout.write('Deleted {} duplicate reactions.'.format(deleted))
@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from authors.apps.articles.models import Article, ReviewsModel
+from authors.apps.core.cache import invalidate
+
+
+def review_aggregate(aggregate, **filters):
+    """Subquery computing `aggregate` over the reviews of the outer
+    article, or 0 when it has none."""
+    reviews = ReviewsModel.objects.filter(
+        article=OuterRef('pk'), **filters).order_by().values('article')
+    return Coalesce(Subquery(
+        reviews.annotate(value=aggregate).values('value'),
+        output_field=IntegerField()), 0)
+
+
+class Command(BaseCommand):
+    help = ('Recomputes the rating aggregates stored on every article from '
+            'its reviews. A backfill: a review saved while it runs can be '
+            'overwritten, so run it while reviews are not being written.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--if-empty', action='store_true',
+            help='Only recompute when no article has ratings stored yet.')
+
+    def handle(self, *args, **options):
+        if options['if_empty'] and (
+                Article.objects.filter(rating_count__gt=0).exists() or
+                not ReviewsModel.objects.exists()):
+            return
+        # Under READ COMMITTED a review committed during this UPDATE bumps
+        # its article row, which the UPDATE then overwrites with counts
+        # read before the review: the review is lost from the aggregates.
+        changes = {
+            'rating_sum': review_aggregate(Sum('rating_value')),
+            'rating_count': review_aggregate(Count('id')),
+        }
+        for star in range(6):
+            changes['rating_star_{}'.format(star)] = review_aggregate(
+                Count('id'), rating_value=star)
+        updated = Article.objects.update(**changes)
+        for article_id in ReviewsModel.objects.values_list(
+                'article_id', flat=True).distinct().order_by().iterator():
+            invalidate('article', article_id)
+        self.stdout.write('Recomputed ratings for {} articles.'.format(
+            updated))
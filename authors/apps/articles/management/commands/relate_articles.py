@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from authors.apps.articles import related
+
+
+class Command(BaseCommand):
+    help = ('Finds the related articles of articles created or changed '
+            'since the last run, or of every article with --rebuild.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rebuild', action='store_true',
+            help='Rebuild the vocabulary and score every article.')
+        parser.add_argument(
+            '--every', type=float, default=None,
+            help='Update every this many seconds until interrupted.')
+
+    def handle(self, *args, **options):
+        job = related.rebuild if options['rebuild'] else related.update
+        while True:
+            self.run(job)
+            if options['every'] is None:
+                return
+            time.sleep(options['every'])
+            job = related.update
+
+    def run(self, job):
+        started = time.monotonic()
+        scored = job()
+        self.stdout.write('Scored {} articles in {:.1f}s'.format(
+            scored, time.monotonic() - started))
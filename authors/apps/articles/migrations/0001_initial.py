@@ -0,0 +1,148 @@
+# Generated by Django 2.1.7 on 2026-10-19 17:02
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Article',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=100)),
+                ('body', models.TextField()),
+                ('description', models.CharField(max_length=128, null=True)),
+                ('excerpt', models.TextField(blank=True, default='')),
+                ('is_published', models.BooleanField(default=False)),
+                ('date_created', models.DateTimeField(auto_now_add=True)),
+                ('date_modified', models.DateTimeField(auto_now=True)),
+                ('slug', models.SlugField(max_length=120, unique=True)),
+                ('read_time', models.CharField(max_length=10)),
+                ('word_count', models.IntegerField(null=True)),
+                ('revision', models.IntegerField(default=1)),
+                ('rating_sum', models.IntegerField(default=0)),
+                ('rating_count', models.IntegerField(default=0)),
+                ('rating_star_0', models.IntegerField(default=0)),
+                ('rating_star_1', models.IntegerField(default=0)),
+                ('rating_star_2', models.IntegerField(default=0)),
+                ('rating_star_3', models.IntegerField(default=0)),
+                ('rating_star_4', models.IntegerField(default=0)),
+                ('rating_star_5', models.IntegerField(default=0)),
+                ('trending_score', models.FloatField(default=0)),
+            ],
+            options={
+                'ordering': ('-date_created',),
+            },
+        ),
+        migrations.CreateModel(
+            name='ArticleImage',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('image_url', models.TextField(null=True)),
+                ('public_id', models.CharField(max_length=30, null=True)),
+                ('width', models.IntegerField(default=0)),
+                ('height', models.IntegerField(default=0)),
+                ('date_created', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ('-date_created',),
+            },
+        ),
+        migrations.CreateModel(
+            name='FavoriteModel',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('favorite', models.BooleanField(default=False)),
+                ('date_created', models.DateTimeField(auto_now_add=True)),
+                ('date_modified', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ('-date_created',),
+            },
+        ),
+        migrations.CreateModel(
+            name='Highlight',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date_created', models.DateTimeField(auto_now_add=True)),
+                ('start', models.PositiveIntegerField()),
+                ('end', models.PositiveIntegerField()),
+                ('section', models.TextField()),
+                ('comment', models.TextField(blank=True, default='')),
+            ],
+            options={
+                'ordering': ('-date_created',),
+            },
+        ),
+        migrations.CreateModel(
+            name='LikeArticles',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('likes', models.IntegerField(null=True)),
+                ('created_on', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ('created_on',),
+            },
+        ),
+        migrations.CreateModel(
+            name='RelatedArticle',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('rank', models.PositiveSmallIntegerField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='RelatedTerm',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=255, unique=True)),
+                ('column', models.IntegerField(unique=True)),
+                ('idf', models.FloatField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='RelatedVocabulary',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('articles', models.IntegerField()),
+                ('built_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ReviewsModel',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('review_body', models.TextField(blank=True)),
+                ('rating_value', models.IntegerField(default=0)),
+                ('date_created', models.DateTimeField(auto_now_add=True)),
+                ('date_modified', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ('-date_created',),
+            },
+        ),
+        migrations.CreateModel(
+            name='ArticleVector',
+            fields=[
+                ('article', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='vector', serialize=False, to='articles.Article')),
+                ('revision', models.IntegerField()),
+                ('terms', models.BinaryField()),
+                ('weights', models.BinaryField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='reviewsmodel',
+            name='article',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='article_review', to='articles.Article'),
+        ),
+    ]
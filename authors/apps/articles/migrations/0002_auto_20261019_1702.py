@@ -0,0 +1,104 @@
+# Generated by Django 2.1.7 on 2026-10-19 17:02
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import taggit.managers
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('taggit', '0003_taggeditem_add_unique_index'),
+        ('articles', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reviewsmodel',
+            name='reviewed_by',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rating', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='relatedarticle',
+            name='article',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_articles', to='articles.Article'),
+        ),
+        migrations.AddField(
+            model_name='relatedarticle',
+            name='related',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='articles.Article'),
+        ),
+        migrations.AddField(
+            model_name='likearticles',
+            name='article',
+            field=models.ForeignKey(db_column='article', on_delete=django.db.models.deletion.CASCADE, related_name='liked', to='articles.Article'),
+        ),
+        migrations.AddField(
+            model_name='likearticles',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='liked_by', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='highlight',
+            name='article',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='highlights', to='articles.Article'),
+        ),
+        migrations.AddField(
+            model_name='highlight',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='highlighter', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='favoritemodel',
+            name='article',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='favorite', to='articles.Article'),
+        ),
+        migrations.AddField(
+            model_name='favoritemodel',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='favorite', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='articleimage',
+            name='article',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='article_images', to='articles.Article'),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='author',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='articles', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='tags',
+            field=taggit.managers.TaggableManager(blank=True, help_text='A comma-separated list of tags.', through='taggit.TaggedItem', to='taggit.Tag', verbose_name='Tags'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='reviewsmodel',
+            unique_together={('article', 'reviewed_by')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='relatedarticle',
+            unique_together={('article', 'rank')},
+        ),
+        migrations.AddIndex(
+            model_name='likearticles',
+            index=models.Index(fields=['article', 'likes'], name='articles_li_article_8dda21_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='likearticles',
+            unique_together={('user', 'article')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='highlight',
+            unique_together={('user', 'article', 'start', 'end', 'comment')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='favoritemodel',
+            unique_together={('user', 'article')},
+        ),
+    ]
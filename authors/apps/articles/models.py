@@ -1,9 +1,12 @@
-from django.db import models
-from django.db.models import Avg
-from cloudinary.models import CloudinaryField
+from django.db import connection, models, transaction
+from django.db.models import F
+from django.dispatch import Signal
 from ..authentication.models import User
+from ..core.cache import invalidate
+from django.utils import timezone
 from django.utils.text import slugify
-from .utils import generate_slug, get_readtime
+from .utils import (apply_edits, count_words, generate_slug,
+                    initial_trending_score, make_excerpt, readtime_of_words)
 from taggit.managers import TaggableManager
 
 
@@ -11,29 +14,143 @@ class Article(models.Model):
     title = models.CharField(max_length=100, blank=False)
     body = models.TextField(blank=False, null=False)
     description = models.CharField(max_length=128, null=True)
+    # shown in article lists instead of the body
+    excerpt = models.TextField(blank=True, default='')
     tags = TaggableManager(blank=True)
     is_published = models.BooleanField(default=False)
     date_created = models.DateTimeField(auto_now_add=True)
     date_modified = models.DateTimeField(auto_now=True)
     slug = models.SlugField(max_length=120, db_index=True, unique=True)
     read_time = models.CharField(max_length=10, null=False, blank=False)
+    # null until the article is next saved; see apply_edits
+    word_count = models.IntegerField(null=True)
+    # bumped by every change, so edits can be made against a known version
+    revision = models.IntegerField(default=1)
     author = models.ForeignKey(
         User, related_name='articles',
         on_delete=models.CASCADE)
+    # review aggregates, kept up to date by ReviewsModel
+    rating_sum = models.IntegerField(default=0)
+    rating_count = models.IntegerField(default=0)
+    rating_star_0 = models.IntegerField(default=0)
+    rating_star_1 = models.IntegerField(default=0)
+    rating_star_2 = models.IntegerField(default=0)
+    rating_star_3 = models.IntegerField(default=0)
+    rating_star_4 = models.IntegerField(default=0)
+    rating_star_5 = models.IntegerField(default=0)
+    # decayed weight of the article's events, kept by trending.recompute
+    trending_score = models.FloatField(default=0)
+
+    RATING_FIELDS = ('rating_sum', 'rating_count') + tuple(
+        'rating_star_{}'.format(star) for star in range(6))
+    DERIVED_FIELDS = RATING_FIELDS + ('trending_score',)
 
     def __str__(self):
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        article = super().from_db(db, field_names, values)
+        # whether the article is published as stored, so post_save
+        # receivers can tell it was published or unpublished; None if
+        # not loaded
+        article.saved_is_published = article.__dict__.get('is_published')
+        return article
+
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = generate_slug(self.title)
         article = Article.objects.filter(slug=self.slug).first()
         if article and article.title != self.title:
             self.slug = generate_slug(self.title)
-        self.read_time = get_readtime(self.body)
+        self.word_count = count_words(self.body)
+        self.read_time = readtime_of_words(self.word_count)
+        self.excerpt = make_excerpt(self.body)
+        updating = not self._state.adding and self.pk
+        if updating:
+            self.revision = F('revision') + 1
+            if kwargs.get('update_fields') is None:
+                # the rating and trending columns are only ever changed in
+                # the database, so saving an article must not write back
+                # the values it loaded
+                kwargs['update_fields'] = [
+                    field.name for field in self._meta.concrete_fields
+                    if not field.primary_key and
+                    field.name not in self.DERIVED_FIELDS]
+        else:
+            self.trending_score = initial_trending_score(timezone.now())
         super(Article, self).save(*args, **kwargs)
+        if updating:
+            self.refresh_from_db(fields=['revision'])
+        self.saved_is_published = self.is_published
+
+    def apply_edits(self, revision, edits):
+        """
+        Applies `edits` (see `utils.apply_edits`) to the body, provided the
+        article is still at `revision`. The check and the write are one
+        UPDATE, so of two edits made against the same revision only the
+        first is applied.
+
+        Returns True if the edits were applied; the article then holds the
+        new body and revision. Returns False if the article has moved on
+        from `revision`.
+        """
+        if revision != self.revision:
+            return False
+        body, word_count = apply_edits(self.body, edits, self.word_count)
+        changes = {
+            'body': body,
+            'word_count': word_count,
+            'read_time': readtime_of_words(word_count),
+            'excerpt': make_excerpt(body),
+            'date_modified': timezone.now(),
+        }
+        updated = Article.objects.filter(
+            pk=self.pk, revision=revision).update(
+            revision=F('revision') + 1, **changes)
+        if not updated:
+            return False
+        for field, value in changes.items():
+            setattr(self, field, value)
+        self.revision = revision + 1
+        return True
+
+    @property
+    def average_rating(self):
+        if not self.rating_count:
+            return None
+        return self.rating_sum / self.rating_count
+
+    @property
+    def rating_histogram(self):
+        return {str(star): getattr(self, 'rating_star_{}'.format(star))
+                for star in range(6)}
+
+    @staticmethod
+    def update_ratings(article_id, removed=None, added=None):
+        """
+        Moves one review's rating from `removed` to `added` in the stored
+        aggregates, either of which may be None. Done as a single UPDATE
+        so concurrent reviews cannot overwrite each other's counts.
+        """
+        changes = {}
+        if removed is not None:
+            changes['rating_sum'] = F('rating_sum') - removed
+            changes['rating_count'] = F('rating_count') - 1
+            changes['rating_star_{}'.format(removed)] = F(
+                'rating_star_{}'.format(removed)) - 1
+        if added is not None:
+            changes['rating_sum'] = changes.get(
+                'rating_sum', F('rating_sum')) + added
+            changes['rating_count'] = changes.get(
+                'rating_count', F('rating_count')) + 1
+            star = 'rating_star_{}'.format(added)
+            changes[star] = changes.get(star, F(star)) + 1
+        if changes:
+            Article.objects.filter(pk=article_id).update(**changes)
 
     class Meta:
+        # the list's published-only indexes are in core/indexes.py
         ordering = ('-date_created',)
 
 
@@ -65,11 +182,33 @@ class ReviewsModel(models.Model):
     date_created = models.DateTimeField(auto_now_add=True)
     date_modified = models.DateTimeField(auto_now=True)
 
-    @staticmethod
-    def average_rating(article):
-        avg = ReviewsModel.objects.filter(
-            article=article).aggregate(Avg('rating_value'))
-        return avg
+    class Meta:
+        ordering = ('-date_created',)
+        unique_together = ('article', 'reviewed_by',)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        review = super().from_db(db, field_names, values)
+        # the rating currently counted in the article's aggregates
+        review.saved_rating = review.rating_value
+        return review
+
+    def save(self, *args, **kwargs):
+        previous = None if self._state.adding else getattr(
+            self, 'saved_rating', None)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if previous != self.rating_value:
+                Article.update_ratings(self.article_id, removed=previous,
+                                       added=self.rating_value)
+        self.saved_rating = self.rating_value
+
+
+# sent by `LikeArticles.react_to_article`, whose raw SQL sends no
+# post_save or post_delete
+reaction_changed = Signal(providing_args=['article_id'])
+
+
 class LikeArticles(models.Model):
     """
     Class handles model for recording like/dislike, user, and article
@@ -89,46 +228,56 @@ class LikeArticles(models.Model):
     created_on = models.DateTimeField(auto_now=True)
     class Meta:
         ordering = ('created_on',)
+        unique_together = ('user', 'article',)
+        indexes = [
+            # an article's likes or dislikes, counted off the index
+            models.Index(fields=['article', 'likes']),
+        ]
 
     @staticmethod
     def react_to_article(user, article, value):
         """
-        method handles the logic for liking or disliking 
-        an article
+        Toggles the user's `value` reaction (1 to like, 0 to dislike) to
+        the article: adds it, switches the other reaction to it or, if the
+        user already has it, removes it. Returns True if the user now has
+        the reaction and False if it was removed.
+
+        The toggle is a single upsert that locks the user's row, so
+        concurrent toggles are applied one after the other and cannot
+        leave duplicate rows. A removed reaction is set to NULL by the
+        upsert and deleted while the row is still locked.
         """
-        user_reaction = LikeArticles.objects.filter(
-            user=user,
-            article=article
-            ).values('likes',)
-        # if the 'likes' field in the model is empty, a new instance
-        # is created with the user's reaction to an article
-        if len(user_reaction) == 0:
-            LikeArticles.objects.create(
-                user=user,
-                article=article,
-                likes=value
-            )
-            return True
-        # if the 'likes' field has a character matching the value, the 
-        # model takes it that the user wants to revert their reaction
-        # to that particular article   
-        elif user_reaction[0]['likes'] == value:
-            LikeArticles.objects.filter(
-                user=user,
-                article=article).delete()
-            return False
-        # if 'likes' field is not empty and the character doesn't match
-        # the value provided, that row is deleted and a new instance is 
-        # created with the new reaction to the article
-        LikeArticles.objects.filter(
-            user=user,
-            article=article).delete()
-        LikeArticles.objects.create(
-            user=user,
-            article=article,
-            likes=value
-        )
-        return True
+        meta = LikeArticles._meta
+        table = connection.ops.quote_name(meta.db_table)
+        user_column, article_column, likes_column, created_column = (
+            connection.ops.quote_name(meta.get_field(name).column)
+            for name in ('user', 'article', 'likes', 'created_on'))
+        created_on = meta.get_field('created_on').get_db_prep_value(
+            timezone.now(), connection)
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                'INSERT INTO {table} ({user}, {article}, {likes}, {created}) '
+                'VALUES (%s, %s, %s, %s) '
+                'ON CONFLICT ({user}, {article}) DO UPDATE SET '
+                '{likes} = CASE WHEN {table}.{likes} = EXCLUDED.{likes} '
+                'THEN NULL ELSE EXCLUDED.{likes} END, '
+                '{created} = EXCLUDED.{created} '
+                'RETURNING {likes}'.format(
+                    table=table, user=user_column, article=article_column,
+                    likes=likes_column, created=created_column),
+                [user.pk, article.pk, value, created_on])
+            likes = cursor.fetchone()[0]
+            if likes is None:
+                cursor.execute(
+                    'DELETE FROM {table} WHERE {user} = %s AND '
+                    '{article} = %s'.format(
+                        table=table, user=user_column,
+                        article=article_column),
+                    [user.pk, article.pk])
+        # raw SQL sends no post_save or post_delete
+        invalidate('article', article.pk)
+        reaction_changed.send(sender=LikeArticles, article_id=article.pk)
+        return likes is not None
 
 
 class FavoriteModel(models.Model):
@@ -150,6 +299,28 @@ class FavoriteModel(models.Model):
         return '{}-{}'.format(self.user.username, self.article.title)
 
 
+class HighlightQuerySet(models.QuerySet):
+
+    def overlapping(self, start, end=None):
+        """
+        Highlights covering any position from `start` to `end`, or to the
+        end of the body when `end` is None, through the `highlight_span`
+        index (`core/indexes.py`).
+        """
+        if connection.vendor == 'postgresql':
+            # the same expression as the GiST index, which Django 2.1 has
+            # no lookup for without psycopg2's range types
+            table = connection.ops.quote_name(Highlight._meta.db_table)
+            return self.extra(
+                where=["int4range({0}.\"start\", {0}.\"end\", '[]') && "
+                       "int4range(%s, %s, '[]')".format(table)],
+                params=[start, end])
+        highlights = self.filter(end__gte=start)
+        if end is not None:
+            highlights = highlights.filter(start__lte=end)
+        return highlights
+
+
 class Highlight(models.Model):
     """Class that has the fields for highlights made by a user"""
     article = models.ForeignKey(Article, related_name='highlights',
@@ -162,6 +333,49 @@ class Highlight(models.Model):
     section = models.TextField()
     comment = models.TextField(blank=True, null=False, default='')
 
+    objects = HighlightQuerySet.as_manager()
+
     class Meta:
         unique_together = ['user', 'article', 'start', 'end', 'comment']
         ordering = ('-date_created',)
+
+
+class RelatedTerm(models.Model):
+    """A word of the vocabulary related articles are found with; see
+    `related.py`"""
+    term = models.CharField(max_length=255, unique=True)
+    column = models.IntegerField(unique=True)
+    idf = models.FloatField()
+
+
+class RelatedVocabulary(models.Model):
+    """How many articles the vocabulary was built from, and when; one
+    row, replaced by every rebuild"""
+    articles = models.IntegerField()
+    built_at = models.DateTimeField(default=timezone.now)
+
+
+class ArticleVector(models.Model):
+    """The TF-IDF vector of an article as of `revision`: the columns of
+    its terms as packed int32s and their weights as packed float32s"""
+    article = models.OneToOneField(Article, primary_key=True,
+                                   related_name='vector',
+                                   on_delete=models.CASCADE)
+    revision = models.IntegerField()
+    terms = models.BinaryField()
+    weights = models.BinaryField()
+
+
+class RelatedArticle(models.Model):
+    """One of the articles most similar to an article, `rank` 0 being
+    the most similar"""
+    article = models.ForeignKey(Article, related_name='related_articles',
+                                on_delete=models.CASCADE)
+    related = models.ForeignKey(Article, related_name='+',
+                                on_delete=models.CASCADE)
+    score = models.FloatField()
+    rank = models.PositiveSmallIntegerField()
+
+    class Meta:
+        # an article's list is read straight off this index
+        unique_together = ('article', 'rank')
@@ -0,0 +1,590 @@
+"""
+Related articles.
+
+Each article is described by its TF-IDF vector: the words of its title,
+description, body and tags, title and tag words counting twice, each
+weighing (1 + log count) * idf, scaled to unit length. The vocabulary is
+the `settings.RELATED_ARTICLES_TERMS` words found in the most articles,
+leaving out words found in only one, which cannot relate anything. The
+related articles of an article are those with the most similar vectors
+by cosine.
+
+Vectors are kept as NumPy arrays in compressed sparse row form. Rather
+than comparing every pair of articles, each is compared in full only
+with the CANDIDATES articles that share the most weight in their
+TOP_TERMS heaviest terms, found through an inverted index of those
+terms. Articles are worked through in blocks of
+`settings.RELATED_ARTICLES_BLOCK_SIZE`, with every step of a block a
+handful of array operations.
+
+Only published articles are scored and listed. `rebuild()` scores every
+one and replaces the vocabulary, the stored vectors and the
+`RelatedArticle` rows the detail view reads. `update()` scores only the
+articles published, created or changed since (their `revision` differs
+from the one their vector was made from) against the stored vectors, and
+moves them into or out of the other articles' lists. `python manage.py
+relate_articles` runs either. An article that is unpublished is taken out
+of every list by `retire()` at once.
+
+The vocabulary and its IDF only change on a rebuild, so `update()`
+rebuilds instead once the number of published articles has drifted by
+`settings.RELATED_ARTICLES_REBUILD_DRIFT` from the number the vocabulary
+was built from, or the vocabulary is older than
+`settings.RELATED_ARTICLES_REBUILD_DAYS`.
+"""
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Min, Q
+from django.utils import timezone
+
+from authors.apps.core.cache import invalidate
+from authors.apps.core.startup import lazy_import
+from authors.apps.tags.models import ArticleTag
+
+from .models import (Article, ArticleVector, RelatedArticle, RelatedTerm,
+                     RelatedVocabulary)
+from .utils import WORD
+
+# the detail view only reads stored lists, so web processes import NumPy
+# only if they score articles
+np = lazy_import('numpy')
+
+STOP_WORDS = frozenset("""
+    a about after all also an and any are as at be because been but by can
+    could did do does for from had has have he her his how i if in into is
+    it its just more most my no not of on one or our out she so some than
+    that the their them then there these they this to up us was we were
+    what when which who will with would you your
+""".split())
+# the terms of an article its candidates are found with
+TOP_TERMS = 20
+# articles compared with each article in full
+CANDIDATES = 25
+# similarities below this are left out of related lists
+MIN_SCORE = 0.1
+# parameters of one IN clause, within SQLite's limit
+CHUNK = 500
+
+
+def tokenize(text):
+    return [word for word in WORD.findall((text or '').lower())
+            if len(word) > 1 and word not in STOP_WORDS]
+
+
+def document_terms(title, description, body, tags=()):
+    """Term counts of an article, title and tag words counting twice."""
+    counts = Counter(tokenize(body))
+    counts.update(tokenize(description))
+    for _ in range(2):
+        counts.update(tokenize(title))
+        counts.update(tokenize(' '.join(tags)))
+    return counts
+
+
+class Corpus:
+    """
+    Term counts of many articles, kept as arrays of term ids rather than
+    a Counter each, which takes a tenth of the memory.
+    """
+
+    def __init__(self):
+        self.ids = {}
+        self.terms = []
+        self.documents = []
+
+    def __len__(self):
+        return len(self.documents)
+
+    def term_id(self, term):
+        term_id = self.ids.get(term)
+        if term_id is None:
+            term_id = self.ids[term] = len(self.terms)
+            self.terms.append(term)
+        return term_id
+
+    def add(self, counts):
+        self.documents.append((
+            np.fromiter(map(self.term_id, counts), np.int32, len(counts)),
+            np.fromiter(counts.values(), np.float32, len(counts))))
+
+    def vocabulary(self, max_terms):
+        """The `max_terms` terms found in the most documents, and the
+        documents as `(columns, counts)` rows over them."""
+        ids = [term_ids for term_ids, _ in self.documents]
+        frequency = np.bincount(
+            np.concatenate(ids) if ids else np.zeros(0, np.int32),
+            minlength=len(self.terms))
+        kept = np.flatnonzero(frequency > 1)
+        kept = kept[np.argsort(-frequency[kept], kind='stable')][:max_terms]
+        vocabulary = Vocabulary(
+            [self.terms[term_id] for term_id in kept],
+            np.log((1 + len(self)) / (1 + frequency[kept])) + 1, len(self))
+        columns = np.full(len(self.terms), -1, np.int32)
+        columns[kept] = np.arange(len(kept))
+        rows = []
+        for term_ids, counts in self.documents:
+            term_columns = columns[term_ids]
+            known = term_columns >= 0
+            rows.append((term_columns[known], counts[known]))
+        return vocabulary, rows
+
+
+class Vocabulary:
+    """The terms vectors have columns for and their IDF, worked out from
+    `articles` articles at `built_at`."""
+
+    def __init__(self, terms, idf, articles=None, built_at=None):
+        self.terms = list(terms)
+        self.columns = {term: column for column, term in enumerate(terms)}
+        self.idf = np.asarray(idf, np.float32)
+        self.articles = articles
+        self.built_at = built_at
+
+    def __len__(self):
+        return len(self.terms)
+
+    def row(self, counts):
+        """`(columns, counts)` of the known terms in `counts`."""
+        known = [(self.columns[term], count) for term, count in counts.items()
+                 if term in self.columns]
+        return (np.array([column for column, _ in known], np.int32),
+                np.array([count for _, count in known], np.float32))
+
+    def save(self):
+        RelatedTerm.objects.all().delete()
+        RelatedTerm.objects.bulk_create(
+            [RelatedTerm(term=term, column=column, idf=float(weight))
+             for column, (term, weight) in enumerate(
+                zip(self.terms, self.idf))],
+            batch_size=1000)
+        RelatedVocabulary.objects.all().delete()
+        built = RelatedVocabulary.objects.create(articles=self.articles)
+        self.built_at = built.built_at
+
+    @classmethod
+    def load(cls):
+        terms = RelatedTerm.objects.order_by('column').values_list(
+            'term', 'idf')
+        built = RelatedVocabulary.objects.first()
+        return cls([term for term, _ in terms], [idf for _, idf in terms],
+                   built and built.articles, built and built.built_at)
+
+    def outdated(self, articles, now=None):
+        """Whether the vocabulary should be built again now that there are
+        `articles` published articles."""
+        if self.articles is None:
+            return True
+        now = now or timezone.now()
+        drift = abs(articles - self.articles) / max(self.articles, 1)
+        return (drift > settings.RELATED_ARTICLES_REBUILD_DRIFT or
+                now - self.built_at >
+                timedelta(days=settings.RELATED_ARTICLES_REBUILD_DAYS))
+
+
+class SparseRows:
+    """
+    Unit TF-IDF vectors in compressed sparse row form: the terms of row i
+    are `columns[indptr[i]:indptr[i + 1]]`, with `weights` alongside,
+    heaviest first.
+    """
+
+    def __init__(self, indptr, columns, weights):
+        self.indptr = indptr
+        self.columns = columns
+        self.weights = weights
+
+    def __len__(self):
+        return len(self.indptr) - 1
+
+    @classmethod
+    def stack(cls, rows):
+        """Rows from `(columns, weights)` arrays."""
+        lengths = [len(columns) for columns, _ in rows]
+        return cls(
+            np.concatenate([[0], np.cumsum(lengths, dtype=np.int64)]),
+            np.concatenate([columns for columns, _ in rows] +
+                           [np.zeros(0, np.int32)]).astype(np.int32),
+            np.concatenate([weights for _, weights in rows] +
+                           [np.zeros(0, np.float32)]).astype(np.float32))
+
+    @classmethod
+    def weigh(cls, rows, idf):
+        """Rows from `(columns, counts)` arrays, weighed by TF-IDF."""
+        rows = cls.stack(rows)
+        weights = (1 + np.log(rows.weights)) * idf[rows.columns]
+        owners = np.repeat(np.arange(len(rows)), np.diff(rows.indptr))
+        norms = np.sqrt(np.bincount(owners, weights ** 2,
+                                    minlength=len(rows)))
+        order = np.lexsort((-weights, owners))
+        rows.columns = rows.columns[order]
+        rows.weights = (weights / norms[owners])[order].astype(np.float32)
+        return rows
+
+    def row(self, index):
+        start, end = self.indptr[index], self.indptr[index + 1]
+        return self.columns[start:end], self.weights[start:end]
+
+    def gather(self, indices):
+        """`(owners, columns, weights)` of the terms of rows `indices`,
+        `owners` being the position in `indices` each term comes from."""
+        indices = np.asarray(indices, np.int64)
+        starts = self.indptr[indices]
+        lengths = self.indptr[indices + 1] - starts
+        positions = spans(starts, lengths)
+        return (np.repeat(np.arange(len(indices)), lengths),
+                self.columns[positions], self.weights[positions])
+
+    def top(self, count):
+        """The rows cut down to their `count` heaviest terms."""
+        lengths = np.minimum(np.diff(self.indptr), count)
+        positions = spans(self.indptr[:-1], lengths)
+        return SparseRows(np.concatenate([[0], np.cumsum(lengths)]),
+                          self.columns[positions], self.weights[positions])
+
+    def dense(self, indices, width):
+        owners, columns, weights = self.gather(indices)
+        matrix = np.zeros((len(indices), width), np.float32)
+        matrix[owners, columns] = weights
+        return matrix
+
+
+def spans(starts, lengths):
+    """The positions from each of `starts` on for as many of `lengths`,
+    one span after another."""
+    return np.arange(lengths.sum()) + np.repeat(
+        starts - (np.cumsum(lengths) - lengths), lengths)
+
+
+class Postings:
+    """An inverted index of sparse rows: the rows each column is found in,
+    with its weights."""
+
+    def __init__(self, rows, width):
+        order = np.argsort(rows.columns, kind='stable')
+        self.size = len(rows)
+        self.indptr = np.concatenate([[0], np.cumsum(
+            np.bincount(rows.columns, minlength=width))])
+        self.rows = np.repeat(np.arange(len(rows)),
+                              np.diff(rows.indptr))[order]
+        self.weights = rows.weights[order]
+
+
+def candidates(queries, postings, count, exclude, block_size=None):
+    """
+    For each of the `queries` rows, the `count` rows of `postings` with
+    the most weight in the terms they share with it, in no order, leaving
+    out row `exclude[i]` for query i and padding with it where fewer rows
+    share a term. Queries are worked through `block_size` at a time.
+    """
+    block_size = block_size or settings.RELATED_ARTICLES_BLOCK_SIZE
+    size = postings.size
+    exclude = np.asarray(exclude)
+    picked = np.repeat(exclude[:, None], count, axis=1)
+    for start in range(0, len(queries), block_size):
+        indices = np.arange(start, min(start + block_size, len(queries)))
+        owners, columns, weights = queries.gather(indices)
+        lengths = postings.indptr[columns + 1] - postings.indptr[columns]
+        positions = spans(postings.indptr[columns], lengths)
+        # (query, row) pairs as one key each, summed over shared terms
+        keys = np.repeat(owners, lengths) * size + postings.rows[positions]
+        if not len(keys):
+            continue
+        order = np.argsort(keys)
+        keys = keys[order]
+        firsts = np.flatnonzero(np.concatenate([[True], np.diff(keys) != 0]))
+        shared = np.add.reduceat((np.repeat(weights, lengths) *
+                                  postings.weights[positions])[order], firsts)
+        query, row = np.divmod(keys[firsts], size)
+        kept = row != exclude[indices[query]]
+        query, row, shared = query[kept], row[kept], shared[kept]
+        order = np.lexsort((-shared, query))
+        rank = np.arange(len(order)) - np.searchsorted(
+            query[order], query[order])
+        best = order[rank < count]
+        picked[indices[query[best]], rank[rank < count]] = row[best]
+    return picked
+
+
+def rerank(queries, picked, rows, count, width, excluded=None,
+           block_size=None):
+    """
+    For each row of `queries`, the `(indices, scores)` of the `count` of
+    its `picked` rows of `rows` most similar to it, best first, by exact
+    cosine. Leaves out similarities below MIN_SCORE and the picks masked
+    by `excluded`.
+    """
+    block_size = block_size or settings.RELATED_ARTICLES_BLOCK_SIZE
+    ranked = []
+    for start in range(0, len(queries), block_size):
+        block = picked[start:start + block_size]
+        dense = queries.dense(np.arange(start, start + len(block)), width)
+        owners, columns, weights = rows.gather(block.ravel())
+        scores = np.bincount(
+            owners, dense[owners // block.shape[1], columns] * weights,
+            minlength=block.size).reshape(block.shape)
+        if excluded is not None:
+            scores[excluded[start:start + block_size]] = -np.inf
+        order = np.argsort(-scores, axis=1, kind='stable')[:, :count]
+        top = np.take_along_axis(block, order, axis=1)
+        top_scores = np.take_along_axis(scores, order, axis=1)
+        for indices, row_scores in zip(top, top_scores):
+            kept = row_scores >= MIN_SCORE
+            ranked.append((indices[kept], row_scores[kept]))
+    return ranked
+
+
+def neighbours(rows, count, width):
+    """The `count` rows most similar to each row but itself."""
+    top = rows.top(TOP_TERMS)
+    exclude = np.arange(len(rows))
+    picked = candidates(top, Postings(top, width), CANDIDATES, exclude)
+    return rerank(rows, picked, rows, count, width,
+                  excluded=picked == exclude[:, None])
+
+
+# the database
+
+def article_documents(articles):
+    """`(pk, revision, term counts)` of each of `articles`."""
+    rows = list(articles.values_list(
+        'pk', 'revision', 'title', 'description', 'body').order_by('pk'))
+    tags = defaultdict(list)
+    tagged = ArticleTag.objects.values_list('article_id', 'tag__name')
+    if len(rows) > CHUNK:
+        tagged = tagged.filter(article__in=articles.values('pk'))
+    else:
+        tagged = tagged.filter(article__in=[row[0] for row in rows])
+    for article_id, name in tagged.order_by():
+        tags[article_id].append(name)
+    for pk, revision, title, description, body in rows:
+        yield pk, revision, document_terms(
+            title, description, body, tags[pk])
+
+
+def load_vectors(exclude=()):
+    """The pks and stored vectors of all articles but `exclude`, the
+    vectors as `(columns, weights)` arrays."""
+    exclude = set(exclude)
+    pks, vectors = [], []
+    for pk, terms, weights in ArticleVector.objects.values_list(
+            'article_id', 'terms', 'weights').order_by(
+            'article_id').iterator():
+        if pk not in exclude:
+            pks.append(pk)
+            vectors.append((np.frombuffer(bytes(terms), np.int32),
+                            np.frombuffer(bytes(weights), np.float32)))
+    return pks, vectors
+
+
+def save_vectors(pks, revisions, rows, replace=True):
+    if replace:
+        for start in range(0, len(pks), CHUNK):
+            ArticleVector.objects.filter(
+                article_id__in=pks[start:start + CHUNK]).delete()
+    vectors = []
+    for index, (pk, revision) in enumerate(zip(pks, revisions)):
+        columns, weights = rows.row(index)
+        vectors.append(ArticleVector(
+            article_id=pk, revision=revision, terms=columns.tobytes(),
+            weights=weights.tobytes()))
+    ArticleVector.objects.bulk_create(vectors, batch_size=1000)
+
+
+def save_related(lists, replace=True):
+    """Stores the related lists in `lists`, which maps article pks to
+    `[(related pk, score), ...]` best first, replacing the lists those
+    articles had unless `replace` is False."""
+    pks = list(lists)
+    if replace:
+        for start in range(0, len(pks), CHUNK):
+            RelatedArticle.objects.filter(
+                article_id__in=pks[start:start + CHUNK]).delete()
+    # leaves out articles deleted while the lists were being worked out
+    involved = sorted(set(pks).union(
+        related_pk for similar in lists.values() for related_pk, _ in similar))
+    existing = set()
+    for start in range(0, len(involved), CHUNK):
+        existing.update(Article.objects.filter(
+            pk__in=involved[start:start + CHUNK]).values_list(
+            'pk', flat=True))
+    RelatedArticle.objects.bulk_create(
+        [RelatedArticle(article_id=pk, related_id=related_pk,
+                        score=score, rank=rank)
+         for pk, similar in lists.items() if pk in existing
+         for rank, (related_pk, score) in enumerate(
+            pair for pair in similar if pair[0] in existing)],
+        batch_size=1000)
+
+
+def similar_pks(pks, ranked):
+    """`[(pk, score), ...]` lists from `rerank()` results."""
+    pks = np.asarray(pks)
+    return [list(zip(pks[indices].tolist(), scores.tolist()))
+            for indices, scores in ranked]
+
+
+def rebuild(count=None, max_terms=None):
+    """Scores every article from scratch. Returns how many were scored."""
+    count = count or settings.RELATED_ARTICLES_COUNT
+    max_terms = max_terms or settings.RELATED_ARTICLES_TERMS
+    corpus, pks, revisions = Corpus(), [], []
+    for pk, revision, counts in article_documents(
+            Article.objects.filter(is_published=True)):
+        corpus.add(counts)
+        pks.append(pk)
+        revisions.append(revision)
+    vocabulary, counts = corpus.vocabulary(max_terms)
+    rows = SparseRows.weigh(counts, vocabulary.idf)
+    lists = dict(zip(pks, similar_pks(
+        pks, neighbours(rows, count, len(vocabulary)))))
+    with transaction.atomic():
+        vocabulary.save()
+        ArticleVector.objects.all().delete()
+        save_vectors(pks, revisions, rows, replace=False)
+        RelatedArticle.objects.all().delete()
+        save_related(lists, replace=False)
+        # retires every cached list at once
+        invalidate('related', 0)
+    return len(pks)
+
+
+def stale_articles():
+    """Published articles created or changed since their vector was
+    made."""
+    return Article.objects.filter(is_published=True).filter(
+        Q(vector__isnull=True) | Q(vector__revision__lt=F('revision')))
+
+
+def retire(pks):
+    """
+    Takes the articles `pks`, once unpublished, out of related lists:
+    drops their vectors, their lists and their entries in other lists. A
+    list left with fewer entries is not refilled until the next rebuild.
+    """
+    pks = sorted(pks)
+    with transaction.atomic():
+        for start in range(0, len(pks), CHUNK):
+            chunk = pks[start:start + CHUNK]
+            listing = set(RelatedArticle.objects.filter(
+                related_id__in=chunk).values_list('article_id', flat=True))
+            RelatedArticle.objects.filter(
+                Q(article_id__in=chunk) | Q(related_id__in=chunk)).delete()
+            ArticleVector.objects.filter(article_id__in=chunk).delete()
+            for pk in listing.union(chunk):
+                invalidate('related', pk)
+
+
+def update(count=None):
+    """
+    Scores the articles created or changed since they were last scored
+    against the stored vectors of the others, or rebuilds if nothing has
+    been scored yet or the vocabulary is outdated. Returns how many
+    articles were scored.
+    """
+    count = count or settings.RELATED_ARTICLES_COUNT
+    vocabulary = Vocabulary.load()
+    if not vocabulary or vocabulary.outdated(
+            Article.objects.filter(is_published=True).count()):
+        return rebuild(count)
+    # e.g. unpublished by a bulk update, which sends no post_save
+    retire(Article.objects.filter(
+        is_published=False, vector__isnull=False).values_list(
+        'pk', flat=True))
+    documents = list(article_documents(stale_articles()))
+    if not documents:
+        return 0
+    stale = [pk for pk, _, _ in documents]
+    rows = SparseRows.weigh(
+        [vocabulary.row(counts) for _, _, counts in documents],
+        vocabulary.idf)
+    stored_pks, stored = load_vectors(exclude=stale)
+    all_pks = stored_pks + stale
+    all_rows = SparseRows.stack(
+        stored + [rows.row(index) for index in range(len(rows))])
+    exclude = np.arange(len(stored_pks), len(all_pks))
+    top = all_rows.top(TOP_TERMS)
+    picked = candidates(rows.top(TOP_TERMS), Postings(top, len(vocabulary)),
+                        CANDIDATES, exclude)
+    ranked = similar_pks(all_pks, rerank(
+        rows, picked, all_rows, CANDIDATES, len(vocabulary),
+        excluded=picked == exclude[:, None]))
+
+    lists = {pk: similar[:count] for pk, similar in zip(stale, ranked)}
+    lists.update(relist(stale, ranked, set(stored_pks), count))
+    with transaction.atomic():
+        save_vectors(stale, [revision for _, revision, _ in documents], rows)
+        save_related(lists)
+        for pk in lists:
+            invalidate('related', pk)
+    return len(stale)
+
+
+def relist(stale, ranked, stored, count):
+    """
+    The new related lists of the `stored` articles that the changed
+    articles in `stale` move into or out of: those listing one of them
+    now, and those one of them now beats the last entry of. Similarity
+    being symmetric, the scores are those `ranked` for the changed
+    articles. A list one of them drops out of is not refilled from the
+    other articles until the next rebuild.
+    """
+    scores = defaultdict(list)
+    for stale_pk, similar in zip(stale, ranked):
+        for pk, score in similar:
+            if pk in stored:
+                scores[pk].append((stale_pk, score))
+    candidate_pks = sorted(scores)
+    floors = {}
+    for start in range(0, len(candidate_pks), CHUNK):
+        floors.update(
+            (pk, (score, listed)) for pk, score, listed in
+            RelatedArticle.objects.filter(
+                article_id__in=candidate_pks[start:start + CHUNK]
+            ).values_list('article').annotate(
+                Min('score'), Count('id')).order_by())
+    affected = {pk for pk, similar in scores.items()
+                if pk not in floors or floors[pk][1] < count or
+                max(score for _, score in similar) > floors[pk][0]}
+    for start in range(0, len(stale), CHUNK):
+        affected.update(RelatedArticle.objects.filter(
+            related_id__in=stale[start:start + CHUNK]).values_list(
+            'article_id', flat=True))
+
+    current = defaultdict(list)
+    affected = sorted(affected & stored)
+    for start in range(0, len(affected), CHUNK):
+        for pk, related_pk, score in RelatedArticle.objects.filter(
+                article_id__in=affected[start:start + CHUNK]
+        ).values_list('article_id', 'related_id', 'score'):
+            current[pk].append((related_pk, score))
+    stale = set(stale)
+    lists = {}
+    for pk in affected:
+        similar = [pair for pair in current[pk] if pair[0] not in stale]
+        similar.extend(scores[pk])
+        similar.sort(key=lambda pair: -pair[1])
+        lists[pk] = similar[:count]
+    return lists
+
+
+def related_dependencies(article):
+    """What the cached related list of `article` is built from: the
+    list itself, and every list through ('related', 0) for rebuilds and
+    deleted articles."""
+    return [('related', 0), ('related', article.pk)]
+
+
+def get_related(article_id):
+    """The published related articles of an article, best first, in one
+    query."""
+    return [
+        {'slug': slug, 'title': title, 'description': description,
+         'score': round(score, 3)}
+        for slug, title, description, score in RelatedArticle.objects.filter(
+            article_id=article_id, related__is_published=True
+        ).order_by('rank').values_list(
+            'related__slug', 'related__title', 'related__description',
+            'score')]
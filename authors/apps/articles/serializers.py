@@ -2,6 +2,7 @@ from rest_framework import serializers
 from .models import (Article, ArticleImage, FavoriteModel, ReviewsModel,
                      LikeArticles, Highlight)
 from ..authentication.serializers import UserSerializer
+from authors.apps.core.serializers import SparseFieldsMixin
 from django.core.validators import MaxValueValidator, MinValueValidator
 from taggit_serializer.serializers import (
     TagListSerializerField,
@@ -19,7 +20,8 @@ class TagSerializer(TagListSerializerField):
         'invalid_json': 'tags field must be a list containing tags'
     }
 
-class ArticleSerializer(TaggitSerializer, serializers.ModelSerializer):
+class ArticleSerializer(SparseFieldsMixin, TaggitSerializer,
+                        serializers.ModelSerializer):
     """Serializer to map the Article Model instance into JSON format."""
 
     author = UserSerializer(read_only=True)
@@ -51,18 +53,45 @@ class ArticleSerializer(TaggitSerializer, serializers.ModelSerializer):
 
     def get_like_count(self, obj):
         """method returns number of likes for an article"""
+        if hasattr(obj, 'reaction_counts'):
+            return obj.reaction_counts.get(1, 0)
         return obj.liked.filter(likes=1).count()
 
     def get_dislike_count(self, obj):
         """method returns the sum of dislikes for an article"""
+        if hasattr(obj, 'reaction_counts'):
+            return obj.reaction_counts.get(0, 0)
         return obj.liked.filter(likes=0).count()
 
     class Meta:
         model = Article
         fields = ('id', 'title', 'body', 'description', 'is_published',
                   'date_created', 'date_modified', 'slug', 'read_time', 'author',
-                  'like_count', 'dislike_count', 'tags')
-        read_only_fields = ('date_created', 'date_modified', 'slug', 'read_time', 'author')
+                  'like_count', 'dislike_count', 'tags', 'excerpt', 'revision')
+        read_only_fields = ('date_created', 'date_modified', 'slug', 'read_time', 'author',
+                            'excerpt', 'revision')
+
+    # what article lists show unless asked for other fields
+    list_fields = tuple(field for field in Meta.fields if field != 'body')
+
+
+class BodyEditSerializer(serializers.Serializer):
+    """Replaces body[start:end] with text"""
+    start = serializers.IntegerField(min_value=0)
+    end = serializers.IntegerField(min_value=0)
+    text = serializers.CharField(allow_blank=True, trim_whitespace=False,
+                                 default='')
+
+    def validate(self, data):
+        if data['end'] < data['start']:
+            raise serializers.ValidationError('end must not be before start')
+        return data
+
+
+class ArticleEditsSerializer(serializers.Serializer):
+    """Edits to an article body, made against the given revision"""
+    revision = serializers.IntegerField(min_value=1)
+    edits = BodyEditSerializer(many=True, allow_empty=False)
 
 
 class ArticleImageSerializer(serializers.ModelSerializer):
@@ -85,13 +114,13 @@ class ReviewsSerializer(serializers.ModelSerializer):
     reviewer_username = serializers.ReadOnlyField(
         source='reviewed_by.username')
     article = serializers.ReadOnlyField(source='article.pk')
-    avg_rating = serializers.ReadOnlyField(source='average_rating(article)')
+    avg_rating = serializers.ReadOnlyField(source='article.average_rating')
 
     class Meta:
         model = ReviewsModel
         fields = '__all__'
 
-        read_only_fields = ('average_rating', 'date_created', 'date_modified',
+        read_only_fields = ('date_created', 'date_modified',
                             'article', 'reviewed_by', 'reviewer_username', 'avg_rating')
 
 
@@ -108,12 +137,11 @@ class ReviewsSerializer(serializers.ModelSerializer):
 
 
 class FavoriteSerializer(serializers.ModelSerializer):
-    article = ArticleSerializer()
-    user = UserSerializer()
+    """The favorite itself; views add the article from the object cache."""
 
     class Meta:
         model = FavoriteModel
-        fields = '__all__'
+        fields = ('id', 'favorite', 'date_created', 'date_modified')
         read_only_fields = ['date_modified', 'date_created']
 
 
@@ -126,7 +154,7 @@ class CommentInlineSerializer(serializers.ModelSerializer):
 
 class HighlightSerializer(serializers.ModelSerializer):
     """Serializer to map the Highlight Model instance into JSON format."""
-    article = serializers.ReadOnlyField(source='article.id')
+    article = serializers.ReadOnlyField(source='article_id')
     user = UserSerializer(read_only=True)
 
     class Meta:
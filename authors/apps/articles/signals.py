@@ -0,0 +1,29 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from ..core.cache import invalidate
+from . import related
+from .models import Article, ArticleVector, ReviewsModel
+
+
+@receiver(post_delete, sender=ReviewsModel)
+def uncount_review(sender, instance, **kwargs):
+    # also runs for reviews deleted along with their reviewer
+    Article.update_ratings(
+        instance.article_id,
+        removed=getattr(instance, 'saved_rating', instance.rating_value))
+
+
+@receiver(post_delete, sender=Article)
+def retire_related_lists(sender, instance, **kwargs):
+    # lists naming the article keep it until the next relate_articles run,
+    # so none of the cached ones can be trusted
+    invalidate('related', 0)
+
+
+@receiver(post_save, sender=Article)
+def retire_unpublished(sender, instance, created, **kwargs):
+    # only scored articles can be listed
+    if (not created and not instance.is_published and
+            ArticleVector.objects.filter(article_id=instance.pk).exists()):
+        related.retire([instance.pk])
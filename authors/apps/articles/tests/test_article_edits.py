@@ -0,0 +1,113 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status, test
+
+from authors.apps.articles.models import Article, Highlight
+from authors.apps.articles.utils import (InvalidEdit, apply_edits,
+                                         count_words, get_readtime)
+from authors.apps.authentication.models import User
+
+
+class TestApplyEdits(TestCase):
+    """Tests for applying edits to a body"""
+
+    def test_edits_apply_in_order(self):
+        body, _ = apply_edits('Hello world', [
+            {'start': 6, 'end': 11, 'text': 'there'},
+            {'start': 11, 'end': 11, 'text': '!'},
+            {'start': 0, 'end': 6, 'text': ''},
+        ])
+        self.assertEqual(body, 'there!')
+
+    def test_word_count_follows_the_edits(self):
+        body = 'one two three, four five'
+        edits = [
+            {'start': 3, 'end': 4, 'text': ''},     # joins two words
+            {'start': 9, 'end': 9, 'text': ' '},    # splits one
+            {'start': 0, 'end': 0, 'text': 'zero '},
+            {'start': 16, 'end': 21, 'text': '... '},
+        ]
+        new_body, word_count = apply_edits(body, edits, count_words(body))
+        self.assertEqual(word_count, count_words(new_body))
+
+    def test_edit_outside_the_body_is_rejected(self):
+        with self.assertRaises(InvalidEdit):
+            apply_edits('short', [{'start': 2, 'end': 10, 'text': ''}])
+
+
+class TestArticleEdits(TestCase):
+    """Tests for editing an article body in place"""
+
+    def setUp(self):
+        self.client = test.APIClient()
+        self.author = User.objects.create_user(
+            'editor', 'editor@mail.com', 'password123')
+        self.other = User.objects.create_user(
+            'reader', 'reader@mail.com', 'password123')
+        self.article = Article.objects.create(
+            title='Draft', description='About', author=self.author,
+            body='The first draft of a long story')
+        self.url = reverse('articles:details',
+                           kwargs={'slug': self.article.slug})
+        self.client.force_authenticate(self.author)
+
+    def edit(self, revision, *edits):
+        return self.client.patch(self.url, {
+            'revision': revision, 'edits': list(edits)}, format='json')
+
+    def test_edits_are_applied_and_revision_bumped(self):
+        self.assertEqual(self.article.revision, 1)
+        response = self.edit(1, {'start': 4, 'end': 9, 'text': 'second'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['revision'], 2)
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.body, 'The second draft of a long story')
+        self.assertEqual(self.article.revision, 2)
+        self.assertEqual(self.article.word_count, 7)
+        self.assertEqual(self.article.read_time,
+                         get_readtime(self.article.body))
+
+    def test_stale_revision_is_a_conflict(self):
+        self.edit(1, {'start': 0, 'end': 3, 'text': 'A'})
+        response = self.edit(1, {'start': 0, 'end': 0, 'text': 'Not '})
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data['revision'], 2)
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.body, 'A first draft of a long story')
+
+    def test_full_update_bumps_revision(self):
+        response = self.client.put(self.url, {
+            'article': {'body': 'Rewritten'}}, format='json')
+        self.assertEqual(response.data['article']['revision'], 2)
+        response = self.edit(1, {'start': 0, 'end': 0, 'text': 'Old '})
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+    def test_edited_body_is_served(self):
+        self.client.get(self.url)
+        self.edit(1, {'start': 0, 'end': 3, 'text': 'A'})
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['article']['body'],
+                         'A first draft of a long story')
+        self.assertEqual(response.data['article']['revision'], 2)
+
+    def test_edit_out_of_range(self):
+        response = self.edit(1, {'start': 10, 'end': 500, 'text': ''})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.edit(1, {'start': 10, 'end': 5, 'text': ''})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.edit(1)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_only_the_author_can_edit(self):
+        self.client.force_authenticate(self.other)
+        response = self.edit(1, {'start': 0, 'end': 3, 'text': 'A'})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_highlights_are_moved(self):
+        highlight = Highlight.objects.create(
+            article=self.article, user=self.other, section='long story',
+            start=21, end=30, comment='')
+        self.edit(1, {'start': 0, 'end': 0, 'text': 'Once more: '})
+        highlight.refresh_from_db()
+        self.assertEqual(highlight.start, 32)
+        self.assertEqual(highlight.end, 41)
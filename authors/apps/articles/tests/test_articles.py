@@ -1,5 +1,7 @@
 import tempfile
+from io import StringIO
 
+from django.core.management import call_command
 from django.test import TestCase
 from authors.apps.authentication.models import User
 from django.urls import reverse
@@ -568,7 +570,8 @@ class TestArticle(TestCase):
                     "title": "Test title",
                     "body": "This is a very awesome article on testing tests",
                     "description": "Written by testing tester",
-                    "tags": ["religion", "nature", "film"]
+                    "tags": ["religion", "nature", "film"],
+                    "is_published": True
                 }
             },
             format="json"
@@ -585,7 +588,8 @@ class TestArticle(TestCase):
                     "title": "Test title",
                     "body": "This is a very awesome article on testing tests",
                     "description": "Written by testing tester",
-                    "tags": ["religion", "nature", "film"]
+                    "tags": ["religion", "nature", "film"],
+                    "is_published": True
                 }
             },
             format="json"
@@ -596,3 +600,35 @@ class TestArticle(TestCase):
 
     def tearDown(self):
         Article.objects.all().delete()
+
+
+class TestArticleExcerpt(TestCase):
+    """Tests for the stored article excerpt"""
+
+    def setUp(self):
+        self.author = User.objects.create_user(
+            'excerpts', 'excerpts@mail.com', 'password123')
+
+    def test_excerpt_is_cut_at_a_word(self):
+        article = Article.objects.create(
+            title='Long', description='About', author=self.author,
+            body='A sentence with several words. ' * 20)
+        self.assertTrue(article.excerpt.endswith('...'))
+        self.assertLessEqual(len(article.excerpt), 203)
+        # the excerpt stops after a whole word
+        self.assertIn(article.excerpt[:-3] + ' ', article.body)
+
+    def test_short_body_is_its_own_excerpt(self):
+        article = Article.objects.create(
+            title='Short', description='About', author=self.author,
+            body='Short\n\nbody')
+        self.assertEqual(article.excerpt, 'Short body')
+
+    def test_backfill_stores_missing_excerpts(self):
+        article = Article.objects.create(
+            title='Old', description='About', author=self.author,
+            body='An old article')
+        Article.objects.update(excerpt='')
+        call_command('backfill_article_excerpts', stdout=StringIO())
+        article.refresh_from_db()
+        self.assertEqual(article.excerpt, 'An old article')
@@ -162,3 +162,53 @@ class FavoriteTestCase(TestCase):
         )
         self.assertEqual(res.data['message'],
                          "The article requested does not exist")
+
+    def create_articles(self, count):
+        author = User.objects.get(username='Test')
+        articles = [Article.objects.create(
+            title="Favorite {}".format(number), body="Body",
+            description="About", author=author) for number in range(count)]
+        for article in articles:
+            article.tags.add("film")
+        return articles
+
+    def get_favorites(self, query=''):
+        return self.client.get(reverse('articles:favorite-list') + query)
+
+    def test_favoriting_twice_keeps_one_favorite(self):
+        slug = self.create_articles(1)[0].slug
+        first = self.client.post(
+            reverse('articles:favorite', kwargs={"slug": slug}))
+        second = self.client.post(
+            reverse('articles:favorite', kwargs={"slug": slug}))
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.data['message'], "Added to favorites")
+        self.assertEqual(FavoriteModel.objects.count(), 1)
+
+    def test_favorites_are_paginated(self):
+        user = User.objects.get(username='Test')
+        for article in self.create_articles(3):
+            FavoriteModel.objects.create(user=user, article=article)
+        res = self.get_favorites('?limit=2')
+        self.assertEqual(res.data['count'], 3)
+        self.assertEqual(len(res.data['articles']), 2)
+        self.assertEqual(res.data['articles'][0]['article']['tags'], ['film'])
+        self.assertIsNotNone(res.data['next'])
+
+    def test_favorites_query_count_does_not_grow(self):
+        user = User.objects.get(username='Test')
+        for article in self.create_articles(6):
+            FavoriteModel.objects.create(user=user, article=article)
+        self.get_favorites('?limit=2')
+        with self.assertNumQueries(6):
+            self.get_favorites('?limit=6')
+
+    def test_removing_another_users_favorite_is_not_found(self):
+        article = self.create_articles(1)[0]
+        other = User.objects.create_user('Other', 'other@mail.com', 'pass1234')
+        FavoriteModel.objects.create(user=other, article=article)
+        res = self.client.delete(
+            reverse('articles:favorite', kwargs={"slug": article.slug}))
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(FavoriteModel.objects.count(), 1)
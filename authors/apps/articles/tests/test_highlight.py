@@ -386,5 +386,38 @@ class TestArticle(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['highlights'], [])
 
+    def test_get_highlights_in_range(self):
+        article = Article.objects.get()
+        for start, end in ((0, 3), (5, 8), (10, 20), (30, 40)):
+            Highlight.objects.create(
+                article=article, user=self.test_user, start=start, end=end,
+                section=article.body[start:end + 1])
+        url = reverse('articles:highlight-article',
+                      kwargs={"slug": article.slug})
+
+        with self.assertNumQueries(3):
+            # the user, the article id and the highlights with their users
+            response = self.client.get(url, {'from': 7, 'to': 12})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(h['start'], h['end']) for h in response.data['highlights']],
+            [(5, 8), (10, 20)])
+        self.assertEqual(response.data['highlightsCount'], 2)
+        self.assertEqual(response.data['highlights'][0]['user']['username'],
+                         'Test')
+
+        response = self.client.get(url, {'from': 21})
+        self.assertEqual(
+            [(h['start'], h['end']) for h in response.data['highlights']],
+            [(30, 40)])
+
+    def test_get_highlights_invalid_range(self):
+        url = reverse('articles:highlight-article',
+                      kwargs={"slug": Article.objects.get().slug})
+        response = self.client.get(url, {'from': 10, 'to': 2})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(url, {'from': 'start'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
     def tearDown(self):
         Article.objects.all().delete()
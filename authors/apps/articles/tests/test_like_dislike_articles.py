@@ -1,8 +1,15 @@
 import json
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+from unittest import mock, skipUnless
+
+from django.core.management import call_command
+from django.db import connection
 from django.urls import reverse
-from django.test import TestCase
+from django.test import TestCase, TransactionTestCase
 from rest_framework import test, status
 
+from authors.apps.articles.models import Article, LikeArticles
 from authors.apps.authentication.models import User
 
 class TestLikeArticles(TestCase):
@@ -269,3 +276,76 @@ class TestLikeArticles(TestCase):
             )
             self.assertEqual(response2.data['message'],
                              'You have not reacted to any article')
+
+    def test_reaction_state_mode(self):
+        """Test that ?mode=state returns only the reaction and counts"""
+        url = reverse('articles:like-article', kwargs={'slug': self.slug})
+        self.client2.post(url, format='json')
+        response = self.client.post(url + '?mode=state', format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data, {
+            'reaction': 'like', 'like_count': 2, 'dislike_count': 0})
+
+        response = self.client.post(
+            reverse('articles:dislike-article', kwargs={'slug': self.slug}) +
+            '?mode=state', format='json')
+        self.assertEqual(response.data, {
+            'reaction': 'dislike', 'like_count': 1, 'dislike_count': 1})
+        self.assertEqual(LikeArticles.objects.filter(
+            article__slug=self.slug).count(), 2)
+
+        response = self.client.post(
+            reverse('articles:dislike-article', kwargs={'slug': self.slug}) +
+            '?mode=state', format='json')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data, {
+            'reaction': None, 'like_count': 1, 'dislike_count': 0})
+
+
+    def test_dedupe_waits_for_the_reactions_table(self):
+        out = StringIO()
+        with mock.patch.object(connection.introspection, 'table_names',
+                               return_value=[]):
+            call_command('dedupe_article_reactions', stdout=out)
+        self.assertIn('nothing to dedupe', out.getvalue())
+
+@skipUnless(connection.features.test_db_allows_multiple_connections,
+            'needs a test database that threads can share')
+class TestConcurrentReactions(TransactionTestCase):
+    """Toggles reactions from many threads at once"""
+
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(
+                'reactor{}'.format(number),
+                'reactor{}@mail.com'.format(number), 'password123')
+            for number in range(4)]
+        self.article = Article.objects.create(
+            title='Contested', description='About', body='Body',
+            author=self.users[0])
+
+    def toggle(self, user, value):
+        try:
+            return LikeArticles.react_to_article(user, self.article, value)
+        finally:
+            connection.close()
+
+    def test_parallel_toggles_are_applied_one_at_a_time(self):
+        # the first two users like 75 times, the others dislike 50 times
+        toggles = {user: (1, 75) if number < 2 else (0, 50)
+                   for number, user in enumerate(self.users)}
+        calls = [(user, value) for user, (value, times) in toggles.items()
+                 for _ in range(times)]
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            results = list(executor.map(lambda call: self.toggle(*call),
+                                        calls))
+
+        rows = LikeArticles.objects.filter(article=self.article)
+        self.assertEqual(dict(rows.values_list('user', 'likes')), {
+            self.users[0].pk: 1, self.users[1].pk: 1})
+        for user, (value, times) in toggles.items():
+            user_results = [result for (caller, _), result
+                            in zip(calls, results) if caller == user]
+            # toggles alternate between adding and removing the reaction
+            self.assertEqual(user_results.count(True),
+                             user_results.count(False) + times % 2)
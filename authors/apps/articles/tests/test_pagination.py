@@ -47,7 +47,8 @@ class TestArticlePagination(TestCase):
                         "body": "This is a very awesome article on testing "
                                 "tests",
                         "description": "Written by testing tester",
-                        "tags": ["religion", "nature", "film"]
+                        "tags": ["religion", "nature", "film"],
+                        "is_published": True
                     }
                 },
                 format="json"
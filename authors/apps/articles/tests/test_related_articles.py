@@ -0,0 +1,153 @@
+from datetime import timedelta
+from io import StringIO
+
+import numpy as np
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import test
+
+from authors.apps.articles import related
+from authors.apps.articles.models import Article, RelatedArticle
+from authors.apps.authentication.models import User
+
+
+class TestNeighbours(TestCase):
+    """Tests for finding the most similar vectors"""
+
+    def test_neighbours_match_exact_similarities(self):
+        random = np.random.RandomState(0)
+        corpus = related.Corpus()
+        for _ in range(300):
+            words = random.zipf(1.5, size=40) % 500
+            corpus.add(related.document_terms(
+                '', '', ' '.join('w{}'.format(word) for word in words)))
+        vocabulary, counts = corpus.vocabulary(1000)
+        rows = related.SparseRows.weigh(counts, vocabulary.idf)
+        dense = rows.dense(np.arange(len(rows)), len(vocabulary))
+        exact = dense @ dense.T
+        np.fill_diagonal(exact, 0)
+
+        found = related.neighbours(rows, 3, len(vocabulary))
+        for row, (indices, scores) in enumerate(found):
+            self.assertNotIn(row, indices)
+            np.testing.assert_allclose(scores, exact[row, indices],
+                                       rtol=1e-5)
+            self.assertTrue(np.all(np.diff(scores) <= 0))
+        best = -np.sort(-exact, axis=1)[:, :3].sum()
+        self.assertGreater(sum(scores.sum() for _, scores in found),
+                           0.95 * best)
+
+    def test_unknown_words_are_left_out(self):
+        corpus = related.Corpus()
+        corpus.add(related.document_terms('Python', 'The basics', 'Python'))
+        corpus.add(related.document_terms('Python tips', '', 'Tips'))
+        vocabulary, counts = corpus.vocabulary(10)
+        self.assertEqual(vocabulary.terms, ['python'])
+        columns, _ = vocabulary.row(related.document_terms(
+            'Go', '', 'python and go'))
+        self.assertEqual(columns.tolist(), [0])
+
+
+# four articles, so one more is a 25% drift
+@override_settings(RELATED_ARTICLES_REBUILD_DRIFT=0.5)
+class TestRelatedArticles(TestCase):
+    """Tests for the related articles of an article"""
+
+    def setUp(self):
+        self.client = test.APIClient()
+        self.author = User.objects.create_user(
+            'writer', 'writer@mail.com', 'password123')
+        self.models = self.article(
+            'Django models', 'django models queries migrations orm')
+        self.views = self.article(
+            'Django views', 'django views templates urls orm')
+        self.pasta = self.article(
+            'Pasta recipes', 'pasta tomato basil garlic cooking')
+        self.sauce = self.article(
+            'Tomato sauce', 'tomato sauce garlic basil cooking')
+
+    def article(self, title, body, is_published=True):
+        return Article.objects.create(
+            title=title, description='About', body=body, author=self.author,
+            is_published=is_published)
+
+    def related(self, article):
+        response = self.client.get(reverse(
+            'articles:details', kwargs={'slug': article.slug}))
+        return [entry['slug'] for entry in response.data['related']]
+
+    def test_detail_lists_related_articles(self):
+        related.rebuild()
+        self.assertEqual(self.related(self.models), [self.views.slug])
+        self.assertEqual(self.related(self.sauce), [self.pasta.slug])
+        self.assertEqual(RelatedArticle.objects.count(), 4)
+
+    def test_cached_lists_are_retired_when_rescored(self):
+        self.assertEqual(self.related(self.models), [])
+        related.rebuild()
+        self.assertEqual(self.related(self.models), [self.views.slug])
+        with self.assertNumQueries(0):
+            self.assertEqual(self.related(self.models), [self.views.slug])
+        forms = self.article('Django forms', 'django forms orm')
+        related.update()
+        self.assertIn(forms.slug, self.related(self.models))
+        forms.delete()
+        self.assertEqual(self.related(self.models), [self.views.slug])
+
+    def test_update_scores_new_and_changed_articles(self):
+        related.rebuild()
+        forms = self.article('Django forms', 'django forms orm views')
+        self.assertEqual(related.update(), 1)
+        self.assertCountEqual(self.related(forms),
+                              [self.views.slug, self.models.slug])
+        self.assertIn(forms.slug, self.related(self.models))
+
+        self.pasta.title = 'Django migrations'
+        self.pasta.body = 'django migrations orm models'
+        self.pasta.save()
+        self.assertEqual(related.update(), 1)
+        self.assertEqual(self.related(self.pasta)[0], self.models.slug)
+        self.assertEqual(self.related(self.sauce), [])
+        self.assertEqual(related.update(), 0)
+
+    def test_drafts_are_left_out(self):
+        draft = self.article('Django drafts', 'django models views orm',
+                             is_published=False)
+        related.rebuild()
+        self.assertNotIn(draft.slug, self.related(self.models))
+        self.assertEqual(related.update(), 0)
+        draft.is_published = True
+        draft.save()
+        self.assertEqual(related.update(), 1)
+        self.assertIn(draft.slug, self.related(self.models))
+
+        draft.is_published = False
+        draft.save()
+        self.assertEqual(self.related(self.models), [self.views.slug])
+        self.assertFalse(RelatedArticle.objects.filter(
+            article=draft).exists())
+
+    def test_update_rebuilds_when_nothing_was_scored(self):
+        self.assertEqual(related.update(), 4)
+        self.assertEqual(self.related(self.views), [self.models.slug])
+
+    def test_update_rebuilds_outdated_vocabulary(self):
+        related.rebuild()
+        vocabulary = related.Vocabulary.load()
+        self.assertEqual(vocabulary.articles, 4)
+        self.assertFalse(vocabulary.outdated(5))
+        self.assertTrue(vocabulary.outdated(7))
+        self.assertTrue(vocabulary.outdated(
+            4, vocabulary.built_at + timedelta(days=8)))
+
+        self.article('Django forms', 'django forms orm views')
+        self.article('Django admin', 'django admin orm models')
+        self.article('Garlic bread', 'garlic bread basil cooking')
+        self.assertEqual(related.update(), 7)
+        self.assertEqual(related.Vocabulary.load().articles, 7)
+
+    def test_command(self):
+        out = StringIO()
+        call_command('relate_articles', rebuild=True, stdout=out)
+        self.assertIn('Scored 4 articles', out.getvalue())
@@ -1,3 +1,7 @@
+from io import StringIO
+
+from django.core.management import call_command
+
 from .commons import *
 
 
@@ -210,3 +214,85 @@ class ReviewTestCase(BaseSetup):
         },
             format="json")
         self.assertEqual(edit_response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class RatingAggregateTestCase(BaseSetup):
+
+    def setUp(self):
+        super().setUp()
+        self.post_article()
+        self.article = Article.objects.get()
+
+    def ratings(self):
+        self.article.refresh_from_db()
+        return (self.article.rating_sum, self.article.rating_count,
+                self.article.rating_histogram)
+
+    def get_reviews(self, query=''):
+        return self.client.get(reverse('articles:review', kwargs={
+            "slug": self.article.slug}) + query, format="json")
+
+    def test_reviews_are_counted(self):
+        self.post_review()
+        self.post_review2()
+        total, count, histogram = self.ratings()
+        self.assertEqual((total, count), (10, 2))
+        self.assertEqual(histogram['5'], 2)
+        response = self.get_reviews()
+        self.assertEqual(response.data['Average Rating'], 5)
+        self.assertEqual(response.data['rating_count'], 2)
+        self.assertEqual(response.data['reviews'][0]['avg_rating'], 5)
+
+    def test_edited_review_moves_its_rating(self):
+        self.post_review()
+        self.post_review2()
+        self.client2.put(reverse('articles:alter-review', kwargs={
+            "slug": self.article.slug, 'username': "Pete"
+        }), data={"review": {"rating_value": 2}}, format="json")
+        total, count, histogram = self.ratings()
+        self.assertEqual((total, count), (7, 2))
+        self.assertEqual((histogram['2'], histogram['5']), (1, 1))
+        self.assertEqual(self.get_reviews().data['Average Rating'], 4)
+
+    def test_deleted_review_is_uncounted(self):
+        self.post_review()
+        self.post_review2()
+        self.client2.delete(reverse('articles:alter-review', kwargs={
+            "slug": self.article.slug, 'username': "Pete"}))
+        User.objects.get(username="Jane").delete()
+        total, count, histogram = self.ratings()
+        self.assertEqual((total, count, histogram['5']), (0, 0, 0))
+
+    def test_saving_an_article_keeps_its_ratings(self):
+        stale = Article.objects.get()
+        self.post_review()
+        stale.body = "An edited body"
+        stale.save()
+        self.assertEqual(self.ratings()[:2], (5, 1))
+
+    def test_reviews_are_paginated(self):
+        self.post_review()
+        self.post_review2()
+        response = self.get_reviews('?limit=1')
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual(len(response.data['reviews']), 1)
+        self.assertIsNotNone(response.data['next'])
+
+    def test_rebuild_recomputes_ratings(self):
+        self.post_review()
+        self.post_review2()
+        Article.objects.update(rating_sum=0, rating_count=0, rating_star_5=0)
+        call_command('rebuild_article_ratings', stdout=StringIO())
+        total, count, histogram = self.ratings()
+        self.assertEqual((total, count, histogram['5']), (10, 2, 2))
+
+    def test_rebuild_if_empty_leaves_stored_ratings_alone(self):
+        self.post_review()
+        Article.objects.update(rating_sum=1)
+        call_command('rebuild_article_ratings', if_empty=True,
+                     stdout=StringIO())
+        self.assertEqual(self.ratings()[0], 1)
+        Article.objects.update(rating_sum=0, rating_count=0, rating_star_5=0)
+        call_command('rebuild_article_ratings', if_empty=True,
+                     stdout=StringIO())
+        self.assertEqual(self.ratings()[:2], (5, 1))
@@ -0,0 +1,113 @@
+from datetime import timedelta
+from io import StringIO
+
+import numpy as np
+from django.conf import settings
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import test
+
+from authors.apps.articles import trending
+from authors.apps.articles.models import (Article, LikeArticles,
+                                          ReviewsModel)
+from authors.apps.authentication.models import User
+from authors.apps.comments.models import Comment
+
+
+class TestDecayedScores(TestCase):
+    """Tests for adding up decayed event weights"""
+
+    def test_scores_match_plain_sums(self):
+        random = np.random.RandomState(0)
+        indices = np.concatenate([np.arange(50), random.randint(50, size=500)])
+        times = random.uniform(1000, 1010, len(indices))
+        weights = random.uniform(0.5, 3, len(indices))
+        scores = trending.decayed_scores(indices, times, weights, 50)
+        expected = np.log2(np.bincount(
+            indices, weights * np.exp2(times - 1010))) + 1010
+        np.testing.assert_allclose(scores, expected)
+
+
+class TestTrendingScores(TestCase):
+    """Tests for ranking articles by trending score"""
+
+    def setUp(self):
+        self.client = test.APIClient()
+        self.author = User.objects.create_user(
+            'writer', 'writer@mail.com', 'password123')
+        self.readers = [
+            User.objects.create_user('reader{}'.format(number),
+                                     'reader{}@mail.com'.format(number),
+                                     'password123')
+            for number in range(3)]
+        self.once_popular = self.article('Once popular')
+        self.liked = self.article('Liked')
+        self.plain = self.article('Plain')
+        self.discussed = self.article('Discussed')
+        for reader in self.readers:
+            LikeArticles.objects.create(user=reader,
+                                        article=self.once_popular, likes=1)
+        LikeArticles.objects.filter(article=self.once_popular).update(
+            created_on=timezone.now() - timedelta(days=10))
+        LikeArticles.objects.create(user=self.readers[0], article=self.liked,
+                                    likes=1)
+        LikeArticles.objects.create(user=self.readers[1], article=self.plain,
+                                    likes=0)
+        Comment.objects.create(body='Nice', author=self.readers[0],
+                               article=self.discussed)
+        ReviewsModel.objects.create(article=self.discussed,
+                                    reviewed_by=self.readers[1],
+                                    rating_value=5)
+
+    def article(self, title):
+        return Article.objects.create(
+            title=title, description='About', body='Body', author=self.author,
+            is_published=True)
+
+    def trending_slugs(self):
+        response = self.client.get(reverse('articles:create-list'),
+                                   {'sort': 'trending'})
+        self.assertEqual(response.status_code, 200)
+        return [article['slug'] for article in response.data['articles']]
+
+    def test_recent_events_outweigh_old_ones(self):
+        # new articles are scored as they are created
+        self.assertEqual(trending.recompute(), 3)
+        self.assertEqual(self.trending_slugs(), [
+            self.discussed.slug, self.liked.slug, self.once_popular.slug,
+            self.plain.slug])
+
+    def test_only_changed_scores_are_written(self):
+        trending.recompute()
+        self.assertEqual(trending.recompute(), 0)
+        LikeArticles.objects.create(user=self.readers[2], article=self.plain,
+                                    likes=1)
+        self.assertEqual(trending.recompute(), 1)
+        # saving an article leaves its score alone
+        self.plain.refresh_from_db()
+        Article.objects.filter(pk=self.plain.pk).update(trending_score=0)
+        self.plain.title = 'Renamed'
+        self.plain.save()
+        self.plain.refresh_from_db()
+        self.assertEqual(self.plain.trending_score, 0)
+
+    def test_articles_can_weigh_nothing(self):
+        weights = dict(settings.TRENDING_WEIGHTS, article=0)
+        with override_settings(TRENDING_WEIGHTS=weights):
+            fresh = self.article('Fresh')
+            self.assertTrue(np.isfinite(fresh.trending_score))
+            trending.recompute()
+            self.assertEqual(self.trending_slugs()[-2:], [
+                fresh.slug, self.plain.slug])
+
+    def test_unknown_sort(self):
+        response = self.client.get(reverse('articles:create-list'),
+                                   {'sort': 'popular'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_command(self):
+        out = StringIO()
+        call_command('compute_trending_scores', stdout=out)
+        self.assertIn('Updated 3 trending scores', out.getvalue())
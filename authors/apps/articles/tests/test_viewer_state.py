@@ -0,0 +1,80 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status, test
+
+from authors.apps.articles.models import (Article, FavoriteModel,
+                                          LikeArticles, ReviewsModel)
+from authors.apps.authentication.models import User
+from authors.apps.bookmark.models import Bookmark
+from authors.apps.follow.models import Follows
+
+
+class ViewerStateTestCase(TestCase):
+
+    def setUp(self):
+        self.client = test.APIClient()
+        self.reader = User.objects.create_user(
+            'reader', 'reader@mail.com', 'reader1234')
+        self.author = User.objects.create_user(
+            'author', 'author@mail.com', 'author1234')
+        self.other = User.objects.create_user(
+            'other', 'other@mail.com', 'other1234')
+        self.liked = self.create_article('Liked', self.author)
+        self.plain = self.create_article('Plain', self.other)
+        LikeArticles.objects.create(user=self.reader, article=self.liked,
+                                    likes=1)
+        LikeArticles.objects.create(user=self.reader, article=self.plain,
+                                    likes=0)
+        FavoriteModel.objects.create(user=self.reader, article=self.liked)
+        ReviewsModel.objects.create(article=self.liked,
+                                    reviewed_by=self.reader, rating_value=4)
+        bookmark = Bookmark.objects.create(
+            article_title=self.liked.title, bookmarked_article=self.liked,
+            article_id=self.liked.pk, article_slug=self.liked.slug)
+        bookmark.user.add(self.reader)
+        Follows.objects.create(follower=self.reader,
+                               followed_user=self.author.username)
+        self.client.force_authenticate(self.reader)
+
+    def create_article(self, title, author):
+        return Article.objects.create(title=title, description='About',
+                                      body='Body', author=author,
+                                      is_published=True)
+
+    def test_viewer_state_for_slugs_and_ids(self):
+        response = self.client.get(reverse('articles:viewer-state'), {
+            'slugs': self.liked.slug, 'ids': str(self.plain.pk)})
+        state = response.data['viewer_state']
+        self.assertEqual(state[self.liked.slug], {
+            'id': self.liked.pk, 'reaction': 'like', 'favorited': True,
+            'bookmarked': True, 'reviewed': True, 'following_author': True})
+        self.assertEqual(state[self.plain.slug], {
+            'id': self.plain.pk, 'reaction': 'dislike', 'favorited': False,
+            'bookmarked': False, 'reviewed': False,
+            'following_author': False})
+
+    def test_query_count_does_not_grow_with_articles(self):
+        slugs = ','.join([self.liked.slug, self.plain.slug] + [
+            self.create_article('Extra {}'.format(number), self.other).slug
+            for number in range(5)])
+        # one query for the articles and one per kind of state
+        with self.assertNumQueries(6):
+            self.client.get(reverse('articles:viewer-state'),
+                            {'slugs': slugs})
+
+    def test_invalid_ids_are_rejected(self):
+        response = self.client.get(reverse('articles:viewer-state'),
+                                   {'ids': 'one'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_article_list_can_include_viewer_state(self):
+        response = self.client.get(reverse('articles:create-list'),
+                                   {'include': 'viewer_state'})
+        states = {article['slug']: article['viewer_state']
+                  for article in response.data['articles']}
+        self.assertEqual(states[self.liked.slug]['reaction'], 'like')
+        self.assertFalse(states[self.plain.slug]['favorited'])
+
+    def test_article_list_leaves_out_viewer_state_by_default(self):
+        response = self.client.get(reverse('articles:create-list'))
+        self.assertNotIn('viewer_state', response.data['articles'][0])
@@ -0,0 +1,171 @@
+"""
+Trending scores, behind `/api/articles/?sort=trending`.
+
+An article's trending score adds up its likes, comments, favorites,
+reviews and bookmarks, each weighing its `settings.TRENDING_WEIGHTS`
+entry and halving every `settings.TRENDING_HALF_LIFE_HOURS` after it
+happened. Reviews weigh in proportion to their rating. The article itself
+counts as an event when it is created, weighing at least
+MIN_ARTICLE_WEIGHT, so articles nobody has reacted to yet come newest
+first. Bookmarks keep no time, so they decay from the article's creation.
+
+A decayed sum shrinks by the same factor for every article as time goes
+by, which leaves the order unchanged. So the score kept is the sum as of
+TRENDING_EPOCH, log2 of it to fit a float: `log2(sum(weight *
+2 ** half_lives_since_epoch(time)))`. It stays put until the article
+gets a new event, so only those articles are written when the scores
+are recomputed.
+
+`recompute()` scores every article with one grouped query per kind of
+event, counting events by article and hour, and a few array operations.
+The database turns the hours into seconds, so the rows read are plain
+numbers that go straight into arrays. `python manage.py
+compute_trending_scores` runs it.
+"""
+import numpy as np
+from django.conf import settings
+from django.db.models import (Case, Count, ExpressionWrapper, F,
+                              FloatField, Func, Sum, Value, When)
+from django.db.models.functions import TruncHour
+from django.utils import timezone
+
+from authors.apps.bookmark.models import Bookmark
+from authors.apps.comments.models import Comment
+
+from .models import Article, FavoriteModel, LikeArticles, ReviewsModel
+from .utils import TRENDING_EPOCH, article_weight
+
+# stored scores closer than this to the new ones are left alone
+TOLERANCE = 1e-6
+# rows updated by one statement, within SQLite's parameter limit
+CHUNK = 500
+
+
+class EpochSeconds(Func):
+    """Seconds since 1970 of a datetime, as the database works them out."""
+    template = 'EXTRACT(EPOCH FROM %(expressions)s)'
+    output_field = FloatField()
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return self.as_sql(compiler, connection, template=(
+            '((julianday(%(expressions)s) - 2440587.5) * 86400.0)'),
+            **extra_context)
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        return self.as_sql(compiler, connection,
+                           template='UNIX_TIMESTAMP(%(expressions)s)',
+                           **extra_context)
+
+
+def hourly(queryset, moment, amount):
+    """`(article pk, hour, amount)` of the events in `queryset`, grouped by
+    article and the hour of their `moment` field, the hour in seconds."""
+    return queryset.annotate(
+        hour=EpochSeconds(TruncHour(moment, tzinfo=timezone.utc))).values(
+        'article', 'hour').annotate(amount=amount).values_list(
+        'article', 'hour', 'amount').order_by()
+
+
+def event_counts():
+    """`(kind, rows)` of every kind of event, `rows` being `(article pk,
+    seconds, amount)` and each amount weighing one kind's weight."""
+    yield 'like', hourly(LikeArticles.objects.filter(likes=1), 'created_on',
+                         Count('pk'))
+    yield 'comment', hourly(Comment.objects.all(), 'createdAt', Count('pk'))
+    yield 'favorite', hourly(FavoriteModel.objects.filter(favorite=True),
+                             'date_created', Count('pk'))
+    yield 'review', hourly(
+        ReviewsModel.objects.all(), 'date_created', ExpressionWrapper(
+            Sum('rating_value') / 5.0, output_field=FloatField()))
+    yield 'bookmark', Bookmark.objects.values(
+        'bookmarked_article', 'bookmarked_article__date_created').annotate(
+        seconds=EpochSeconds(F('bookmarked_article__date_created')),
+        amount=Count('user')).values_list(
+        'bookmarked_article', 'seconds', 'amount').order_by()
+
+
+def as_array(rows):
+    """`(article pk, seconds, amount)` rows as a float array of three
+    columns."""
+    return np.array(list(rows), dtype=float).reshape(-1, 3)
+
+
+def half_lives(seconds):
+    """`half_lives_since_epoch` of each of `seconds` since 1970."""
+    return (seconds - TRENDING_EPOCH.timestamp()) / (
+        3600 * settings.TRENDING_HALF_LIFE_HOURS)
+
+
+def decayed_scores(indices, times, weights, size):
+    """
+    `log2(sum(weights * 2 ** times))` of the events of each of `size`
+    articles, `indices` saying whose each event is. Every article needs
+    an event of positive weight.
+
+    Each sum is taken relative to the article's latest event, as the
+    powers of two themselves would overflow.
+    """
+    order = np.argsort(indices, kind='mergesort')
+    indices, times = indices[order], times[order]
+    starts = np.flatnonzero(np.diff(indices, prepend=-1))
+    latest = np.maximum.reduceat(times, starts)
+    totals = np.bincount(indices, weights[order] * np.exp2(
+        times - latest[indices]), minlength=size)
+    return latest + np.log2(totals)
+
+
+def gather(weights=None):
+    """The pks and stored scores of all articles, in pk order, and the
+    `(article indices, times, weights)` of their events, or None if there
+    are no articles."""
+    weights = weights or settings.TRENDING_WEIGHTS
+    articles = as_array(Article.objects.annotate(
+        seconds=EpochSeconds('date_created')).values_list(
+        'pk', 'seconds', 'trending_score').order_by('pk'))
+    if not len(articles):
+        return None
+    pks = articles[:, 0].astype(np.int64)
+    indices = [np.arange(len(pks))]
+    times = [half_lives(articles[:, 1])]
+    amounts = [np.full(len(pks), article_weight(weights))]
+    for kind, rows in event_counts():
+        if not weights[kind]:
+            continue
+        rows = as_array(rows)
+        if not len(rows):
+            continue
+        article_pks = rows[:, 0].astype(np.int64)
+        positions = np.searchsorted(pks, article_pks).clip(
+            max=len(pks) - 1)
+        # leaves out events of articles created since pks were read
+        known = pks[positions] == article_pks
+        indices.append(positions[known])
+        times.append(half_lives(rows[known, 1]))
+        amounts.append(rows[known, 2] * weights[kind])
+    return (pks, articles[:, 2], np.concatenate(indices),
+            np.concatenate(times), np.concatenate(amounts))
+
+
+def save_scores(pks, scores):
+    pks, scores = pks.tolist(), scores.tolist()
+    for start in range(0, len(pks), CHUNK):
+        chunk = list(zip(pks[start:start + CHUNK],
+                         scores[start:start + CHUNK]))
+        Article.objects.filter(pk__in=[pk for pk, _ in chunk]).update(
+            trending_score=Case(
+                *[When(pk=pk, then=Value(score)) for pk, score in chunk],
+                output_field=FloatField()))
+
+
+def recompute(weights=None):
+    """Scores every article and saves the scores that changed. Returns how
+    many did."""
+    gathered = gather(weights)
+    if gathered is None:
+        return 0
+    pks, stored, indices, times, amounts = gathered
+    scores = decayed_scores(indices, times, amounts, len(pks))
+    changed = ~np.isclose(scores, stored, rtol=0, atol=TOLERANCE)
+    save_scores(pks[changed], scores[changed])
+    return int(changed.sum())
+
@@ -13,7 +13,8 @@ from .views import (
     FavoriteListView,
     HighlightView,
     UserLikesArticleView,
-    AllUserLikesArticleView
+    AllUserLikesArticleView,
+    ViewerStateView
 )
 
 app_name = "articles"
@@ -25,6 +26,8 @@ urlpatterns = [
          name="favorite-list"),
     path('articles/liked/all/', AllUserLikesArticleView.as_view(),
          name="liked-all"),
+    path('articles/viewer-state/', ViewerStateView.as_view(),
+         name="viewer-state"),
     path('articles/<slug>/', RetrieveArticleView.as_view(), name="details"),
     path('articles/<slug>/liked/', UserLikesArticleView.as_view(),
          name="liked-me"),
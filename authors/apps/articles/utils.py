@@ -1,9 +1,17 @@
+from datetime import datetime
+
+from django.conf import settings
+from django.utils import timezone
 from django.utils.text import slugify
-from django_social_share.templatetags import social_share
+import math
+import re
 import secrets
-import readtime
 from decimal import Decimal, ROUND_HALF_UP
 
+from authors.apps.core.startup import lazy_import
+
+social_share = lazy_import('django_social_share.templatetags.social_share')
+
 
 def generate_slug(article_title):
     unique_tag = str(secrets.token_hex(6))
@@ -11,10 +19,72 @@ def generate_slug(article_title):
     return slugify(unique_slug)
 
 
+WORD = re.compile(r'\w+')
+
+
+def count_words(text):
+    return len(WORD.findall(text))
+
+
+def readtime_of_words(word_count):
+    """Read time of a text of `word_count` words, as readtime words it."""
+    # readtime pulls in markdown2 and lxml, so it is imported on first use
+    import readtime
+    seconds = math.ceil(word_count / readtime.utils.DEFAULT_WPM * 60)
+    return readtime.result.Result(seconds=seconds).text
+
+
 def get_readtime(article_body):
     """Method to calculate the read time of an article."""
-    result = readtime.of_text(article_body)
-    return result.text
+    return readtime_of_words(count_words(article_body))
+
+
+class InvalidEdit(ValueError):
+    pass
+
+
+def apply_edits(body, edits, word_count=None):
+    """
+    Applies `edits`, dicts of `start`, `end` and `text` replacing
+    `body[start:end]` with `text`, one after the other: each edit's offsets
+    refer to the body as left by the edits before it. An insert has
+    `start == end` and a deletion an empty `text`.
+
+    Returns the new body and its word count. Given the word count of `body`,
+    only the words around each edit are recounted.
+    """
+    if word_count is None:
+        word_count = count_words(body)
+    for number, edit in enumerate(edits):
+        start, end, text = edit['start'], edit['end'], edit['text']
+        if not 0 <= start <= end <= len(body):
+            raise InvalidEdit(
+                'Edit {}: {}-{} is outside a body of {} characters'.format(
+                    number, start, end, len(body)))
+        # widen the edit to whole words, so words it splits or joins are
+        # counted before and after it
+        left, right = start, end
+        while left > 0 and WORD.match(body[left - 1]):
+            left -= 1
+        while right < len(body) and WORD.match(body[right]):
+            right += 1
+        word_count += count_words(
+            body[left:start] + text + body[end:right]) - count_words(
+            body[left:right])
+        body = body[:start] + text + body[end:]
+    return body, word_count
+
+
+EXCERPT_LENGTH = 200
+
+
+def make_excerpt(article_body, length=EXCERPT_LENGTH):
+    """The start of the body, cut at a word boundary, for article lists."""
+    text = ' '.join(article_body.split())
+    if len(text) <= length:
+        return text
+    cut = text[:length + 1].rsplit(' ', 1)[0][:length]
+    return cut.rstrip(' .,;:') + '...'
 
 
 def twitter_share_url(context, article_uri, title):
@@ -91,16 +161,31 @@ def is_article_owner(author, reviewer):
         return True
 
 
+def round_average(average):
+    average = Decimal(average).quantize(0, ROUND_HALF_UP)
+    return int(average)
+
 
-def has_reviewed(article, reviewer):
-    from .models import ReviewsModel
+# trending scores are log2 of decayed weight as it stood at this moment
+TRENDING_EPOCH = datetime(2019, 1, 1, tzinfo=timezone.utc)
+# the least an article's creation weighs, so that with a weight of 0 an
+# article nobody has reacted to still gets a score, below those that have
+MIN_ARTICLE_WEIGHT = 2 ** -20
 
-    count = ReviewsModel.objects.filter(article=article,
-                                        reviewed_by=reviewer).count()
-    if count > 0:
-        return True
 
+def half_lives_since_epoch(moment):
+    """`moment` in trending half-lives since TRENDING_EPOCH; see trending.py"""
+    return (moment - TRENDING_EPOCH).total_seconds() / (
+        3600 * settings.TRENDING_HALF_LIFE_HOURS)
 
-def round_average(average):
-    average = Decimal(average).quantize(0, ROUND_HALF_UP)
-    return int(average)
+
+def article_weight(weights=None):
+    """What the creation of an article weighs in its trending score."""
+    weights = weights or settings.TRENDING_WEIGHTS
+    return max(weights['article'], MIN_ARTICLE_WEIGHT)
+
+
+def initial_trending_score(moment):
+    """The trending score of an article created at `moment` that has had
+    no other events yet."""
+    return half_lives_since_epoch(moment) + math.log2(article_weight())
@@ -0,0 +1,57 @@
+"""
+What the current user has done with a set of articles: their reaction,
+whether they favorited, bookmarked or reviewed each one and whether they
+follow its author. Resolved with one query per kind of state, however
+many articles are asked about.
+"""
+from authors.apps.follow.models import Follows
+
+from .models import FavoriteModel, LikeArticles, ReviewsModel
+
+REACTIONS = {1: 'like', 0: 'dislike'}
+
+
+def empty_state():
+    return {
+        'reaction': None,
+        'favorited': False,
+        'bookmarked': False,
+        'reviewed': False,
+        'following_author': False,
+    }
+
+
+def get_viewer_state(user, articles):
+    """
+    Viewer state of `user` for each of `articles`, keyed by article id.
+    `articles` are dicts with the `id` and `author` of a serialized
+    article, so cached article data can be used as it is.
+    """
+    state = {article['id']: empty_state() for article in articles}
+    if not state or not user.is_authenticated:
+        return state
+    ids = list(state)
+
+    reactions = LikeArticles.objects.filter(
+        user=user, article__in=ids).values_list('article', 'likes')
+    for article_id, likes in reactions:
+        state[article_id]['reaction'] = REACTIONS.get(likes)
+    for article_id in FavoriteModel.objects.filter(
+            user=user, article__in=ids).values_list('article', flat=True):
+        state[article_id]['favorited'] = True
+    for article_id in user.bookmark_set.filter(
+            article_id__in=ids).values_list('article_id', flat=True):
+        state[article_id]['bookmarked'] = True
+    for article_id in ReviewsModel.objects.filter(
+            reviewed_by=user, article__in=ids).values_list(
+            'article', flat=True):
+        state[article_id]['reviewed'] = True
+
+    authors = {article['author']['username'] for article in articles}
+    followed = set(Follows.objects.filter(
+        follower=user, followed_user__in=authors).values_list(
+        'followed_user', flat=True))
+    for article in articles:
+        state[article['id']]['following_author'] = (
+            article['author']['username'] in followed)
+    return state
@@ -1,31 +1,43 @@
 from collections import OrderedDict
 import os
+from django.conf import settings
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.exceptions import APIException
 from rest_framework.pagination import LimitOffsetPagination
+from django.core.cache import cache
 from django.core.exceptions import ObjectDoesNotExist
-from django.db.models import Q
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Q, prefetch_related_objects
 
-import cloudinary
 from drf_yasg.utils import swagger_auto_schema
 
 
-from .serializers import (ArticleSerializer, ArticleImageSerializer,
-                          ReviewsSerializer, HighlightSerializer,
+from .serializers import (ArticleSerializer, ArticleEditsSerializer,
+                          ArticleImageSerializer, ReviewsSerializer, HighlightSerializer,
                           FavoriteSerializer, UserLikesArticleSerialzer)
 from rest_framework import status
 from .models import (Article, ArticleImage, LikeArticles, FavoriteModel,
                      ReviewsModel, Highlight)
 from .permissions import ReadOnly
 from authors.apps.authentication.models import User
-from .utils import (is_article_owner, has_reviewed, round_average,
+from .utils import (InvalidEdit, is_article_owner, round_average,
                     generate_share_url)
 from .filters import ArticleFilter
+from .related import get_related, related_dependencies
+from .viewer_state import REACTIONS, get_viewer_state
 from .utils import generate_share_url
 from authors.apps.notify.views import NotificationsView
+from authors.apps.core import cache as object_cache
+from authors.apps.core import outbound
+from authors.apps.core.startup import lazy_import
+from authors.apps.core.serializers import fragment_name, sparse_fields
+from authors.apps.tags.models import ArticleTag
+from authors.apps.tags.pagination import TaggedArticlesPagination
+
+cloudinary_uploader = lazy_import('cloudinary.uploader')
 
 
 def find_article(slug):
@@ -39,15 +51,128 @@ def find_article(slug):
         })
 
 
-def find_favorite(slug):
-    """Method checks if an article is available in the FavouriteModel"""
-    try:
-        return FavoriteModel.objects.get(article__slug=slug)
-    except FavoriteModel.DoesNotExist:
+def article_dependencies(article):
+    """Objects the serialized form of an article is built from"""
+    return [('article', article.pk), ('user', article.author_id)]
+
+
+def attach_reaction_counts(articles):
+    """Counts the likes and dislikes of all `articles` in one query."""
+    counts = {article.pk: {} for article in articles}
+    reactions = LikeArticles.objects.filter(
+        article__in=list(counts)).values_list('article', 'likes').annotate(
+        total=Count('id')).order_by()
+    for article_id, likes, total in reactions:
+        counts[article_id][likes] = total
+    for article in articles:
+        article.reaction_counts = counts[article.pk]
+
+
+def serialize_articles(articles, fields=None):
+    def shown(*names):
+        return fields is None or any(name in fields for name in names)
+
+    if shown('author'):
+        prefetch_related_objects(articles, 'author')
+    if shown('tags'):
+        prefetch_related_objects(articles, 'tags')
+    if shown('like_count', 'dislike_count'):
+        attach_reaction_counts(articles)
+    return ArticleSerializer(articles, many=True, fields=fields).data
+
+
+def get_articles_data(articles, fields=None):
+    """Serialized articles, from the object cache where possible"""
+    return object_cache.get_fragments(
+        fragment_name('article', fields), articles, article_dependencies,
+        lambda missing: serialize_articles(missing, fields))
+
+
+def article_list_fields(request):
+    """
+    The fields of each article in a list: those asked for with `?fields=`,
+    or everything but the body. Viewer state needs the id and author.
+    """
+    fields = sparse_fields(request) or list(ArticleSerializer.list_fields)
+    if 'viewer_state' in request.GET.get('include', '').split(','):
+        fields = sorted(set(fields) | {'id', 'author'})
+    return fields
+
+
+def article_columns(fields, prefix=''):
+    """The article columns to load, with `QuerySet.only()`, to show
+    `fields` and find the article in the object cache."""
+    return [prefix + name
+            for name in ArticleSerializer.only_fields(fields) + ['author']]
+
+
+def with_viewer_state(request, articles):
+    """Adds the requesting user's viewer state to serialized `articles`
+    when asked for with `?include=viewer_state`."""
+    if 'viewer_state' not in request.GET.get('include', '').split(','):
+        return articles
+    state = get_viewer_state(request.user, articles)
+    return [dict(article, viewer_state=state[article['id']])
+            for article in articles]
+
+
+def get_article_data(slug):
+    """
+    Serialized article for `slug`. Which article a slug belongs to is
+    cached too, so a cached article is returned without a query.
+    """
+    key = object_cache.lookup_key('article', 'slug', slug)
+    ids = cache.get(key)
+    if ids:
+        article = Article(id=ids[0], author_id=ids[1], slug=slug)
+        data = object_cache.get_fragment(
+            'article', article, article_dependencies,
+            lambda articles: serialize_articles([find_article(slug)]))
+        if data['slug'] == slug:
+            return data
+    article = find_article(slug)
+    cache.set(key, (article.pk, article.author_id),
+              settings.OBJECT_CACHE_TIMEOUT)
+    return get_articles_data([article])[0]
+
+
+def get_related_data(article_id):
+    """
+    Related articles of an article, cached under the versions of what
+    they are built from like fragments are, but kept out of the fragment
+    stats.
+    """
+    dependencies = related_dependencies(Article(id=article_id))
+    key = object_cache.fragment_key(
+        'related', dependencies, object_cache.get_versions(dependencies))
+    related = cache.get(key)
+    if related is None:
+        related = get_related(article_id)
+        cache.set(key, related, settings.OBJECT_CACHE_TIMEOUT)
+    return related
+
+
+def destroy_image(public_id):
+    """Deletes an image from Cloudinary. If Cloudinary cannot be reached
+    the image is left behind there rather than failing the request."""
+    outbound.call('cloudinary', cloudinary_uploader.destroy, public_id,
+                  fallback=lambda: None)
+
+
+def find_article_id(slug):
+    """Id of the article with `slug`, using the cached slug lookup when
+    there is one"""
+    ids = cache.get(object_cache.lookup_key('article', 'slug', slug))
+    if ids:
+        return ids[0]
+    article_id = Article.objects.filter(slug=slug).values_list(
+        'id', flat=True).first()
+    if article_id is None:
         APIException.status_code = 404
         raise APIException({
-            "message": "The article requested does not exist in your favorites"
+            "message": "The article requested does not exist"
         })
+    return article_id
 
 
 def get_highlights(slug):
@@ -104,6 +229,13 @@ def get_images(slug):
         'article').filter(article__slug=slug)
 
 
+# ?sort= of the article list; trending scores come from trending.py
+ARTICLE_ORDERINGS = {
+    'recent': ('-date_created',),
+    'trending': ('-trending_score', '-id'),
+}
+
+
 class ArticleView(APIView):
     """Class that contains the method that retrieves all articles and
     creates an article"""
@@ -113,6 +245,7 @@ class ArticleView(APIView):
 
     def get(self, request):
         """Method to get all articles"""
+        fields = article_list_fields(request)
         # Functionality to search articles by description, author and title
         if request.GET.get('search'):
             search_parameter = request.GET.get('search')
@@ -120,33 +253,38 @@ class ArticleView(APIView):
             searched_articles = Article.objects.filter(Q(
                 title__icontains=search_parameter) | Q(
                 description__icontains=search_parameter) | Q(
-                author__username__icontains=search_parameter))
+                author__username__icontains=search_parameter),
+                is_published=True).only(*article_columns(fields))
             # filter the model for tags by converting query parameters into a list and 
             # comparing that query list with list of tags in every instance of the object
             if not searched_articles:
                 tag_list = search_parameter.split(",")
-                searched_articles = Article.objects.filter(
-                    tags__name__in=tag_list
-                )
-                searched_articles.distinct()
-            search_serializer = ArticleSerializer(
-                searched_articles, many=True)
-            return Response({"articles": search_serializer.data})
+                searched_articles = ArticleTag.objects.articles(
+                    tag_list).filter(is_published=True).only(
+                    *article_columns(fields))
+            return Response({"articles": with_viewer_state(
+                request, get_articles_data(searched_articles, fields))})
+
+        if request.GET.get('tags'):
+            return self.list_tagged(request, fields)
+
+        sort = request.GET.get('sort', 'recent')
+        if sort not in ARTICLE_ORDERINGS:
+            return Response({"message": "sort must be 'recent' or "
+                             "'trending'"}, status=400)
 
         # Functionality to filter articles by author and title
-        articles = Article.objects.all()
+        articles = Article.objects.only(*article_columns(fields))
         article_filter = ArticleFilter()
+        # drafts are left out, through the published-only indexes
         filtered_articles = article_filter.filter_queryset(
-            request, articles, self)
-        # loop through articles and generate a tags list using the values from the model
-        if filtered_articles.exists():
-            for article in filtered_articles:
-                article.tags = list(article.tags.names())
+            request, articles, self).filter(is_published=True).order_by(
+            *ARTICLE_ORDERINGS[sort])
         paginator = self.pagination_class()
         page = paginator.paginate_queryset(filtered_articles, request)
-        if filtered_articles:
-            serializer = ArticleSerializer(page, many=True)
-            page_results = paginator.get_paginated_response(serializer.data)
+        if paginator.count:
+            page_results = paginator.get_paginated_response(
+                with_viewer_state(request, get_articles_data(page, fields)))
 
             # rename key 'results' to 'articles'
             response = OrderedDict([('articles', v) if k == 'results' else (k, v) for k, v in page_results.data.items()])
@@ -156,6 +294,27 @@ class ArticleView(APIView):
             return Response({"message": "No article found", "articles": []},
                             status=200)
 
+    def list_tagged(self, request, fields):
+        """
+        Articles with the tags in `?tags=a,b`: any of them by default, all
+        of them with `&match=all`. Paginated by cursor.
+        """
+        tag_list = [name.strip() for name in request.GET['tags'].split(',')
+                    if name.strip()]
+        match = request.GET.get('match', 'any')
+        if match not in ('any', 'all'):
+            return Response({"message": "match must be 'any' or 'all'"},
+                            status=400)
+        articles = ArticleTag.objects.articles(
+            tag_list, match_all=match == 'all').filter(
+            is_published=True).only(*article_columns(fields))
+        paginator = TaggedArticlesPagination()
+        page = paginator.paginate_queryset(articles, request, view=self)
+        page_results = paginator.get_paginated_response(
+            with_viewer_state(request, get_articles_data(page, fields)))
+        response = OrderedDict([('articles', v) if k == 'results' else (k, v) for k, v in page_results.data.items()])
+        return Response(response, status=200)
+
     @swagger_auto_schema(request_body=ArticleSerializer,
                          responses={201: ArticleSerializer(),
                                     400: "Bad Request",
@@ -167,7 +326,8 @@ class ArticleView(APIView):
 
         # Create an article from the above data
         serializer = ArticleSerializer(data=article)
-        if serializer.is_valid(raise_exception=True):
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
             article_saved = serializer.save(author=self.request.user)
             NotificationsView.send_notification(
                 "@{0} has posted a new article at {1}".format(
@@ -194,11 +354,11 @@ class RetrieveArticleView(APIView):
             return True
 
     def get(self, request, slug):
-        """Method to get a specific article"""
-        article = find_article(slug)
-        article.tags = list(article.tags.names())
-        serializer = ArticleSerializer(article, many=False)
-        return Response({"article": serializer.data})
+        """Method to get a specific article and the articles related
+        to it"""
+        article = get_article_data(slug)
+        return Response({"article": article,
+                         "related": get_related_data(article['id'])})
 
     @swagger_auto_schema(request_body=ArticleSerializer,
                          responses={200: ArticleSerializer(),
@@ -229,14 +389,55 @@ class RetrieveArticleView(APIView):
             response = {"message": "Only the owner can edit this article."}
             return Response(response, status=403)
 
+    @swagger_auto_schema(request_body=ArticleEditsSerializer,
+                         responses={200: "Edits applied",
+                                    400: "Bad Request",
+                                    404: "Not Found",
+                                    403: "Forbidden",
+                                    409: "Conflict"})
+    def patch(self, request, slug):
+        """Method to edit the body of an article in place. Takes the
+        revision the edits were made against; if the article has changed
+        since, nothing is applied and the current revision is returned"""
+        article = find_article(slug)
+        if self.is_owner(article.author_id, request.user.id) is not True:
+            response = {"message": "Only the owner can edit this article."}
+            return Response(response, status=403)
+
+        serializer = ArticleEditsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        highlights = get_highlights(slug)
+        try:
+            applied = article.apply_edits(
+                serializer.validated_data['revision'],
+                serializer.validated_data['edits'])
+        except InvalidEdit as error:
+            return Response({"errors": {"edits": [str(error)]}}, status=400)
+        if not applied:
+            return Response({
+                "message": "The article has changed since revision {}.".format(
+                    serializer.validated_data['revision']),
+                "revision": Article.objects.filter(pk=article.pk).values_list(
+                    'revision', flat=True).first()
+            }, status=409)
+
+        # the body was written with an UPDATE, which sends no post_save
+        object_cache.invalidate('article', article.pk)
+        format_highlight(highlights, article)
+        return Response({
+            "revision": article.revision,
+            "read_time": article.read_time,
+            "date_modified": article.date_modified
+        })
+
     def delete(self, request, slug):
         """Method to delete a specific article and all its images"""
         article = find_article(slug)
         images = get_images(slug)
 
         if self.is_owner(article.author.id, request.user.id) is True:
-            for image in range(len(images)):
-                cloudinary.uploader.destroy(images[image].public_id)
+            for image in images:
+                destroy_image(image.public_id)
             article.delete()
             return Response(
                 {"message": "Article `{}` has been deleted.".format(slug)},
@@ -267,12 +468,15 @@ class ArticleImageView(APIView):
 
         if request.FILES:
             try:
-                response = cloudinary.uploader.upload(
+                response = outbound.call(
+                    'cloudinary', cloudinary_uploader.upload,
                     request.FILES['file'],
                     allowed_formats=[
                         'png', 'jpg', 'jpeg', 'gif'
                         ]
                     )
+            except outbound.ServiceUnavailable:
+                raise
             except Exception as e:
                 APIException.status_code = 400
                 raise APIException({
@@ -342,7 +546,7 @@ class ArticleImageDetailView(APIView):
                 "message": "The requested image does not exist."
             }, status=404)
         if article.author.id == request.user.id:
-            cloudinary.uploader.destroy(image[0].public_id)
+            destroy_image(image[0].public_id)
             image.delete()
             return Response({
                 "message": "Image `{}` for article `{}` has been deleted."
@@ -355,6 +559,7 @@ class ArticleImageDetailView(APIView):
 
 class ReviewView(APIView):
     permission_classes = (IsAuthenticated | ReadOnly,)
+    pagination_class = LimitOffsetPagination
 
     @swagger_auto_schema(request_body=ReviewsSerializer,
                          responses={200: ReviewsSerializer(),
@@ -363,20 +568,23 @@ class ReviewView(APIView):
                                     404: "Not Found"},)
     def post(self, request, slug):
         saved_article = find_article(slug)
-        if saved_article.author.pk == self.request.user.pk:
+        if saved_article.author_id == self.request.user.pk:
             APIException.status_code = status.HTTP_400_BAD_REQUEST
             raise APIException(
                 {"message": "You cannot review your own article"})
 
-        if has_reviewed(saved_article, self.request.user):
-            APIException.status_code = status.HTTP_403_FORBIDDEN
-            raise APIException(
-                {"message": "You have already reviewed this article"})
         review = request.data.get('review')
         serializer = ReviewsSerializer(data=review)
         if serializer.is_valid(raise_exception=True):
-            serializer.save(article=saved_article,
-                            reviewed_by=self.request.user)
+            try:
+                with transaction.atomic():
+                    serializer.save(article=saved_article,
+                                    reviewed_by=self.request.user)
+            except IntegrityError:
+                APIException.status_code = status.HTTP_403_FORBIDDEN
+                raise APIException(
+                    {"message": "You have already reviewed this article"})
+            saved_article.refresh_from_db(fields=Article.RATING_FIELDS)
 
         return Response(
             {
@@ -387,21 +595,27 @@ class ReviewView(APIView):
         )
 
     def get(self, request, slug):
-        try:
-            saved_article = find_article(slug)
-            average_rating = ReviewsModel.average_rating(saved_article.pk)
-            reviews = ReviewsModel.objects.filter(article__slug=slug)
-            serializer = ReviewsSerializer(reviews, many=True)
-            return Response(
-                {
-                    "Average Rating": round_average(average_rating.get('rating_value__avg')),
-
-                    "reviews": serializer.data},
-            )
-        except TypeError:
+        saved_article = find_article(slug)
+        if not saved_article.rating_count:
             APIException.status_code = status.HTTP_404_NOT_FOUND
             raise APIException(
                 {"errors": "There are no reviews for that article"})
+        reviews = ReviewsModel.objects.filter(
+            article=saved_article).select_related('reviewed_by')
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(reviews, request, view=self)
+        for review in page:
+            review.article = saved_article
+        serializer = ReviewsSerializer(page, many=True)
+        return Response(OrderedDict([
+            ("Average Rating", round_average(saved_article.average_rating)),
+            ("rating_count", saved_article.rating_count),
+            ("histogram", saved_article.rating_histogram),
+            ("count", paginator.count),
+            ("next", paginator.get_next_link()),
+            ("previous", paginator.get_previous_link()),
+            ("reviews", serializer.data),
+        ]))
 
     @swagger_auto_schema(request_body=ReviewsSerializer,
                          responses={200: ReviewsSerializer(),
@@ -464,11 +678,41 @@ class ReviewView(APIView):
             raise APIException({"errors": e.detail})
 
 
+def react(request, slug, value):
+    """
+    Toggles the requesting user's like (`value` 1) or dislike (`value` 0)
+    of an article. With `?mode=state` only the user's reaction and the
+    article's counts are returned instead of the whole article.
+    """
+    article = find_article(slug)
+    reacted = LikeArticles.react_to_article(request.user, article, value)
+    response_status = (status.HTTP_201_CREATED if reacted
+                       else status.HTTP_202_ACCEPTED)
+    attach_reaction_counts([article])
+    reaction = REACTIONS[value]
+    if request.GET.get('mode') == 'state':
+        return Response({
+            'reaction': reaction if reacted else None,
+            'like_count': article.reaction_counts.get(1, 0),
+            'dislike_count': article.reaction_counts.get(0, 0)
+        }, status=response_status)
+    if reacted:
+        message = 'you {}d the article: {}'.format(reaction, article.title)
+    else:
+        message = 'you have reverted your {} for the article: {}'.format(
+            reaction, article.title)
+    return Response({
+        'message': message,
+        'article': ArticleSerializer(article).data
+    }, status=response_status)
+
+
 class LikeArticleView(APIView):
     """
     Class for POST view allowing authenticated users to like articles
     """
     permission_classes = (IsAuthenticated,)
+    throttle_scope = 'reactions'
 
     @swagger_auto_schema(request_body=ArticleSerializer,
                          responses={201: ArticleSerializer(),
@@ -479,19 +723,7 @@ class LikeArticleView(APIView):
         """
         method for generating a like for a particular article
         """
-        article = find_article(slug)
-        liked = LikeArticles.react_to_article(request.user, article, 1)
-        if not liked:
-            return Response({
-                'message': 'you have reverted your'
-                           ' like for the article: {}'.format(article.title),
-                'article': ArticleSerializer(article).data
-            }, status=status.HTTP_202_ACCEPTED)
-        return Response({
-            'message': 'you liked the article: {}'.format(article.title),
-            'article': ArticleSerializer(article).data
-        },
-            status=status.HTTP_201_CREATED)
+        return react(request, slug, 1)
 
 
 class DislikeArticleView(APIView):
@@ -499,6 +731,7 @@ class DislikeArticleView(APIView):
     Class for POST view allowing authenticated users to dislike articles
     """
     permission_classes = (IsAuthenticated,)
+    throttle_scope = 'reactions'
 
     @swagger_auto_schema(request_body=ArticleSerializer,
                          responses={201: ArticleSerializer(),
@@ -509,20 +742,7 @@ class DislikeArticleView(APIView):
         """
         method for generating a dislike for a particular article
         """
-        article = find_article(slug)
-        disliked = LikeArticles.react_to_article(request.user, article, 0)
-        if not disliked:
-            return Response({
-                'message': 'you have reverted your'
-                           ' dislike for the article: {}'.format(
-                               article.title),
-                'article': ArticleSerializer(article).data
-            }, status=status.HTTP_202_ACCEPTED)
-        return Response({
-            'message': 'you disliked the article: {}'.format(article.title),
-            'article': ArticleSerializer(article).data
-        },
-            status=status.HTTP_201_CREATED)
+        return react(request, slug, 0)
 
 
 class SocialShareArticleView(APIView):
@@ -574,14 +794,13 @@ class FavoriteView(APIView):
         :return: A success message of the article marked as favorite
         """
         article = find_article(slug)
-        try:
-            fav = FavoriteModel(user=request.user, article=article,
-                                favorite=True)
-            fav.save()
-        except:
-            return Response({"message": "Added to favorites"})
-        return Response({"article": FavoriteSerializer(fav).data,
-                         "message": "Added to favorites"}, status=201)
+        fav, created = FavoriteModel.objects.get_or_create(
+            user=request.user, article=article, defaults={'favorite': True})
+        data = FavoriteSerializer(fav).data
+        data['article'] = get_articles_data([article])[0]
+        return Response({"article": data,
+                         "message": "Added to favorites"},
+                        status=201 if created else 200)
 
     def delete(self, request, slug):
         """
@@ -592,15 +811,21 @@ class FavoriteView(APIView):
         :return:
         """
         article = find_article(slug)
-        find_favorite(slug)
-        FavoriteModel.objects.get(article=article.id,
-                                  user=request.user).delete()
+        deleted, _ = FavoriteModel.objects.filter(
+            article=article, user=request.user).delete()
+        if not deleted:
+            APIException.status_code = 404
+            raise APIException({
+                "message": "The article requested does not exist in your "
+                           "favorites"
+            })
         return Response({"message": "Removed from favorites"}, status=200)
 
 
 class FavoriteListView(APIView):
     """Lists all the articles that a user has marked as favorite"""
     permission_classes = (IsAuthenticated,)
+    pagination_class = LimitOffsetPagination
 
     def get(self, request):
         """
@@ -608,14 +833,29 @@ class FavoriteListView(APIView):
         :param request:
         :return:
         """
-        favs = FavoriteModel.objects.filter(user=request.user)
-        return Response({"articles": FavoriteSerializer(favs, many=True).data,
-                         "count": favs.count()}, status=200)
+        fields = article_list_fields(request)
+        favs = FavoriteModel.objects.filter(
+            user=request.user).select_related('article').only(
+            'id', 'favorite', 'date_created', 'date_modified', 'article',
+            *article_columns(fields, prefix='article__'))
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(favs, request, view=self)
+        articles = get_articles_data([fav.article for fav in page], fields)
+        data = FavoriteSerializer(page, many=True).data
+        for favorite, article in zip(data, articles):
+            favorite['article'] = article
+        return Response(OrderedDict([
+            ("articles", data),
+            ("count", paginator.count),
+            ("next", paginator.get_next_link()),
+            ("previous", paginator.get_previous_link()),
+        ]), status=200)
 
 
 class HighlightView(APIView):
     """Class with methods to highlight and retrieve all highlights"""
     permission_classes = (IsAuthenticated,)
+    throttle_scope = 'highlights'
 
     def post(self, request, slug):
         """Method for highlighting an article"""
@@ -647,19 +887,15 @@ class HighlightView(APIView):
                     " than the article size of {}".format(body_length - 1)
                 }, status=400)
 
-            # check if highlight exists
-            highlight = Highlight.objects.filter(article=article_id,
-                                                 user=user, start=start,
-                                                 end=end,
-                                                 comment=comment)
             # If highlight or comment exists unhighlight or uncomment
-            if highlight.exists():
+            removed, _ = Highlight.objects.filter(
+                article=article_id, user=user, start=start, end=end,
+                comment=comment).delete()
+            if removed:
                 if comment == '':
                     message = "Highlight has been removed"
                 else:
                     message = "Comment has been removed"
-
-                highlight.delete()
                 return Response({"message": message})
 
             if comment == '':
@@ -674,13 +910,29 @@ class HighlightView(APIView):
             }, status=201)
 
     def get(self, request, slug):
-        """Method to retrieve all highlights for an article by slug"""
-        find_article(slug)
+        """Method to retrieve the highlights of an article by slug, or with
+        `?from=&to=` only those overlapping that range of the body"""
+        highlights = Highlight.objects.filter(
+            article_id=find_article_id(slug)).select_related('user')
+        if 'from' in request.GET or 'to' in request.GET:
+            try:
+                start = int(request.GET.get('from', 0))
+                end = int(request.GET['to']) if 'to' in request.GET else None
+            except ValueError:
+                return Response({
+                    "message": "from and to must be positions in the body"
+                }, status=400)
+            if start < 0 or (end is not None and end < start):
+                return Response({
+                    "message": "from must be a position before to"
+                }, status=400)
+            highlights = highlights.overlapping(start, end).order_by(
+                'start', 'end')
 
-        serializer = HighlightSerializer(get_highlights(slug), many=True)
+        data = HighlightSerializer(highlights, many=True).data
         return Response({
-            "highlights": serializer.data,
-            "highlightsCount": get_highlights(slug).count()
+            "highlights": data,
+            "highlightsCount": len(data)
         }, status=200)
 
 
@@ -701,6 +953,40 @@ class UserLikesArticleView(APIView):
         })
 
 
+class ViewerStateView(APIView):
+    """
+    The requesting user's reaction, favorite, bookmark, review and author
+    follow for up to `MAX_ARTICLES` articles at once, given as
+    `?slugs=a,b` and/or `?ids=1,2`.
+    """
+    permission_classes = (IsAuthenticated,)
+    MAX_ARTICLES = 100
+
+    def get(self, request):
+        slugs = [slug for slug in request.GET.get('slugs', '').split(',')
+                 if slug]
+        try:
+            ids = [int(pk) for pk in request.GET.get('ids', '').split(',')
+                   if pk]
+        except ValueError:
+            return Response({"message": "ids must be a list of integers"},
+                            status=400)
+        if len(slugs) + len(ids) > self.MAX_ARTICLES:
+            return Response({
+                "message": "At most {} articles can be looked up at once"
+                .format(self.MAX_ARTICLES)}, status=400)
+        articles = [
+            {'id': pk, 'slug': slug, 'author': {'username': username}}
+            for pk, slug, username in Article.objects.filter(
+                Q(slug__in=slugs) | Q(id__in=ids)).values_list(
+                'id', 'slug', 'author__username')
+        ]
+        state = get_viewer_state(request.user, articles)
+        return Response({"viewer_state": OrderedDict(
+            (article['slug'], dict(state[article['id']], id=article['id']))
+            for article in articles)}, status=200)
+
+
 class AllUserLikesArticleView(APIView):
     """Fetches all articles that a user has liked not"""
     def get(self, request):
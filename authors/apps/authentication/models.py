@@ -1,13 +1,14 @@
 import jwt
 import os
 
-from datetime import datetime, timedelta, date
+from datetime import datetime, timedelta
 
 from django.conf import settings
 from django.contrib.auth.models import (
     AbstractBaseUser, BaseUserManager, PermissionsMixin
 )
 from django.db import models
+from authors.apps.core import throttling
 from .jwt_generator import jwt_encode, jwt_decode
 from rest_framework import exceptions
 from .utilities import dispatch_email
@@ -148,8 +149,9 @@ class User(AbstractBaseUser, PermissionsMixin):
         if serializer.is_valid(raise_exception=True):
             try:
                 user = User.objects.get(email=request.data['email'])
-                previous_user_requests = ResetPasswordToken.generate_request_instances(user.id)
-                if previous_user_requests < 3:
+                # at most THROTTLE_RULES['password_reset'] emails per user
+                retry_after = throttling.attempt('password_reset', user.pk)
+                if retry_after is None:
                     token = jwt_encode(user_id=user.pk, days=1)
                     user.persist_reset_token(user, token)
                     request_message = User.generate_reset_link(token)
@@ -160,8 +162,10 @@ class User(AbstractBaseUser, PermissionsMixin):
                     )
                     return output
                 else:
-                    return "You have exceeded the request limit for the past 24hours." \
-                         "Wait for at least a day before resubmitting the request" 
+                    raise exceptions.Throttled(
+                        retry_after,
+                        "You have exceeded the request limit for the past 24hours." \
+                        "Wait for at least a day before resubmitting the request")
             except User.DoesNotExist:
                 msg = "User with that email does not exist"
                 raise exceptions.AuthenticationFailed(msg)
@@ -211,17 +215,4 @@ class ResetPasswordToken(models.Model):
         verbose_name='when token was generated')
     class Meta:
         ordering = ('created_on',)
-    
-    @staticmethod
-    def generate_request_instances(user_id):
-        """
-        this method returns number of password reset requests a user has made
-        """
-        current_day = date.today()
-        print(current_day)
-        number_of_requests = ResetPasswordToken.objects.filter(
-            user=user_id,
-            created_on__startswith=current_day
-        ).count()
-        return number_of_requests
                 
\ No newline at end of file
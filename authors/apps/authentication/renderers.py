@@ -1,5 +1,3 @@
-import json
-
 from rest_framework.renderers import JSONRenderer
 
 
@@ -18,7 +16,8 @@ class UserJSONRenderer(JSONRenderer):
             # rendering errors.
             return super(UserJSONRenderer, self).render(data)
 
-        # Finally, we can render our data under the "user" namespace.
-        return json.dumps({
+        # Finally, we can render our data under the "user" namespace. The
+        # parent renderer encodes it once, straight to bytes.
+        return super(UserJSONRenderer, self).render({
             'user': data
         })
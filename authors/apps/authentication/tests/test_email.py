@@ -3,7 +3,7 @@ from django.urls import reverse
 from rest_framework import test, status
 from ..models import User
 from authors.apps.authentication.jwt_generator import jwt_encode
-from authors.apps.core.utils import send_verification_email
+from authors.apps.outbox.models import OutboxMessage
 
 
 class EmailTest(TestCase):
@@ -32,16 +32,26 @@ class EmailTest(TestCase):
         test_user = User.objects.get(email="tester@mail.com")
         self.assertFalse(test_user.is_verified)
 
-    def test_email_sent(self):
-        response = send_verification_email('authorshaven23@gmail.com',
-          'yt@yopmail.com',
-          'Please verify mail', '<p>hello sir<p>')
-        self.assertTrue(response.status_code == 202)
+    def test_verification_email_queued_on_signup(self):
+        self.client.post(
+            reverse('authentication:user-signup'),
+            data=self.data,
+            format="json"
+        )
+        message = OutboxMessage.objects.get()
+        self.assertEqual(message.recipient_list, ['tester3@mail.com'])
+        self.assertEqual(message.subject, 'Please verify your email')
+        self.assertEqual(message.content_type, 'text/html')
 
-    def test_error_email_not_sent(self):
-        response = send_verification_email('authorshaven23@gmail.com', 
-        'to', '', '<p>outhors</p>')
-        self.assertFalse(response)
+    def test_no_email_queued_on_failed_signup(self):
+        self.data['user']['email'] = 'not an email'
+        response = self.client.post(
+            reverse('authentication:user-signup'),
+            data=self.data,
+            format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(OutboxMessage.objects.exists())
 
     def test_verification_success_if_user_passes_valid_token(self):
         """Users should be able to verify their account if they pass a valid token"""
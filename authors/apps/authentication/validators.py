@@ -1,11 +1,15 @@
 import os
 import json
 
-from google.oauth2 import id_token
-from google.auth.transport import requests
+from authors.apps.core import outbound
+from authors.apps.core.outbound import ServiceUnavailable
+from authors.apps.core.startup import lazy_import
 
-import facebook
-from requests_oauthlib import OAuth1Session
+# the SDKs are only loaded once someone logs in with them
+id_token = lazy_import('google.oauth2.id_token')
+requests = lazy_import('google.auth.transport.requests')
+facebook = lazy_import('facebook')
+requests_oauthlib = lazy_import('requests_oauthlib')
 
 
 class GoogleValidate:
@@ -23,7 +27,8 @@ class GoogleValidate:
         """
 
         try:
-            decoded_google_user_info = id_token.verify_oauth2_token(
+            decoded_google_user_info = outbound.call(
+                'google', id_token.verify_oauth2_token,
                 access_token, requests.Request(),
                 os.getenv('SOCIAL_AUTH_GOOGLE_OAUTH2_KEY'))
         except ValueError:
@@ -46,8 +51,10 @@ class FacebookValidate:
         """
         try:
             graph = facebook.GraphAPI(access_token=token, version="3.1")
-            user_data_from_fb = graph.request(
-                '/me?fields=id,name,email')
+            user_data_from_fb = outbound.call(
+                'facebook', graph.request, '/me?fields=id,name,email')
+        except ServiceUnavailable:
+            raise
         except:
             user_data_from_fb = None
 
@@ -77,14 +84,16 @@ class TwitterValidate:
         access_token_key, access_token_secret = TwitterValidate.extract_tokens(
             access_tokens)
         try:
-            twitter = OAuth1Session(
+            twitter = requests_oauthlib.OAuth1Session(
                 client_key=os.getenv('SOCIAL_AUTH_TWITTER_KEY'),
                 client_secret=os.getenv('SOCIAL_AUTH_TWITTER_SECRET'),
                 resource_owner_key=access_token_key,
                 resource_owner_secret=access_token_secret)
-            raw_data_from_twitter = twitter.get(
-                verify_url + '?include_email=true')
+            raw_data_from_twitter = outbound.call(
+                'twitter', twitter.get, verify_url + '?include_email=true')
             user_data_from_twitter = json.loads(raw_data_from_twitter.text)
+        except ServiceUnavailable:
+            raise
         except:
             user_data_from_twitter = None
         return user_data_from_twitter
@@ -4,6 +4,7 @@ import os
 from django.template.loader import render_to_string
 from django.utils.html import strip_tags
 from django.conf import settings
+from django.db import transaction
 from rest_framework import status
 from rest_framework.generics import RetrieveUpdateAPIView
 from rest_framework.permissions import AllowAny, IsAuthenticated
@@ -19,7 +20,7 @@ from .serializers import (
     TwitterAuthSerializer
 )
 from authors.apps.authentication.jwt_generator import jwt_encode, jwt_decode
-from authors.apps.core.utils import send_verification_email
+from authors.apps.outbox.utils import enqueue_email
 from .models import User
 from .backends import JWTAuthentication
 from .jwt_generator import jwt_decode
@@ -28,6 +29,7 @@ from .jwt_generator import jwt_decode
 class RegistrationAPIView(APIView):
     # Allow any user (authenticated or not) to hit this endpoint.
     permission_classes = (AllowAny,)
+    throttle_scope = 'registration'
     renderer_classes = (UserJSONRenderer,)
     serializer_class = RegistrationSerializer
 
@@ -52,18 +54,13 @@ class RegistrationAPIView(APIView):
 
         html_message = render_to_string(template_name, context)
         subject = 'Please verify your email'
-        response = send_verification_email(
-            os.getenv('FROM_EMAIL'), user_email, subject, html_message)
 
-        if not response:
-            return Response(
-                {
-                    'error': 'something went wrong'
-                },
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
-        serializer.save()
+        # The verification email is queued with the new user and delivered
+        # by the outbox worker, so signing up never waits on SendGrid.
+        with transaction.atomic():
+            serializer.save()
+            enqueue_email([user_email], subject, html_message,
+                          content_type='text/html')
         serializer.validated_data.pop('password')
         return Response(
             serializer.validated_data,
@@ -72,6 +69,7 @@ class RegistrationAPIView(APIView):
 
 class LoginAPIView(APIView):
     permission_classes = (AllowAny,)
+    throttle_scope = 'login'
     renderer_classes = (UserJSONRenderer,)
     serializer_class = LoginSerializer
     @swagger_auto_schema(request_body=LoginSerializer,
@@ -207,6 +205,7 @@ class GoogleAuthView(GenericAPIView):
         Google authentication view access view
     """
     permission_classes = (AllowAny,)
+    throttle_scope = 'login'
     renderer_classes = (UserJSONRenderer,)
     serializer_class = GoogleAuthSerializer
 
@@ -232,6 +231,7 @@ class FacebookAuthAPIView(GenericAPIView):
         Facebook authentication view access view
     """
     permission_classes = (AllowAny,)
+    throttle_scope = 'login'
     renderer_classes = (UserJSONRenderer,)
     serializer_class = FacebookAuthSerializer
     @swagger_auto_schema(request_body=FacebookAuthSerializer,
@@ -255,6 +255,7 @@ class TwitterAuthAPIView(GenericAPIView):
         Twitter authentication view access view
     """
     permission_classes = (AllowAny,)
+    throttle_scope = 'login'
     renderer_classes = (UserJSONRenderer,)
     serializer_class = TwitterAuthSerializer
     @swagger_auto_schema(request_body=TwitterAuthSerializer,
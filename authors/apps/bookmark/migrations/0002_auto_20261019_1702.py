@@ -0,0 +1,30 @@
+# Generated by Django 2.1.7 on 2026-10-19 17:02
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0001_initial'),
+        ('bookmark', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bookmark',
+            name='article_slug',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='bookmark',
+            name='bookmarked_article',
+            field=models.ForeignKey(default=1, on_delete=django.db.models.deletion.CASCADE, related_name='bookmarks', to='articles.Article'),
+        ),
+        migrations.AlterField(
+            model_name='bookmark',
+            name='article_id',
+            field=models.IntegerField(default=0),
+        ),
+    ]
@@ -7,6 +7,19 @@ from rest_framework.exceptions import APIException
 from ..articles.models import Article
 from ..bookmark.models import Bookmark
 from ..authentication.models import User
+from authors.apps.core.streaming import StreamingJSONResponse
+
+
+def bookmark_entries(chunk):
+    return [
+        {
+            "id": row["id"],
+            "article_id": row["article_id"],
+            "article_slug": row["article_slug"],
+            "title": row["article_title"]
+        }
+        for row in chunk
+    ]
 
 
 class CreateBookmark(APIView):
@@ -69,14 +82,10 @@ class RetrieveBookmarks(APIView):
 
     def get(self, request):
         user = self.request.user
-        bookmark_list = user.bookmark_set.all()
-        bookmarks = []
-        for i in bookmark_list:
-            entry = {
-                "id": i.id,
-                "article_id": i.article_id,
-                "article_slug": i.article_slug,
-                "title": i.article_title
-            }
-            bookmarks.append(entry)
-        return Response({"success": bookmarks}, status=status.HTTP_200_OK)
+        bookmark_list = user.bookmark_set.values(
+            'id', 'article_id', 'article_slug', 'article_title')
+        return StreamingJSONResponse(
+            {"success": bookmark_list},
+            stream_key="success",
+            serialize=bookmark_entries,
+            status=status.HTTP_200_OK)
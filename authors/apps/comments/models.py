@@ -25,6 +25,10 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ["-createdAt"]
+        indexes = [
+            # an article's comments, newest first
+            models.Index(fields=['article', '-createdAt']),
+        ]
 
 
 class LikeDislikeComment(models.Model):
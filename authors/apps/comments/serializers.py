@@ -5,6 +5,7 @@ from authors.apps.profiles.serializers import ProfileSerializer
 from authors.apps.articles.serializers import (
     ArticleSerializer, CommentInlineSerializer
 )
+from authors.apps.core.serializers import SparseFieldsMixin
 
 
 class CommentHistoryField(serializers.ListField):
@@ -14,11 +15,16 @@ class CommentHistoryField(serializers.ListField):
         return super().to_representation(data.values())
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     body = serializers.CharField()
     author = UserSerializer(read_only=True)
     article = CommentInlineSerializer(read_only=True)
 
+    field_sources = {
+        'author': ['author__username', 'author__email'],
+        'article': ['article__slug'],
+    }
+
     class Meta:
         model = Comment
         fields = ['id', 'createdAt', 'updatedAt', 'body', 'article', 'author']
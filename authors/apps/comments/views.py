@@ -1,6 +1,7 @@
 import os
 from django.shortcuts import render
 from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
 from rest_framework import views, permissions, status, response, exceptions
 from .serializers import CommentSerializer, CommentHistorySerializer
 from authors.apps.comments.models import Comment, LikeDislikeComment
@@ -11,6 +12,22 @@ from rest_framework.response import Response
 from authors.apps.notify.views import NotificationsView
 from drf_yasg.utils import swagger_auto_schema
 from ..articles.views import find_article
+from authors.apps.core import cache as object_cache
+from authors.apps.core.serializers import fragment_name, sparse_fields
+
+
+def comment_dependencies(comment):
+    """Objects the serialized form of a comment is built from"""
+    return [('comment', comment.pk), ('user', comment.author_id),
+            ('article', comment.article_id)]
+
+
+def get_comments_data(comments, fields=None):
+    """Serialized comments, from the object cache where possible"""
+    return object_cache.get_fragments(
+        fragment_name('comment', fields), comments, comment_dependencies,
+        lambda missing: CommentSerializer(
+            missing, many=True, fields=fields).data)
 
 
 def find_comment(comment_id):
@@ -30,14 +47,20 @@ def find_comment(comment_id):
 
 class CommentsCreateList(views.APIView):
     permission_classes = (permissions.IsAuthenticated | ReadOnly,)
+    throttle_scope = 'comments'
 
     def get(self, request, slug):
         article = Article.objects.get(slug=slug)
-        comments = Comment.objects.filter(article=article)
-        serializer = CommentSerializer(comments, many=True)
+        fields = sparse_fields(request)
+        comments = Comment.objects.filter(article=article).only(
+            'author', 'article', *CommentSerializer.only_fields(fields))
+        related = [name for name in ('author', 'article')
+                   if fields is None or name in fields]
+        if related:
+            comments = comments.select_related(*related)
         return response.Response(
             {
-                "comments": serializer.data
+                "comments": get_comments_data(comments, fields)
             }
         )
 
@@ -50,7 +73,8 @@ class CommentsCreateList(views.APIView):
         serializer = CommentSerializer(data=request.data.get('comment'))
         article = Article.objects.get(slug=slug)
 
-        if serializer.is_valid(raise_exception=True):
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
             save_comment = serializer.save(
                 author=self.request.user,
                 article=article
@@ -65,28 +89,29 @@ class CommentsCreateList(views.APIView):
                 serializer.data,
                 'new-comment'
             )
-            return response.Response(
-                {
-                    "success": "Comment created successfully",
-                    "comment": serializer.data
-                },
-                status=status.HTTP_201_CREATED
-            )
+        return response.Response(
+            {
+                "success": "Comment created successfully",
+                "comment": serializer.data
+            },
+            status=status.HTTP_201_CREATED
+        )
 
 
 class CommentsDetail(views.APIView):
     permission_classes = (permissions.IsAuthenticated | ReadOnly,)
+    throttle_scope = 'comments'
     validation_message = (
         "Only the author of this comment can make the requested changes"
     )
 
     def get(self, request, slug, pk):
         try:
-            comment = Comment.objects.get(id=pk)
-            serializer = CommentSerializer(comment)
+            comment = Comment.objects.select_related(
+                'author', 'article').get(id=pk)
             return response.Response(
                 {
-                    "comments": serializer.data
+                    "comments": get_comments_data([comment])[0]
                 }
             )
         except ObjectDoesNotExist:
@@ -174,6 +199,7 @@ class LikeCommentView(views.APIView):
     method
     """
     permission_classes = (permissions.IsAuthenticated,)
+    throttle_scope = 'reactions'
 
     def post(self, request, pk):
         """
@@ -211,6 +237,7 @@ class DislikeCommentView(views.APIView):
     Class for POST view allowing authenticated users to dislike articles
     """
     permission_classes = (permissions.IsAuthenticated,)
+    throttle_scope = 'reactions'
 
     def post(self, request, pk):
         """
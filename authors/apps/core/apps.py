@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class CoreConfig(AppConfig):
+    name = 'authors.apps.core'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,165 @@
+"""
+Batched API requests: `POST /api/batch/` with
+
+    {"requests": [{"method": "GET", "url": "/api/articles/a-slug/"},
+                  {"method": "POST", "url": "/api/articles/a-slug/comments/",
+                   "body": {"comment": {"body": "Nice"}}}]}
+
+answers every sub-request, in order, in one envelope:
+
+    {"responses": [{"status": 200, "body": {...}},
+                   {"status": 201, "body": {...}}]}
+
+Sub-requests are dispatched through the URL resolver to the same views,
+in process. The caller is authenticated once, by the batch request, and
+every sub-request is made as that user. Throttles and permissions still
+apply to each sub-request.
+
+Consecutive GETs run concurrently on a pool of `BATCH_MAX_WORKERS`
+threads, and any other method waits for the sub-requests before it. Pool
+threads get their own database connections, which cannot see a
+transaction still open on the caller's, so inside `transaction.atomic()`,
+e.g. in tests, everything runs in order on the calling thread.
+"""
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from urllib.parse import unquote_to_bytes
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import close_old_connections, connection
+from django.urls import Resolver404, resolve
+from rest_framework.permissions import SAFE_METHODS
+
+from .routers import reading_from_replicas, use_replicas
+
+logger = logging.getLogger(__name__)
+
+METHODS = ('GET', 'POST', 'PUT', 'PATCH', 'DELETE')
+# the caller's headers that describe the batch itself, not a sub-request
+BATCH_HEADERS = ('CONTENT_TYPE', 'CONTENT_LENGTH', 'HTTP_IF_NONE_MATCH',
+                 'HTTP_IF_MODIFIED_SINCE', 'HTTP_IF_MATCH',
+                 'HTTP_IF_UNMODIFIED_SINCE')
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.BATCH_MAX_WORKERS,
+                thread_name_prefix='batch')
+        return _executor
+
+
+def validate(items):
+    """A message describing what is wrong with `items`, or None."""
+    if not isinstance(items, list) or not items:
+        return "requests must be a list of requests"
+    if len(items) > settings.BATCH_MAX_REQUESTS:
+        return "a batch can have at most {} requests".format(
+            settings.BATCH_MAX_REQUESTS)
+    for item in items:
+        if not isinstance(item, dict) or not isinstance(item.get('url'), str):
+            return "every request needs a url"
+        if not item['url'].startswith('/api/'):
+            return "request urls must start with /api/"
+        if item.get('method', 'GET').upper() not in METHODS:
+            return "request methods must be one of " + ', '.join(METHODS)
+    return None
+
+
+def build_request(caller, method, url, body):
+    """A request for `url` carrying the caller's headers and user."""
+    path, _, query = url.partition('?')
+    payload = b'' if body is None else json.dumps(body).encode('utf-8')
+    environ = {key: value for key, value in caller.META.items()
+               if key not in BATCH_HEADERS}
+    environ.update({
+        'REQUEST_METHOD': method,
+        # WSGI servers hand over the path percent-decoded, as latin-1
+        'PATH_INFO': unquote_to_bytes(path).decode('iso-8859-1'),
+        'QUERY_STRING': query,
+        'CONTENT_TYPE': 'application/json',
+        'CONTENT_LENGTH': str(len(payload)),
+        'wsgi.input': BytesIO(payload),
+    })
+    request = WSGIRequest(environ)
+    if caller.user.is_authenticated:
+        # DRF's forced authentication, so no sub-request decodes the token
+        # and loads the user again
+        request._force_auth_user = caller.user
+        request._force_auth_token = caller.auth
+    return request
+
+
+def content_of(response):
+    if hasattr(response, 'render') and callable(response.render):
+        response.render()
+    if response.streaming:
+        content = b''.join(response.streaming_content)
+    else:
+        content = response.content
+    if not content:
+        return None
+    if response.get('Content-Type', '').startswith('application/json'):
+        return json.loads(content.decode('utf-8'))
+    return content.decode(response.charset)
+
+
+def dispatch(caller, item):
+    """Answers one sub-request as `{'status': ..., 'body': ...}`."""
+    from .views import BatchView
+
+    request = build_request(caller, item.get('method', 'GET').upper(),
+                            item['url'], item.get('body'))
+    try:
+        match = resolve(request.path_info)
+    except Resolver404:
+        return {'status': 404, 'body': {'detail': 'Not found.'}}
+    if getattr(match.func, 'view_class', None) is BatchView:
+        return {'status': 400,
+                'body': {'message': 'batches cannot be nested'}}
+    request.resolver_match = match
+    try:
+        response = match.func(request, *match.args, **match.kwargs)
+        return {'status': response.status_code, 'body': content_of(response)}
+    except Exception:
+        logger.exception('Batched request to %s failed', item['url'])
+        return {'status': 500, 'body': {'detail': 'Server error.'}}
+
+
+def dispatch_in_pool(caller, item, replicas):
+    try:
+        with use_replicas(replicas):
+            return dispatch(caller, item)
+    finally:
+        close_old_connections()
+
+
+def run(caller, items):
+    """The responses to `items`, in order."""
+    if connection.in_atomic_block:
+        return [dispatch(caller, item) for item in items]
+    responses, reads = [], []
+
+    def wait_for_reads():
+        responses.extend(future.result() for future in reads)
+        reads.clear()
+
+    replicas = reading_from_replicas()
+    for item in items:
+        if item.get('method', 'GET').upper() in SAFE_METHODS:
+            reads.append(get_executor().submit(
+                dispatch_in_pool, caller, item, replicas))
+        else:
+            wait_for_reads()
+            responses.append(dispatch(caller, item))
+    wait_for_reads()
+    return responses
@@ -0,0 +1,140 @@
+"""
+Synthetic dataset used by the endpoint benchmarks.
+
+Every table an endpoint reads from gets rows, and the amount of data grows
+linearly with `scale`, so an endpoint that issues one query per row shows up
+as a query count that grows with the dataset.
+"""
+import itertools
+
+from authors.apps.articles.models import (Article, FavoriteModel, Highlight,
+                                          LikeArticles, ReviewsModel)
+from authors.apps.authentication.models import User
+from authors.apps.bookmark.models import Bookmark
+from authors.apps.comments.models import Comment, LikeDislikeComment
+from authors.apps.follow.models import Follows
+from authors.apps.notify.models import Notification
+from authors.apps.profiles.models import Profile
+from authors.apps.report.models import Report
+
+PASSWORD = 'Bench12345'
+TAGS = ['python', 'django', 'api', 'writing', 'fiction', 'poetry']
+BODY = ('Authors Haven is a community of like minded authors. ' * 20).strip()
+
+
+class Dataset:
+    """Handles to the seeded rows that route specs build their URLs from."""
+
+    def __init__(self, scale):
+        self.scale = scale
+        self.users = []
+        self.articles = []
+        self.comments = []
+        self.stranger = None
+        self.newcomer = None
+
+    @property
+    def user(self):
+        """The user every benchmark request is made as."""
+        return self.users[0]
+
+    @property
+    def author(self):
+        """Writes the article the user reads and reacts to."""
+        return self.users[1]
+
+    @property
+    def article(self):
+        """An article by another author, so the user may react to it."""
+        return self.articles[1]
+
+    @property
+    def own_article(self):
+        return self.articles[0]
+
+    @property
+    def comment(self):
+        return self.comments[0]
+
+    @property
+    def notification(self):
+        return Notification.objects.filter(recepient=self.user).first()
+
+    @property
+    def image_id(self):
+        return self.article.article_images.first().pk
+
+
+def seed(scale=1):
+    """Creates the benchmark dataset and returns a `Dataset`."""
+    dataset = Dataset(scale)
+    user_count = 4 * scale
+    articles_per_user = 3
+
+    for number in range(user_count):
+        user = User.objects.create_user(
+            'bench{}'.format(number), 'bench{}@mail.com'.format(number),
+            PASSWORD)
+        user.is_verified = True
+        user.save()
+        Profile.objects.create(user=user, user_bio='Bio', name='Bench User')
+        dataset.users.append(user)
+
+    # not verified yet and followed by nobody
+    dataset.stranger = User.objects.create_user(
+        'stranger', 'stranger@mail.com', PASSWORD)
+    Profile.objects.create(user=dataset.stranger, name='Stranger')
+    # has not created a profile yet
+    dataset.newcomer = User.objects.create_user(
+        'newcomer', 'newcomer@mail.com', PASSWORD)
+
+    # every user follows every other user
+    for follower, followed in itertools.permutations(dataset.users, 2):
+        Follows.objects.create(follower=follower,
+                               followed_user=followed.username)
+
+    for number in range(user_count * articles_per_user):
+        author = dataset.users[number % user_count]
+        article = Article.objects.create(
+            title='Benchmark article {}'.format(number),
+            description='A synthetic article',
+            body=BODY,
+            is_published=True,
+            author=author)
+        article.tags.add(*TAGS[number % 3:number % 3 + 3])
+        article.article_images.create(
+            image_url='https://res.cloudinary.com/demo/image.png',
+            public_id='bench{}'.format(number), width=10, height=10)
+        dataset.articles.append(article)
+
+    for article, user in itertools.product(dataset.articles, dataset.users):
+        own = article.author_id == user.pk
+        LikeArticles.objects.create(user=user, article=article,
+                                    likes=article.pk % 2)
+        comment = Comment.objects.create(author=user, article=article,
+                                         body='First draft of a comment')
+        # an edit gives every comment some history
+        comment.body = 'Edited comment'
+        comment.save()
+        LikeDislikeComment.objects.create(user=user, comment=comment,
+                                          likes=1)
+        dataset.comments.append(comment)
+        Highlight.objects.create(article=article, user=user, start=0,
+                                 end=10, section=article.body[0:11])
+        FavoriteModel.objects.create(user=user, article=article,
+                                     favorite=True)
+        if not own:
+            ReviewsModel.objects.create(article=article, reviewed_by=user,
+                                        review_body='Nice', rating_value=4)
+        Report.objects.create(article=article, reporter=user.email,
+                              violation='Spam')
+        Notification.objects.create(
+            recepient=user, body='@{} posted'.format(article.author_id))
+
+    for article in dataset.articles:
+        bookmark = Bookmark.objects.create(
+            article_title=article.title, bookmarked_article=article,
+            article_id=article.pk, article_slug=article.slug)
+        bookmark.user.add(*dataset.users)
+
+    return dataset
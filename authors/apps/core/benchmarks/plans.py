@@ -0,0 +1,194 @@
+"""
+The API's hot queries and the plans the database picks for them.
+
+`HOT_QUERIES` holds, by name, the queries every request to a busy route
+issues. `python manage.py check_query_plans` seeds a dataset large enough
+for the planner to prefer an index over reading a whole table, runs
+EXPLAIN on each query and fails when one reads a table sequentially,
+which is what a query without a supporting index does once its table
+grows.
+"""
+import re
+from collections import OrderedDict
+
+from django.contrib.auth.hashers import make_password
+from django.db import connection
+from django.db.models import Count
+
+from authors.apps.articles.models import (Article, Highlight, LikeArticles,
+                                          ReviewsModel)
+from authors.apps.authentication.models import User
+from authors.apps.comments.models import Comment
+from authors.apps.notify.models import Notification
+from authors.apps.report.models import Report
+
+from .dataset import BODY, PASSWORD
+
+# (vendor, pattern); group 1 is the table read sequentially
+SEQUENTIAL_SCANS = [
+    ('postgresql', re.compile(r'\bSeq Scan on (\w+)')),
+    # SQLite says SCAN (TABLE in older versions) then USING ... INDEX when
+    # it walks an index instead of the table
+    ('sqlite', re.compile(r'\bSCAN (?:TABLE )?(\w+)\b(?! USING)')),
+]
+
+HOT_QUERIES = OrderedDict()
+
+
+def hot_query(name):
+    def register(build):
+        HOT_QUERIES[name] = build
+        return build
+    return register
+
+
+class Dataset:
+    """The rows the hot queries look up."""
+
+    def __init__(self, user, article):
+        self.user = user
+        self.article = article
+
+
+def seed(articles=20000):
+    """
+    Creates `articles` articles, three in four published, and the likes,
+    comments, highlights, reviews, reports and notifications around them,
+    with a bulk insert per table. Returns a `Dataset`.
+    """
+    password = make_password(PASSWORD)
+    User.objects.bulk_create(
+        User(username='plans{}'.format(number),
+             email='plans{}@mail.com'.format(number), password=password)
+        for number in range(max(articles // 100, 10)))
+    users = list(User.objects.filter(username__startswith='plans'))
+
+    Article.objects.bulk_create(
+        Article(title='Plan article {}'.format(number),
+                slug='plan-article-{}'.format(number),
+                description='A synthetic article', body=BODY,
+                read_time='1 min', is_published=number % 4 != 0,
+                trending_score=number % 97,
+                author=users[number % len(users)])
+        for number in range(articles))
+    article_ids = list(Article.objects.filter(
+        slug__startswith='plan-article-').values_list('pk', flat=True))
+
+    def each_article(build, per_article=1):
+        return [build(article_id, number,
+                      users[(article_id + number) % len(users)])
+                for article_id in article_ids
+                for number in range(per_article)]
+
+    LikeArticles.objects.bulk_create(each_article(
+        lambda article_id, number, user: LikeArticles(
+            article_id=article_id, user=user, likes=number % 2), 4))
+    Comment.objects.bulk_create(each_article(
+        lambda article_id, number, user: Comment(
+            article_id=article_id, author=user, body='Nice read'), 2))
+    Highlight.objects.bulk_create(each_article(
+        lambda article_id, number, user: Highlight(
+            article_id=article_id, user=user, start=number * 10,
+            end=number * 10 + 5, section='Authors'), 2))
+    ReviewsModel.objects.bulk_create(each_article(
+        lambda article_id, number, user: ReviewsModel(
+            article_id=article_id, reviewed_by=user, rating_value=4), 2))
+    Report.objects.bulk_create(each_article(
+        lambda article_id, number, user: Report(
+            article_id=article_id, reporter=user.email, violation='Spam',
+            isResolved=article_id % 3 == 0)))
+    Notification.objects.bulk_create(each_article(
+        lambda article_id, number, user: Notification(
+            recepient=user, body='@{} posted'.format(article_id),
+            is_read=number == 0), 2))
+
+    with connection.cursor() as cursor:
+        # gives the planner the table sizes the plans are checked against
+        cursor.execute('ANALYZE')
+    return Dataset(users[0], Article.objects.get(pk=article_ids[1]))
+
+
+@hot_query('published articles, newest first')
+def published_articles(dataset):
+    return Article.objects.filter(is_published=True).order_by(
+        '-date_created')[:20]
+
+
+@hot_query('published articles, trending')
+def trending_articles(dataset):
+    return Article.objects.filter(is_published=True).order_by(
+        '-trending_score', '-id')[:20]
+
+
+@hot_query('article by slug')
+def article_by_slug(dataset):
+    return Article.objects.filter(slug=dataset.article.slug)
+
+
+@hot_query('reaction counts of a page of articles')
+def reaction_counts(dataset):
+    return LikeArticles.objects.filter(
+        article__in=[dataset.article.pk]).values_list(
+        'article', 'likes').annotate(total=Count('id')).order_by()
+
+
+@hot_query("a user's reaction to an article")
+def user_reaction(dataset):
+    return LikeArticles.objects.filter(article=dataset.article,
+                                       user=dataset.user)
+
+
+@hot_query("an article's comments")
+def article_comments(dataset):
+    return Comment.objects.filter(article=dataset.article)
+
+
+@hot_query('highlights in a range of an article')
+def highlights_in_range(dataset):
+    return Highlight.objects.filter(article=dataset.article).overlapping(
+        0, 15).order_by('start', 'end')
+
+
+@hot_query("a user's review of an article")
+def user_review(dataset):
+    return ReviewsModel.objects.filter(article=dataset.article,
+                                       reviewed_by=dataset.user)
+
+
+@hot_query("an article's open reports")
+def open_reports(dataset):
+    return Report.objects.filter(article=dataset.article, isResolved=False)
+
+
+@hot_query("a user's notifications")
+def inbox(dataset):
+    return Notification.objects.filter(recepient=dataset.user)
+
+
+@hot_query("a user's unread notifications")
+def unread_notifications(dataset):
+    return Notification.objects.filter(recepient=dataset.user,
+                                       is_read=False)
+
+
+def sequential_scans(plan, vendor=None):
+    """The tables `plan`, EXPLAIN's output, reads sequentially."""
+    vendor = vendor or connection.vendor
+    return [table for pattern_vendor, pattern in SEQUENTIAL_SCANS
+            if pattern_vendor == vendor for table in pattern.findall(plan)]
+
+
+def explain(dataset):
+    """Yields `(name, plan)` for every hot query."""
+    for name, build in HOT_QUERIES.items():
+        yield name, build(dataset).explain()
+
+
+def check(explained):
+    """
+    A message for each query of `explained`, `(name, plan)` pairs, that
+    reads a table sequentially.
+    """
+    return ['{} reads {} sequentially'.format(name, ', '.join(tables))
+            for name, plan in explained
+            for tables in [sequential_scans(plan)] if tables]
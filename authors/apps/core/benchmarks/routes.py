@@ -0,0 +1,175 @@
+"""
+The request the benchmark makes for each named route in `authors/urls.py`.
+
+Every route must have an entry; `test_every_route_is_benchmarked` fails when
+a new route is added without one. Routes that only talk to third parties
+are listed with a `skip` reason instead of a request.
+"""
+from django.urls import reverse
+
+from authors.apps.authentication.jwt_generator import jwt_encode
+
+
+class Request:
+    """
+    `kwargs` and `data` build the URL kwargs and request body from the
+    dataset; `user` picks who makes the request (`dataset.user` by default).
+    """
+
+    def __init__(self, method='get', kwargs=None, data=None, user=None,
+                 skip=None):
+        self.method = method
+        self.kwargs = kwargs or (lambda dataset: {})
+        self.data = data or (lambda dataset: None)
+        self.user = user or (lambda dataset: dataset.user)
+        self.skip = skip
+
+
+def article_slug(dataset):
+    return {'slug': dataset.article.slug}
+
+
+def comment_on_article(dataset):
+    return {'slug': dataset.article.slug, 'pk': dataset.comment.pk}
+
+
+def article_screen(dataset):
+    """The batch a client loads an article's page with."""
+    slug = article_slug(dataset)
+    urls = [
+        reverse('articles:details', kwargs=slug),
+        reverse('comments:create-list', kwargs=slug),
+        reverse('articles:review', kwargs=slug),
+        reverse('articles:highlight-article', kwargs=slug),
+        reverse('profile:profile-fetch',
+                kwargs={'username': dataset.author.username}),
+    ]
+    return {'requests': [{'method': 'GET', 'url': url} for url in urls]}
+
+
+ROUTES = {
+    # authentication
+    'authentication:user-details': Request(),
+    'authentication:user-signup': Request('post', data=lambda dataset: {
+        'user': {'email': 'new@mail.com', 'username': 'newbie',
+                 'password': 'Newbie12345'}}),
+    'authentication:user-login': Request('post', data=lambda dataset: {
+        'user': {'email': dataset.user.email, 'password': 'Bench12345'}}),
+    'authentication:email verification': Request(
+        kwargs=lambda dataset: {'token': jwt_encode(dataset.stranger.email)}),
+    'authentication:password-reset': Request(
+        'post', data=lambda dataset: {'email': dataset.user.email}),
+    'authentication:set-updated-password': Request(
+        'put',
+        kwargs=lambda dataset: {
+            'reset_token': jwt_encode(user_id=dataset.user.pk, days=1)},
+        data=lambda dataset: {'password': 'Changed12345'}),
+    'authentication:google': Request(skip='calls Google'),
+    'authentication:facebook': Request(skip='calls Facebook'),
+    'authentication:twitter': Request(skip='calls Twitter'),
+
+    # profiles
+    'profile:profile-image': Request(skip='uploads to Cloudinary'),
+    'profile:profile-create': Request(
+        'post', user=lambda dataset: dataset.newcomer,
+        data=lambda dataset: {
+            'profile': {'user_bio': 'Bio', 'name': 'Bench User'}}),
+    'profile:profile-fetch': Request(
+        kwargs=lambda dataset: {'username': dataset.author.username}),
+    'profile:profile-edit': Request(
+        'put', kwargs=lambda dataset: {'username': dataset.user.username},
+        data=lambda dataset: {'profile': {'user_bio': 'New bio'}}),
+    'profile:profile-all': Request(),
+
+    # articles
+    'articles:create-list': Request(),
+    'articles:favorite-list': Request(),
+    'articles:liked-all': Request(),
+    'articles:viewer-state': Request(data=lambda dataset: {
+        'slugs': ','.join(article.slug for article in dataset.articles[:20])}),
+    'articles:details': Request(kwargs=article_slug),
+    'articles:liked-me': Request(kwargs=article_slug),
+    'articles:add-image': Request(kwargs=article_slug),
+    'articles:image-details': Request(kwargs=lambda dataset: {
+        'slug': dataset.article.slug, 'id': dataset.image_id}),
+    'articles:review': Request(kwargs=article_slug),
+    'articles:alter-review': Request(
+        'put',
+        kwargs=lambda dataset: {'slug': dataset.article.slug,
+                                'username': dataset.user.username},
+        data=lambda dataset: {'review': {'rating_value': 5}}),
+    'articles:favorite': Request('post', kwargs=article_slug),
+    'articles:like-article': Request('post', kwargs=article_slug),
+    'articles:dislike-article': Request('post', kwargs=article_slug),
+    'articles:highlight-article': Request(kwargs=article_slug),
+    'articles:share-article': Request(kwargs=lambda dataset: {
+        'slug': dataset.article.slug, 'provider': 'twitter'}),
+
+    # follow
+    'follow:follow-user': Request('post', kwargs=lambda dataset: {
+        'user_to_follow': dataset.stranger.username}),
+    'follow:check-follow': Request('post', kwargs=lambda dataset: {
+        'user_to_follow': dataset.author.username}),
+    'follow:list-followers': Request(),
+    'follow:list-followings': Request(),
+    'follow:unfollow-user': Request('delete', kwargs=lambda dataset: {
+        'followed_user': dataset.author.username}),
+    'follow:count-follows': Request(
+        kwargs=lambda dataset: {'user': dataset.user.username}),
+
+    # reports
+    'report:report-create': Request(
+        kwargs=lambda dataset: {'id': dataset.article.pk}),
+    'report:fetch-reports': Request(),
+
+    # comments
+    'comments:like': Request(
+        'post', kwargs=lambda dataset: {'pk': dataset.comment.pk}),
+    'comments:dislike': Request(
+        'post', kwargs=lambda dataset: {'pk': dataset.comment.pk}),
+    'comments:rating': Request(
+        kwargs=lambda dataset: {'pk': dataset.comment.pk}),
+    'comments:check-rating': Request(kwargs=lambda dataset: {
+        'username': dataset.user.username, 'pk': dataset.comment.pk}),
+    'comments:create-list': Request(kwargs=article_slug),
+    'comments:details': Request(kwargs=comment_on_article),
+    'comments:comment-history': Request(kwargs=comment_on_article),
+
+    # stats
+    'stats:popular-articles': Request(),
+    'stats:liked-articles': Request(
+        kwargs=lambda dataset: {'username': dataset.user.username}),
+    'stats:user-articles': Request(
+        kwargs=lambda dataset: {'username': dataset.user.username}),
+
+    # notifications
+    'notifications:all-notifications': Request(),
+    'notifications:subscription': Request(),
+    'notifications:detail-notification': Request(
+        kwargs=lambda dataset: {'id': dataset.notification.pk}),
+    'notifications:state-notification': Request(
+        kwargs=lambda dataset: {'id': dataset.notification.pk}),
+    'notifications:read-all-notifications': Request('put'),
+    'notifications:read-unread-notifications': Request(
+        kwargs=lambda dataset: {'action': 'unread'}),
+
+    # tags
+    'tags:tag-list': Request(),
+
+    # search
+    'search:suggest': Request(data=lambda dataset: {
+        'q': dataset.article.title[:3]}),
+
+    # bookmarks
+    'bookmark:bookmark-create': Request(
+        kwargs=lambda dataset: {'article_id': dataset.article.pk}),
+    'bookmark:bookmark-list': Request(),
+
+    # operations
+    'core:batch': Request('post', data=article_screen),
+    'core:outbound-metrics': Request(),
+
+    # API documentation
+    'schema-redoc': Request(),
+    'schema-swagger-ui': Request(),
+}
@@ -0,0 +1,138 @@
+"""
+Runs one request per named route against the seeded dataset and records how
+many queries it issued, how long it took and how much memory it allocated.
+
+Each request runs inside a savepoint that is rolled back afterwards, so
+every route sees the same data no matter which routes ran before it.
+"""
+import json
+import os
+import time
+import tracemalloc
+
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+from rest_framework.test import APIClient
+
+from .routes import ROUTES
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+# Headroom over the recorded query count before a route fails its budget.
+QUERY_HEADROOM = 2
+
+
+class Rollback(Exception):
+    pass
+
+
+class Result:
+    def __init__(self, name, status=None, queries=None, duration=None,
+                 peak_memory=None, skipped=None):
+        self.name = name
+        self.status = status
+        self.queries = queries
+        self.duration = duration
+        self.peak_memory = peak_memory
+        self.skipped = skipped
+
+    def as_row(self):
+        if self.skipped:
+            return '{:<48} skipped: {}'.format(self.name, self.skipped)
+        return '{:<48} {:>4} {:>6} queries {:>9.1f} ms {:>9.1f} KiB'.format(
+            self.name, self.status, self.queries, self.duration * 1000,
+            self.peak_memory / 1024)
+
+
+def route_names(resolver=None, namespace=''):
+    """Every named route in the URLconf, e.g. `articles:details`."""
+    resolver = resolver or get_resolver()
+    names = set()
+    for pattern in resolver.url_patterns:
+        if isinstance(pattern, URLResolver):
+            if pattern.app_name == 'admin':
+                continue
+            prefix = namespace
+            if pattern.namespace:
+                prefix = '{}{}:'.format(namespace, pattern.namespace)
+            names |= route_names(pattern, prefix)
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            names.add(namespace + pattern.name)
+    return names
+
+
+def run_route(name, dataset):
+    spec = ROUTES[name]
+    if spec.skip:
+        return Result(name, skipped=spec.skip)
+
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION='Bearer ' + spec.user(dataset).get_token)
+    url = reverse(name, kwargs=spec.kwargs(dataset))
+    data = spec.data(dataset)
+    result = Result(name)
+    try:
+        with transaction.atomic():
+            tracemalloc.start()
+            with CaptureQueriesContext(connection) as context:
+                started = time.perf_counter()
+                response = getattr(client, spec.method)(
+                    url, data, format='json')
+                if response.streaming:
+                    b''.join(response.streaming_content)
+                result.duration = time.perf_counter() - started
+            result.peak_memory = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            result.status = response.status_code
+            result.queries = len(context.captured_queries)
+            raise Rollback
+    except Rollback:
+        pass
+    finally:
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+    return result
+
+
+def run(dataset, names=None):
+    return [run_route(name, dataset) for name in sorted(names or ROUTES)]
+
+
+def load_baseline(path=BASELINE_PATH):
+    with open(path) as baseline:
+        return json.load(baseline)
+
+
+def write_baseline(results, scale, path=BASELINE_PATH):
+    routes = {
+        result.name: {'queries': result.queries,
+                      'budget': result.queries + QUERY_HEADROOM}
+        for result in results if not result.skipped
+    }
+    with open(path, 'w') as baseline:
+        json.dump({'scale': scale, 'routes': routes}, baseline, indent=2,
+                  sort_keys=True)
+        baseline.write('\n')
+
+
+def check(results, baseline):
+    """
+    Returns a description of every route that errored or issued more
+    queries than its budget in `baseline`.
+    """
+    violations = []
+    for result in results:
+        if result.skipped:
+            continue
+        if result.status >= 500:
+            violations.append('{} returned {}'.format(
+                result.name, result.status))
+        budget = baseline['routes'].get(result.name, {}).get('budget')
+        if budget is None:
+            violations.append('{} has no query budget'.format(result.name))
+        elif result.queries > budget:
+            violations.append('{} issued {} queries, budget is {}'.format(
+                result.name, result.queries, budget))
+    return violations
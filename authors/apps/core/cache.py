@@ -0,0 +1,164 @@
+"""
+Versioned object cache.
+
+Serialized representations ("fragments") of articles, profiles and comments
+are cached under keys that embed the current version of every object the
+representation is built from, e.g. an article fragment depends on the
+article and on its author:
+
+    article:v3:42|user:v7:5
+
+Changing any of those objects bumps its version (see `core/signals.py`), so
+stale fragments are never read again and simply expire. Nothing has to
+know which fragments exist in order to invalidate them.
+
+A read replica may not have an object's latest change for a while after
+its version is bumped. Fragments built while reading from replicas are
+therefore not kept when one of their objects changed in the last
+`REPLICA_PIN_SECONDS`; they are served once and built again later.
+
+The cache is `settings.CACHES['default']`, a table in the primary database
+unless configured otherwise, so every process sees the same versions.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+
+from .routers import reading_from_replicas
+
+STATS = ('hits', 'misses', 'invalidations')
+
+
+def version_key(label, pk):
+    return 'version:{}:{}'.format(label, pk)
+
+
+def changed_key(label, pk):
+    return 'changed:{}:{}'.format(label, pk)
+
+
+def lookup_key(label, field, value):
+    """Key for caching which object has `field` equal to `value`."""
+    return 'lookup:{}:{}:{}'.format(label, field, value)
+
+
+def new_version():
+    # used when a version key is missing, e.g. after eviction, so the new
+    # version can never match a fragment cached under an older one
+    return int(time.time() * 1000)
+
+
+def get_versions(dependencies):
+    """Current versions of `(label, pk)` pairs, as a dict keyed by pair."""
+    keys = {version_key(*dependency): dependency
+            for dependency in dependencies}
+    found = cache.get_many(list(keys))
+    missing = {key: new_version() for key in keys if key not in found}
+    if missing:
+        cache.set_many(missing, None)
+        found.update(missing)
+    return {dependency: found[key] for key, dependency in keys.items()}
+
+
+def bump_version(label, pk):
+    key = version_key(label, pk)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, new_version(), None)
+    cache.set(changed_key(label, pk), True, settings.REPLICA_PIN_SECONDS)
+
+
+def recently_changed(dependencies):
+    """The `(label, pk)` pairs changed in the last REPLICA_PIN_SECONDS."""
+    keys = {changed_key(*dependency): dependency
+            for dependency in dependencies}
+    return {keys[key] for key in cache.get_many(list(keys))}
+
+
+def invalidate(label, pk):
+    """
+    Retires every fragment built from the object `label`/`pk`.
+
+    Inside a transaction the version is bumped again once it commits, so a
+    fragment built by a concurrent request from the data committed before
+    the change is not kept.
+    """
+    bump_version(label, pk)
+    if connection.in_atomic_block:
+        transaction.on_commit(lambda: bump_version(label, pk))
+    record('invalidations')
+
+
+def fragment_key(name, dependencies, versions):
+    return 'fragment:{}:{}'.format(name, '|'.join(
+        '{}:v{}:{}'.format(label, versions[(label, pk)], pk)
+        for label, pk in dependencies))
+
+
+def get_fragments(name, objects, dependencies, serialize):
+    """
+    Returns the serialized form of each of `objects`, in order.
+
+    `dependencies(obj)` lists the `(label, pk)` pairs the representation of
+    `obj` is built from, and `serialize(objects)` serializes a list of
+    objects the way the view would. Only the objects missing from the
+    cache are serialized, in one call.
+    """
+    objects = list(objects)
+    if not objects:
+        return []
+    object_dependencies = [dependencies(obj) for obj in objects]
+    versions = get_versions({
+        dependency for pairs in object_dependencies for dependency in pairs})
+    keys = [fragment_key(name, pairs, versions)
+            for pairs in object_dependencies]
+    cached = cache.get_many(keys)
+
+    missing = [(key, obj, pairs)
+               for key, obj, pairs in zip(keys, objects, object_dependencies)
+               if key not in cached]
+    if missing:
+        built = serialize([obj for key, obj, pairs in missing])
+        fresh = {key: data for (key, obj, pairs), data in zip(missing, built)}
+        cached.update(fresh)
+        if reading_from_replicas():
+            changed = recently_changed({
+                dependency for key, obj, pairs in missing
+                for dependency in pairs})
+            for key, obj, pairs in missing:
+                if changed.intersection(pairs):
+                    del fresh[key]
+        cache.set_many(fresh, settings.OBJECT_CACHE_TIMEOUT)
+    record('hits', len(objects) - len(missing))
+    record('misses', len(missing))
+    return [cached[key] for key in keys]
+
+
+def get_fragment(name, obj, dependencies, serialize):
+    return get_fragments(name, [obj], dependencies, serialize)[0]
+
+
+def record(stat, count=1):
+    if not count:
+        return
+    key = 'stats:' + stat
+    try:
+        cache.incr(key, count)
+    except ValueError:
+        cache.add(key, 0, None)
+        cache.incr(key, count)
+
+
+def get_stats():
+    values = cache.get_many(['stats:' + stat for stat in STATS])
+    stats = {stat: values.get('stats:' + stat, 0) for stat in STATS}
+    lookups = stats['hits'] + stats['misses']
+    stats['hit_ratio'] = stats['hits'] / lookups if lookups else 0.0
+    return stats
+
+
+def reset_stats():
+    cache.delete_many(['stats:' + stat for stat in STATS])
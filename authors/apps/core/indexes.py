@@ -0,0 +1,142 @@
+"""
+Indexes `Meta.indexes` cannot declare in Django 2.1: partial indexes and
+GiST indexes over ranges.
+
+A post_migrate receiver (`core/signals.py`) creates them once their
+model's app has migrated, with CREATE INDEX IF NOT EXISTS, so running
+`migrate` again leaves them alone. post_migrate is sent for every app
+whichever app was migrated, so an index is skipped until its table has
+all of its columns.
+
+PostgreSQL gets a partial index only over the rows matching `condition`.
+psycopg2 inlines query parameters, so a query filtering on the same
+values matches the index's WHERE. SQLite only matches a partial index
+against literals, and Django binds values as parameters, so everywhere
+else the condition's columns lead an index over every row instead.
+
+A range index covers the range from one column to another, per value of
+a `group` column. On PostgreSQL it is a GiST index on `int4range(start,
+end, '[]')`, which finds the rows whose range overlaps another with `&&`
+however many rows start before it. The `btree_gist` extension lets the
+group column share that index. Elsewhere it is a B-tree on (group,
+start, end): rows starting before the end of the range are a range scan,
+and those ending before its start are skipped within the index.
+"""
+from django.apps import apps
+
+
+class PartialIndex:
+
+    def __init__(self, name, model, fields, condition):
+        self.name = name
+        self.model = model
+        self.fields = fields
+        self.condition = condition
+
+    @property
+    def app_label(self):
+        return self.model.split('.')[0]
+
+    @property
+    def field_names(self):
+        return ([field.lstrip('-') for field in self.fields] +
+                list(self.condition))
+
+    def sql(self, schema_editor):
+        model = apps.get_model(self.model)
+        quote = schema_editor.quote_name
+        columns = [
+            '{} {}'.format(
+                quote(model._meta.get_field(field.lstrip('-')).column),
+                'DESC' if field.startswith('-') else 'ASC')
+            for field in self.fields]
+        condition = [
+            (quote(model._meta.get_field(field).column), value)
+            for field, value in sorted(self.condition.items())]
+        where = ''
+        if schema_editor.connection.vendor == 'postgresql':
+            where = ' WHERE ' + ' AND '.join(
+                '{} = {}'.format(column, schema_editor.quote_value(value))
+                for column, value in condition)
+        else:
+            columns = [column for column, _ in condition] + columns
+        return ['CREATE INDEX IF NOT EXISTS {} ON {} ({}){}'.format(
+            quote(self.name), quote(model._meta.db_table),
+            ', '.join(columns), where)]
+
+
+class RangeIndex:
+
+    def __init__(self, name, model, group, start, end):
+        self.name = name
+        self.model = model
+        self.group = group
+        self.start = start
+        self.end = end
+
+    @property
+    def app_label(self):
+        return self.model.split('.')[0]
+
+    @property
+    def field_names(self):
+        return [self.group, self.start, self.end]
+
+    def sql(self, schema_editor):
+        model = apps.get_model(self.model)
+        group, start, end = [
+            schema_editor.quote_name(model._meta.get_field(field).column)
+            for field in (self.group, self.start, self.end)]
+        statements = []
+        if schema_editor.connection.vendor == 'postgresql':
+            statements.append('CREATE EXTENSION IF NOT EXISTS btree_gist')
+            method = ' USING gist'
+            columns = [group, "int4range({}, {}, '[]')".format(start, end)]
+        else:
+            method = ''
+            columns = [group, start, end]
+        statements.append('CREATE INDEX IF NOT EXISTS {} ON {}{} ({})'.format(
+            schema_editor.quote_name(self.name),
+            schema_editor.quote_name(model._meta.db_table), method,
+            ', '.join(columns)))
+        return statements
+
+
+INDEXES = [
+    # the article list, newest first, read off an index of published rows
+    PartialIndex('article_published_recent', 'articles.Article',
+                 ['-date_created'], {'is_published': True}),
+    # ?sort=trending
+    PartialIndex('article_published_trending', 'articles.Article',
+                 ['-trending_score', '-id'], {'is_published': True}),
+    # highlights overlapping a range of an article's body
+    RangeIndex('highlight_span', 'articles.Highlight', 'article', 'start',
+               'end'),
+]
+
+
+def columns_exist(index, connection):
+    """Whether the table of `index` exists and has all of its columns."""
+    model = apps.get_model(index.model)
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if table not in connection.introspection.table_names(cursor):
+            return False
+        columns = {column.name for column in
+                   connection.introspection.get_table_description(
+                       cursor, table)}
+    return all(model._meta.get_field(field).column in columns
+               for field in index.field_names)
+
+
+def create_indexes(app_label, connection):
+    """Creates the indexes on the models of `app_label` whose columns have
+    been migrated."""
+    indexes = [index for index in INDEXES if index.app_label == app_label and
+               columns_exist(index, connection)]
+    if not indexes:
+        return
+    with connection.schema_editor() as schema_editor:
+        for index in indexes:
+            for statement in index.sql(schema_editor):
+                schema_editor.execute(statement)
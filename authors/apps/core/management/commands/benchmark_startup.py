@@ -0,0 +1,53 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = ('Starts fresh interpreters that load authors.wsgi and warm up, '
+            'and reports how long that took and the slowest imports.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=3)
+        parser.add_argument('--top', type=int, default=25,
+                            help='How many modules to list.')
+        parser.add_argument(
+            '--packages', action='store_true',
+            help='Add up modules by top-level package.')
+
+    def handle(self, *args, **options):
+        runs = [self.profile() for _ in range(options['runs'])]
+        for phase in ('application', 'warmup'):
+            self.stdout.write('{:<12} {:8.1f} ms (median of {})'.format(
+                phase, 1000 * statistics.median(
+                    run[phase] for run in runs), len(runs)))
+
+        # (self, cumulative) seconds per module, averaged over the runs; a
+        # package's cumulative time would count its modules over and over
+        modules = {}
+        for run in runs:
+            for name, (own, cumulative) in run['modules'].items():
+                if options['packages']:
+                    name = name.split('.')[0]
+                totals = modules.setdefault(name, [0, 0])
+                totals[0] += own / len(runs)
+                totals[1] += cumulative / len(runs)
+        self.stdout.write('\n{:<50} {:>10} {:>12}'.format(
+            'package' if options['packages'] else 'module', 'self ms',
+            '' if options['packages'] else 'cumulative'))
+        for name, (own, cumulative) in sorted(
+                modules.items(), key=lambda item: -item[1][0])[
+                :options['top']]:
+            self.stdout.write('{:<50} {:10.1f} {:>12}'.format(
+                name, 1000 * own, '' if options['packages'] else
+                '{:.1f}'.format(1000 * cumulative)))
+
+    def profile(self):
+        output = subprocess.check_output(
+            [sys.executable, '-m', 'authors.apps.core.startup'],
+            env=dict(os.environ))
+        return json.loads(output.decode('utf-8'))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from authors.apps.core.cache import get_stats, reset_stats
+
+
+class Command(BaseCommand):
+    help = 'Reports object cache hits, misses, hit ratio and invalidations.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset', action='store_true',
+            help='Reset the counters after reporting them.')
+
+    def handle(self, *args, **options):
+        stats = get_stats()
+        self.stdout.write(
+            'Hits: {hits}\nMisses: {misses}\nHit ratio: {hit_ratio:.1%}\n'
+            'Invalidations: {invalidations}'.format(**stats))
+        if options['reset']:
+            reset_stats()
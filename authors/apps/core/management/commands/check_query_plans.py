@@ -0,0 +1,47 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import (setup_test_environment,
+                               teardown_test_environment)
+
+from authors.apps.core.benchmarks import plans
+from authors.apps.core.testing import local_caches
+
+
+class Command(BaseCommand):
+    help = ('Seeds a throwaway test database with many articles and fails '
+            'if a hot query reads a table sequentially.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--articles', type=int,
+            default=int(os.getenv('QUERY_PLAN_ARTICLES', 20000)),
+            help='Articles to seed (QUERY_PLAN_ARTICLES).')
+        parser.add_argument(
+            '--plans', action='store_true',
+            help='Print the plan of every query.')
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        caches = local_caches()
+        caches.enable()
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            dataset = plans.seed(options['articles'])
+            explained = list(plans.explain(dataset))
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            caches.disable()
+            teardown_test_environment()
+
+        for name, plan in explained:
+            self.stdout.write('{:<45} {}'.format(
+                name, 'sequential scan' if plans.sequential_scans(plan)
+                else 'index'))
+            if options['plans']:
+                self.stdout.write('    ' + plan.replace('\n', '\n    '))
+        offenders = plans.check(explained)
+        if offenders:
+            raise CommandError('\n'.join(offenders))
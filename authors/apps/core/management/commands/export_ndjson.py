@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from authors.apps.core.ndjson import KINDS, export
+
+
+class Command(BaseCommand):
+    help = ('Exports users, profiles, articles with their tags, comments, '
+            'likes and follows as NDJSON.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path', nargs='?', default='-',
+            help='File to write to, standard output by default.')
+        parser.add_argument(
+            '--kinds', default=','.join(KINDS),
+            help='Comma separated kinds to export (default: all).')
+        parser.add_argument(
+            '--chunk-size', type=int, default=2000,
+            help='Rows fetched from the database at a time.')
+
+    def handle(self, *args, **options):
+        kinds = [kind for kind in options['kinds'].split(',') if kind]
+        unknown = set(kinds) - set(KINDS)
+        if unknown:
+            raise CommandError('Unknown kinds: {}'.format(
+                ', '.join(sorted(unknown))))
+        if options['path'] == '-':
+            counts = export(self.stdout, kinds, options['chunk_size'])
+        else:
+            with open(options['path'], 'w') as stream:
+                counts = export(stream, kinds, options['chunk_size'])
+        self.stderr.write('Exported {}'.format(', '.join(
+            '{} {}s'.format(counts[kind], kind) for kind in kinds)))
@@ -0,0 +1,23 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from authors.apps.core import schema
+
+
+class Command(BaseCommand):
+    help = 'Generates the OpenAPI schema the API docs are served from.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output', default=None,
+            help='Where to write the schema (API_SCHEMA_FILE by default).')
+
+    def handle(self, *args, **options):
+        path = options['output'] or settings.API_SCHEMA_FILE
+        started = time.monotonic()
+        body = schema.generate()
+        schema.save(path, body)
+        self.stdout.write('Wrote {} bytes of schema to {} in {:.1f}s'.format(
+            len(body), path, time.monotonic() - started))
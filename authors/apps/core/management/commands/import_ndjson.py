@@ -0,0 +1,32 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from authors.apps.core.ndjson import KINDS, InvalidDump, import_
+
+
+class Command(BaseCommand):
+    help = ('Imports users, profiles, articles with their tags, comments, '
+            'likes and follows from NDJSON written by export_ndjson.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path', nargs='?', default='-',
+            help='File to read from, standard input by default.')
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Rows inserted per query and per transaction.')
+
+    def handle(self, *args, **options):
+        try:
+            if options['path'] == '-':
+                created, skipped = import_(sys.stdin, options['batch_size'])
+            else:
+                with open(options['path']) as stream:
+                    created, skipped = import_(stream, options['batch_size'])
+        except InvalidDump as error:
+            raise CommandError(str(error))
+        for kind in KINDS:
+            if created[kind] or skipped[kind]:
+                self.stdout.write('{}s: {} created, {} skipped'.format(
+                    kind.capitalize(), created[kind], skipped[kind]))
@@ -0,0 +1,54 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import (setup_test_environment,
+                               teardown_test_environment)
+
+from authors.apps.core.benchmarks import runner
+from authors.apps.core.benchmarks.dataset import seed
+from authors.apps.core.testing import local_caches
+
+
+class Command(BaseCommand):
+    help = ('Seeds a throwaway test database and reports the query count, '
+            'latency and peak memory of every API route.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scale', type=int,
+            default=int(os.getenv('BENCHMARK_SCALE', 1)),
+            help='Dataset size multiplier (BENCHMARK_SCALE).')
+        parser.add_argument(
+            '--check', action='store_true',
+            help='Exit with an error if a route exceeds its query budget.')
+        parser.add_argument(
+            '--update-baseline', action='store_true',
+            help='Record the query counts as the new baseline.')
+        parser.add_argument('routes', nargs='*',
+                            help='Only benchmark these route names.')
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        caches = local_caches()
+        caches.enable()
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            dataset = seed(options['scale'])
+            results = runner.run(dataset, options['routes'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            caches.disable()
+            teardown_test_environment()
+
+        for result in results:
+            self.stdout.write(result.as_row())
+
+        if options['update_baseline']:
+            runner.write_baseline(results, options['scale'])
+            self.stdout.write('Baseline written to ' + runner.BASELINE_PATH)
+        if options['check']:
+            violations = runner.check(results, runner.load_baseline())
+            if violations:
+                raise CommandError('\n'.join(violations))
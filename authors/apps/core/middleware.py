@@ -0,0 +1,193 @@
+import hashlib
+import json
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.signals import request_finished
+from django.db import connections
+
+from .routers import replica_aliases, set_use_replicas
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+logger = logging.getLogger(__name__)
+
+IN_LIST = re.compile(r'\((?:\s*%s\s*,)+\s*%s\s*\)')
+LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+SPACE = re.compile(r'\s+')
+
+
+def sql_shape(sql):
+    """
+    Reduces a statement to its shape, so queries that differ only in their
+    parameters (including the length of an `IN` list) compare equal.
+    """
+    shape = IN_LIST.sub('(...)', sql)
+    shape = LITERAL.sub('?', shape)
+    return SPACE.sub(' ', shape).strip()
+
+
+class QueryCollector:
+    """Execute wrapper that counts, times and groups every query."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes = Counter()
+        self.timings = {'view': 0.0, 'render': 0.0, 'render_db': 0.0}
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+            self.shapes[sql_shape(sql)] += 1
+
+    def repeated(self, threshold):
+        return [
+            {'sql': shape, 'count': count}
+            for shape, count in self.shapes.most_common()
+            if count >= threshold
+        ]
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Counts and times the SQL each request runs and reports it in a
+    `Server-Timing` header:
+
+        Server-Timing: db;dur=12.3;desc="8 queries", serialization;dur=4.1,
+                       render;dur=0.9
+
+    `serialization` is the time spent in the view outside the database,
+    which for our API views is mostly serializer work; `render` is the time
+    spent rendering the response body. Requests that repeat one query shape
+    `SQL_N_PLUS_ONE_THRESHOLD` times or more (an N+1), or run more than
+    `SQL_QUERY_LOG_THRESHOLD` queries, are logged with the view name.
+
+    Streamed responses are measured up to the point the stream starts.
+
+    Enabled with `SQL_INSTRUMENTATION=True`. When disabled the middleware
+    removes itself from the stack at startup, so it costs nothing.
+    """
+
+    def __init__(self, get_response):
+        if not settings.SQL_INSTRUMENTATION:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request._query_collector = collector = QueryCollector()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(collector))
+            response = self.get_response(request)
+        finished = time.perf_counter()
+        total = finished - started
+
+        timings = collector.timings
+        if timings['view'] < 0:
+            # the view returned a response that is not rendered later
+            timings['view'] += finished
+        view_db = collector.duration - timings['render_db']
+        serialization = max(timings['view'] - view_db, 0.0)
+        render = max(timings['render'] - timings['render_db'], 0.0)
+        response['Server-Timing'] = ', '.join([
+            'db;dur={:.1f};desc="{} queries"'.format(
+                collector.duration * 1000, collector.count),
+            'serialization;dur={:.1f}'.format(serialization * 1000),
+            'render;dur={:.1f}'.format(render * 1000),
+            'total;dur={:.1f}'.format(total * 1000),
+        ])
+        self.report(request, response, collector, total)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._query_collector.timings['view'] = -time.perf_counter()
+
+    def process_template_response(self, request, response):
+        collector = request._query_collector
+        timings = collector.timings
+        timings['view'] += time.perf_counter()
+        render = response.render
+
+        def timed_render():
+            db_before = collector.duration
+            started = time.perf_counter()
+            try:
+                return render()
+            finally:
+                timings['render'] = time.perf_counter() - started
+                timings['render_db'] = collector.duration - db_before
+
+        response.render = timed_render
+        return response
+
+    def report(self, request, response, collector, total):
+        repeated = collector.repeated(settings.SQL_N_PLUS_ONE_THRESHOLD)
+        if not repeated and (collector.count <=
+                             settings.SQL_QUERY_LOG_THRESHOLD):
+            return
+        match = request.resolver_match
+        logger.warning(json.dumps({
+            'event': 'n_plus_one' if repeated else 'query_count',
+            'view': match.view_name if match else None,
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'queries': collector.count,
+            'db_ms': round(collector.duration * 1000, 1),
+            'total_ms': round(total * 1000, 1),
+            'repeated': repeated,
+        }))
+
+
+def stop_using_replicas(**kwargs):
+    set_use_replicas(False)
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Lets safe-method requests read from the replicas in `DATABASES`.
+
+    A client that sends a write is pinned to the primary for
+    `REPLICA_PIN_SECONDS`, so it reads its own writes while the replicas
+    catch up. Clients are told apart by their `Authorization` header, or
+    their address when anonymous, and the pin is kept in the cache.
+
+    Without replicas the middleware removes itself at startup.
+    """
+
+    def __init__(self, get_response):
+        if not replica_aliases():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        # streamed responses keep reading after __call__ returns
+        request_finished.connect(stop_using_replicas,
+                                 dispatch_uid='stop_using_replicas')
+
+    def pin_key(self, request):
+        client = (request.META.get('HTTP_AUTHORIZATION') or
+                  request.META.get('REMOTE_ADDR', ''))
+        return 'replica-pin:' + hashlib.sha1(
+            client.encode('utf-8')).hexdigest()
+
+    def __call__(self, request):
+        key = self.pin_key(request)
+        safe = request.method in SAFE_METHODS
+        set_use_replicas(safe and not cache.get(key))
+        try:
+            response = self.get_response(request)
+        finally:
+            if not safe:
+                cache.set(key, True, settings.REPLICA_PIN_SECONDS)
+        return response
@@ -0,0 +1,389 @@
+"""
+Bulk export and import of users, profiles, articles (with their tags),
+comments, likes and follows as NDJSON, one object per line:
+
+    {"type": "user", "username": "jane", "email": "jane@mail.com", ...}
+    {"type": "article", "slug": "a-title", "author": "jane",
+     "tags": ["django"], ...}
+
+Objects refer to each other by natural key (usernames and article slugs),
+so a dump can be loaded into a database with different ids. Exports list
+every kind in `KINDS` order, which is the order an import needs them in.
+
+Exports read with server-side cursors and imports work in batches, so
+memory stays flat however many rows there are. Imports write with
+`bulk_create` and skip what saving through the API does on the side
+(notifications, slug and read time lookups, signals), apart from the tag
+index and trending scores of articles and the object cache entries of
+the articles a batch of likes changes, which each batch sees to itself.
+Objects that already
+exist are left alone, so an import can be re-run. Timestamps are not
+carried over.
+"""
+import json
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.utils import timezone
+from taggit.models import Tag, TaggedItem
+
+from authors.apps.articles.models import Article, LikeArticles
+from authors.apps.articles.utils import (count_words, generate_slug,
+                                         initial_trending_score,
+                                         make_excerpt, readtime_of_words)
+from authors.apps.authentication.models import User
+from authors.apps.comments.models import Comment
+from authors.apps.follow.models import Follows
+from authors.apps.profiles.models import Profile
+from authors.apps.search.index import record_rebuild
+from authors.apps.tags.models import ArticleTag, TagStat
+
+from .cache import invalidate
+
+KINDS = ('user', 'profile', 'article', 'comment', 'like', 'follow')
+
+USER_FIELDS = ('username', 'email', 'password', 'is_active', 'is_verified',
+               'is_staff', 'is_superuser', 'social_id', 'is_subscribed')
+PROFILE_FIELDS = ('user_bio', 'name', 'number_of_followers',
+                  'number_of_followings', 'total_articles')
+ARTICLE_FIELDS = ('slug', 'title', 'body', 'description', 'is_published',
+                  'read_time')
+
+
+class InvalidDump(Exception):
+    pass
+
+
+def article_content_type():
+    return ContentType.objects.get_for_model(Article)
+
+
+# Export
+
+def export_users(chunk_size):
+    for row in User.objects.order_by('pk').values(
+            *USER_FIELDS).iterator(chunk_size=chunk_size):
+        yield row
+
+
+def export_profiles(chunk_size):
+    profiles = Profile.objects.order_by('pk').values_list(
+        'user__username', 'avatar', *PROFILE_FIELDS)
+    for username, avatar, *values in profiles.iterator(
+            chunk_size=chunk_size):
+        row = dict(zip(PROFILE_FIELDS, values), user=username)
+        row['avatar'] = avatar.get_prep_value() if avatar else None
+        yield row
+
+
+def export_articles(chunk_size):
+    # articles and their tags are read side by side in article order, so
+    # each article's tags are found without a query per article
+    articles = Article.objects.order_by('pk').values_list(
+        'pk', 'author__username', *ARTICLE_FIELDS).iterator(
+        chunk_size=chunk_size)
+    tags = TaggedItem.objects.filter(
+        content_type=article_content_type()).order_by(
+        'object_id', 'tag__name').values_list(
+        'object_id', 'tag__name').iterator(chunk_size=chunk_size)
+    tag = next(tags, None)
+    for pk, author, *values in articles:
+        while tag is not None and tag[0] < pk:
+            tag = next(tags, None)
+        names = []
+        while tag is not None and tag[0] == pk:
+            names.append(tag[1])
+            tag = next(tags, None)
+        yield dict(zip(ARTICLE_FIELDS, values), author=author, tags=names)
+
+
+def export_comments(chunk_size):
+    comments = Comment.objects.order_by('pk').values_list(
+        'article__slug', 'author__username', 'body')
+    for article, author, body in comments.iterator(chunk_size=chunk_size):
+        yield {'article': article, 'author': author, 'body': body}
+
+
+def export_likes(chunk_size):
+    likes = LikeArticles.objects.order_by('pk').values_list(
+        'article__slug', 'user__username', 'likes')
+    for article, user, likes in likes.iterator(chunk_size=chunk_size):
+        yield {'article': article, 'user': user, 'likes': likes}
+
+
+def export_follows(chunk_size):
+    follows = Follows.objects.order_by('pk').values_list(
+        'follower__username', 'followed_user')
+    for follower, followed in follows.iterator(chunk_size=chunk_size):
+        yield {'follower': follower, 'followed': followed}
+
+
+EXPORTERS = {
+    'user': export_users,
+    'profile': export_profiles,
+    'article': export_articles,
+    'comment': export_comments,
+    'like': export_likes,
+    'follow': export_follows,
+}
+
+
+def export(stream, kinds=KINDS, chunk_size=2000):
+    """Writes every object of `kinds` to `stream`. Returns counts by kind."""
+    counts = dict.fromkeys(kinds, 0)
+    for kind in KINDS:
+        if kind not in kinds:
+            continue
+        for row in EXPORTERS[kind](chunk_size):
+            stream.write(json.dumps(dict(row, type=kind)) + '\n')
+            counts[kind] += 1
+    return counts
+
+
+# Import
+#
+# Each importer takes a batch of rows of one kind, creates the objects that
+# do not exist yet and returns how many it created.
+
+def user_ids(usernames):
+    return dict(User.objects.filter(username__in=set(usernames)).values_list(
+        'username', 'pk'))
+
+
+def article_ids(slugs):
+    return dict(Article.objects.filter(slug__in=set(slugs)).values_list(
+        'slug', 'pk'))
+
+
+def import_users(rows):
+    usernames = {row['username'] for row in rows}
+    emails = {row['email'] for row in rows}
+    taken = set()
+    for username, email in User.objects.filter(
+            username__in=usernames).values_list('username', 'email'):
+        taken.update((username, email))
+    for username, email in User.objects.filter(
+            email__in=emails).values_list('username', 'email'):
+        taken.update((username, email))
+    users = []
+    for row in rows:
+        if row['username'] in taken or row['email'] in taken:
+            continue
+        taken.update((row['username'], row['email']))
+        users.append(User(**{field: row[field] for field in USER_FIELDS
+                             if field in row}))
+    User.objects.bulk_create(users)
+    return len(users)
+
+
+def import_profiles(rows):
+    users = user_ids(row['user'] for row in rows)
+    existing = set(Profile.objects.filter(
+        user__in=users.values()).values_list('user', flat=True))
+    profiles = []
+    for row in rows:
+        user_id = users.get(row['user'])
+        if user_id is None or user_id in existing:
+            continue
+        existing.add(user_id)
+        profile = Profile(user_id=user_id, **{
+            field: row[field] for field in PROFILE_FIELDS if field in row})
+        if row.get('avatar'):
+            profile.avatar = row['avatar']
+        profiles.append(profile)
+    Profile.objects.bulk_create(profiles)
+    return len(profiles)
+
+
+def get_tag_ids(names):
+    """Ids of the tags named `names`, creating the ones that are missing."""
+    found = dict(Tag.objects.filter(name__in=names).values_list('name', 'pk'))
+    missing = [Tag(name=name, slug=Tag().slugify(name))
+               for name in names if name not in found]
+    if missing:
+        taken = set(Tag.objects.filter(
+            slug__in=[tag.slug for tag in missing]).values_list(
+            'slug', flat=True))
+        bulk = []
+        for tag in missing:
+            if tag.slug in taken:
+                # taggit finds a free slug for it
+                Tag.objects.create(name=tag.name)
+            else:
+                taken.add(tag.slug)
+                bulk.append(tag)
+        Tag.objects.bulk_create(bulk)
+        found.update(Tag.objects.filter(
+            name__in=[tag.name for tag in missing]).values_list('name', 'pk'))
+    return found
+
+
+def import_articles(rows):
+    authors = user_ids(row['author'] for row in rows)
+    for row in rows:
+        row.setdefault('slug', None)
+        row['slug'] = row['slug'] or generate_slug(row['title'])
+    existing = set(article_ids(row['slug'] for row in rows))
+    trending_score = initial_trending_score(timezone.now())
+    articles, tags = [], {}
+    for row in rows:
+        author_id = authors.get(row['author'])
+        if author_id is None or row['slug'] in existing:
+            continue
+        existing.add(row['slug'])
+        article = Article(author_id=author_id, **{
+            field: row[field] for field in ARTICLE_FIELDS if field in row})
+        article.word_count = count_words(article.body)
+        article.read_time = article.read_time or readtime_of_words(
+            article.word_count)
+        article.excerpt = make_excerpt(article.body)
+        article.trending_score = trending_score
+        articles.append(article)
+        tags[article.slug] = row.get('tags') or []
+    Article.objects.bulk_create(articles)
+
+    tag_ids = get_tag_ids({name for names in tags.values() for name in names})
+    ids = article_ids(tags)
+    pairs = [(tag_ids[name], ids[slug])
+             for slug in ids for name in set(tags[slug])]
+    content_type = article_content_type()
+    TaggedItem.objects.bulk_create(
+        TaggedItem(content_type=content_type, object_id=article_id,
+                   tag_id=tag_id)
+        for tag_id, article_id in pairs)
+    # bulk inserts skip the signals that maintain the tag index, so the
+    # batch's rows are indexed and counted here
+    ArticleTag.objects.bulk_create(
+        ArticleTag(tag_id=tag_id, article_id=article_id)
+        for tag_id, article_id in pairs)
+    # tags count published articles only
+    counts = {}
+    for article in articles:
+        if article.is_published:
+            for name in set(tags[article.slug]):
+                counts[tag_ids[name]] = counts.get(tag_ids[name], 0) + 1
+    TagStat.add(counts)
+    return len(articles)
+
+
+def invalidate_on_commit(label, pks):
+    """Retires the cached fragments of the objects `pks` once, when the
+    batch commits, as the signals bulk inserts skip would have."""
+    pks = set(pks)
+    transaction.on_commit(lambda: [invalidate(label, pk) for pk in pks])
+
+
+def import_comments(rows):
+    articles = article_ids(row['article'] for row in rows)
+    authors = user_ids(row['author'] for row in rows)
+    existing = set(Comment.objects.filter(
+        article__in=articles.values(), author__in=authors.values()
+    ).values_list('article', 'author', 'body'))
+    comments = []
+    for row in rows:
+        key = (articles.get(row['article']), authors.get(row['author']),
+               row['body'])
+        if None in key or key in existing:
+            continue
+        existing.add(key)
+        comments.append(Comment(article_id=key[0], author_id=key[1],
+                                body=key[2]))
+    Comment.objects.bulk_create(comments)
+    # bulk_create sets the ids only where the database returns them
+    invalidate_on_commit('comment', [
+        comment.pk for comment in comments if comment.pk is not None])
+    return len(comments)
+
+
+def import_likes(rows):
+    articles = article_ids(row['article'] for row in rows)
+    users = user_ids(row['user'] for row in rows)
+    existing = set(LikeArticles.objects.filter(
+        article__in=articles.values(), user__in=users.values()
+    ).values_list('article', 'user'))
+    likes = []
+    for row in rows:
+        key = (articles.get(row['article']), users.get(row['user']))
+        if None in key or key in existing:
+            continue
+        existing.add(key)
+        likes.append(LikeArticles(article_id=key[0], user_id=key[1],
+                                  likes=row['likes']))
+    LikeArticles.objects.bulk_create(likes)
+    invalidate_on_commit('article', [like.article_id for like in likes])
+    return len(likes)
+
+
+def import_follows(rows):
+    followers = user_ids(row['follower'] for row in rows)
+    existing = set(Follows.objects.filter(
+        follower__in=followers.values()).filter(
+        followed_user__in={row['followed'] for row in rows}).values_list(
+        'follower', 'followed_user'))
+    follows = []
+    for row in rows:
+        key = (followers.get(row['follower']), row['followed'])
+        if key[0] is None or key in existing:
+            continue
+        existing.add(key)
+        follows.append(Follows(follower_id=key[0], followed_user=key[1]))
+    Follows.objects.bulk_create(follows)
+    return len(follows)
+
+
+IMPORTERS = {
+    'user': import_users,
+    'profile': import_profiles,
+    'article': import_articles,
+    'comment': import_comments,
+    'like': import_likes,
+    'follow': import_follows,
+}
+
+
+def read_batches(stream, batch_size):
+    """Yields `(kind, rows)` batches of consecutive lines of one kind."""
+    kind, rows = None, []
+    for number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+            row_kind = row.pop('type')
+        except (ValueError, KeyError, AttributeError):
+            raise InvalidDump('Line {}: not an object with a type'.format(
+                number))
+        if row_kind not in IMPORTERS:
+            raise InvalidDump('Line {}: unknown type "{}"'.format(
+                number, row_kind))
+        if rows and (row_kind != kind or len(rows) == batch_size):
+            yield kind, rows
+            rows = []
+        kind = row_kind
+        rows.append(row)
+    if rows:
+        yield kind, rows
+
+
+def import_(stream, batch_size=1000):
+    """
+    Loads the objects in `stream`, one transaction per batch. Returns
+    `(created, skipped)` counts by kind; objects that exist already or
+    refer to users or articles that do not are skipped.
+    """
+    created = dict.fromkeys(KINDS, 0)
+    skipped = dict.fromkeys(KINDS, 0)
+    for kind, rows in read_batches(stream, batch_size):
+        try:
+            with transaction.atomic():
+                count = IMPORTERS[kind](rows)
+        except KeyError as missing:
+            raise InvalidDump('A {} is missing the field {}'.format(
+                kind, missing))
+        created[kind] += count
+        skipped[kind] += len(rows) - count
+    if any(created.values()):
+        # bulk inserts skip the signals that record changes to the
+        # search suggestion index
+        record_rebuild()
+    return created, skipped
@@ -0,0 +1,240 @@
+"""
+Outbound calls to third party services (Cloudinary, SendGrid and the social
+login providers).
+
+Every call goes through `call()`, which runs it on a bounded thread pool and
+waits at most the service's timeout for it, so a slow provider costs a
+request a few seconds instead of a whole gunicorn worker:
+
+    result = outbound.call('cloudinary', cloudinary.uploader.upload, file)
+
+Each service has its own timeout, a limit on concurrent calls and a circuit
+breaker. After `failure_threshold` consecutive transport failures (timeouts,
+connection errors) the breaker opens and calls fail fast for
+`reset_timeout` seconds, after which one trial call is let through. Errors
+the service reports about the request itself, such as an invalid token,
+are raised to the caller unchanged and do not trip the breaker. A service
+that reports its own trouble in the result, e.g. a 503 or 429 response
+from an HTTP API, counts as failing when `is_failure(result)` says so;
+the result is still returned to the caller.
+
+When a call cannot be made or does not finish in time, `fallback()` is
+returned if given, otherwise `ServiceUnavailable` (a 503) is raised.
+
+Only pass plain network calls: the pool threads have no database
+connection of their own and must not touch the ORM.
+"""
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+
+from django.conf import settings
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from urllib3.exceptions import HTTPError
+
+logger = logging.getLogger(__name__)
+
+TRANSPORT_ERRORS = (OSError, HTTPError)
+
+
+class ServiceUnavailable(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'A service we depend on is unavailable, try again later.'
+    default_code = 'service_unavailable'
+
+
+def is_transport_error(exc):
+    """True if `exc`, or an exception it was raised from, is a network
+    failure rather than an error reported by the service."""
+    while exc is not None:
+        if isinstance(exc, TRANSPORT_ERRORS):
+            return True
+        exc = exc.__cause__ or exc.__context__
+    return False
+
+
+class CircuitBreaker:
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half-open'
+
+    def __init__(self, failure_threshold, reset_timeout):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.trial_running = False
+        self.lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def allow(self):
+        with self.lock:
+            state = self.state
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self.trial_running:
+                self.trial_running = True
+                return True
+            return False
+
+    def cancel_trial(self):
+        """Gives back the trial `allow()` granted to a call never made."""
+        with self.lock:
+            self.trial_running = False
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_running = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            self.trial_running = False
+            if (self.opened_at is not None or
+                    self.failures >= self.failure_threshold):
+                self.opened_at = time.monotonic()
+
+
+class Service:
+    def __init__(self, name, timeout=5, max_concurrent=4,
+                 failure_threshold=5, reset_timeout=30):
+        self.name = name
+        self.timeout = timeout
+        self.slots = threading.BoundedSemaphore(max_concurrent)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.latencies = deque(maxlen=1000)
+        self.counts = dict.fromkeys(
+            ('calls', 'successes', 'errors', 'failures', 'timeouts',
+             'rejected', 'fallbacks'), 0)
+        self.lock = threading.Lock()
+
+    def count(self, *names):
+        with self.lock:
+            for name in names:
+                self.counts[name] += 1
+
+    def metrics(self):
+        with self.lock:
+            latencies = sorted(self.latencies)
+            metrics = dict(self.counts)
+        metrics['state'] = self.breaker.state
+        metrics['timeout'] = self.timeout
+        for label, fraction in (('p50', 0.5), ('p95', 0.95), ('p99', 0.99)):
+            metrics['latency_{}_ms'.format(label)] = round(
+                latencies[int(fraction * (len(latencies) - 1))] * 1000, 1
+            ) if latencies else None
+        metrics['latency_max_ms'] = round(
+            latencies[-1] * 1000, 1) if latencies else None
+        return metrics
+
+
+_services = {}
+_services_lock = threading.Lock()
+_executor = None
+
+
+def get_executor():
+    global _executor
+    with _services_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.OUTBOUND_MAX_WORKERS,
+                thread_name_prefix='outbound')
+        return _executor
+
+
+def get_service(name):
+    with _services_lock:
+        if name not in _services:
+            _services[name] = Service(
+                name, **settings.OUTBOUND_SERVICES.get(name, {}))
+        return _services[name]
+
+
+def reset_services():
+    """Forgets all breaker state and metrics, e.g. between tests."""
+    with _services_lock:
+        _services.clear()
+
+
+def unavailable(service, fallback, reason):
+    logger.warning('Outbound call to %s failed: %s', service.name, reason)
+    if fallback is None:
+        raise ServiceUnavailable()
+    service.count('fallbacks')
+    return fallback()
+
+
+def is_server_error(response):
+    """True for an HTTP response that reports trouble on the service's side
+    rather than a bad request: a 5xx, or a 429 asking to back off."""
+    return response.status_code >= 500 or response.status_code == 429
+
+
+def call(name, func, *args, fallback=None, is_failure=None, **kwargs):
+    """Calls `func(*args, **kwargs)` as an outbound call to service `name`."""
+    service = get_service(name)
+    service.count('calls')
+    # the slot first: a half-open breaker's trial, once granted, must lead
+    # to a call whose outcome closes or reopens the breaker
+    if not service.slots.acquire(blocking=False):
+        service.count('rejected')
+        return unavailable(service, fallback, 'too many concurrent calls')
+    if not service.breaker.allow():
+        service.slots.release()
+        service.count('rejected')
+        return unavailable(service, fallback, 'circuit open')
+
+    started = time.monotonic()
+    try:
+        future = get_executor().submit(func, *args, **kwargs)
+    except Exception:
+        service.slots.release()
+        service.breaker.cancel_trial()
+        raise
+    # the slot is held until the call really returns, even after the caller
+    # has given up on it, so hung calls count against the limit
+    future.add_done_callback(lambda future: service.slots.release())
+    try:
+        result = future.result(timeout=service.timeout)
+    except FutureTimeout:
+        service.count('timeouts', 'failures')
+        service.breaker.record_failure()
+        return unavailable(service, fallback, 'timed out after {}s'.format(
+            service.timeout))
+    except Exception as exc:
+        if not is_transport_error(exc):
+            # the service answered; the request itself was bad
+            service.count('errors')
+            service.breaker.record_success()
+            raise
+        service.count('failures')
+        service.breaker.record_failure()
+        return unavailable(service, fallback, repr(exc))
+    finally:
+        with service.lock:
+            service.latencies.append(time.monotonic() - started)
+    if is_failure is not None and is_failure(result):
+        service.count('failures')
+        service.breaker.record_failure()
+        return result
+    service.count('successes')
+    service.breaker.record_success()
+    return result
+
+
+def metrics():
+    with _services_lock:
+        services = list(_services.values())
+    return {service.name: service.metrics() for service in services}
@@ -0,0 +1,71 @@
+"""
+Read replica routing.
+
+Every database in `settings.DATABASES` other than `default` is a read
+replica. Reads go to a random replica only while `use_replicas()` is on,
+which `ReplicaRoutingMiddleware` does for safe-method requests from clients
+that have not written recently. Everything else, including every write,
+every read inside `transaction.atomic()` and all work outside a request
+(management commands, the outbox worker), uses the primary.
+
+To try it locally with SQLite standing in for both databases:
+
+    DATABASE_URL=sqlite:////tmp/primary.sqlite3
+    REPLICA_DATABASE_URLS=sqlite:////tmp/replica.sqlite3
+"""
+import random
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+_state = threading.local()
+
+
+def replica_aliases():
+    return [alias for alias in settings.DATABASES
+            if alias != DEFAULT_DB_ALIAS]
+
+
+def reading_from_replicas():
+    return getattr(_state, 'use_replicas', False)
+
+
+def set_use_replicas(value):
+    _state.use_replicas = value
+
+
+@contextmanager
+def use_replicas(value=True):
+    previous = reading_from_replicas()
+    set_use_replicas(value)
+    try:
+        yield
+    finally:
+        set_use_replicas(previous)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        # the database cache holds object versions, which must be current
+        if model._meta.app_label == 'django_cache':
+            return DEFAULT_DB_ALIAS
+        if not reading_from_replicas():
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        replicas = replica_aliases()
+        if not replicas:
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # replicas hold the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
@@ -0,0 +1,109 @@
+"""
+The OpenAPI schema behind `/api/swagger/` and `/api/redoc/`.
+
+Generating the schema introspects every view and serializer, so each
+process does it once and serves the schema from memory after that with
+an ETag; a request whose If-None-Match matches gets a bodiless 304.
+`core.startup.warmup()` loads it, so under `gunicorn --preload` the
+workers fork with it loaded. It is read from `settings.API_SCHEMA_FILE`
+if that exists, e.g. a file `python manage.py generate_api_schema` wrote
+into the build, and generated otherwise. Heroku's release phase runs on
+its own dyno, so a file written there never reaches the web dynos. The
+UI pages themselves are cheap to render: they load the schema from
+`?format=openapi`.
+
+The schema is generated without a request, so it names no host and the
+UIs call the API on the host that served them.
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from drf_yasg import openapi
+from drf_yasg.codecs import yaml_sane_dump
+from drf_yasg.renderers import OpenAPIRenderer, SwaggerYAMLRenderer
+from drf_yasg.views import SPEC_RENDERERS, get_schema_view
+from rest_framework import permissions
+
+INFO = openapi.Info(
+    title="Authors Haven API",
+    default_version='v1',
+    description="Auhtors Haven is an app for the creative at heart",
+    contact=openapi.Contact(email="authorshaven24@gmail.com"),
+    license=openapi.License(name="MIT License"),
+)
+
+BaseSchemaView = get_schema_view(
+    INFO, public=True, permission_classes=(permissions.AllowAny,))
+
+
+def generate():
+    """The schema as JSON, introspected from the views."""
+    generator = BaseSchemaView.generator_class(INFO)
+    return OpenAPIRenderer().render(generator.get_schema(public=True))
+
+
+def save(path, body):
+    """Writes `body` to `path`, replacing any earlier file at once."""
+    temporary = '{}.{}.tmp'.format(path, os.getpid())
+    with open(temporary, 'wb') as schema:
+        schema.write(body)
+    os.replace(temporary, path)
+
+
+def load(path):
+    try:
+        with open(path, 'rb') as schema:
+            return schema.read()
+    except OSError:
+        return None
+
+
+def etag_of(body):
+    return '"{}"'.format(hashlib.sha1(body).hexdigest())
+
+
+# the process' schema: {'json' or 'yaml': (body, etag)}
+_documents = {}
+_lock = threading.Lock()
+
+
+def get_document(kind):
+    """`(body, etag)` of the schema as 'json' or 'yaml'."""
+    with _lock:
+        if 'json' not in _documents:
+            body = load(settings.API_SCHEMA_FILE) or generate()
+            _documents['json'] = body, etag_of(body)
+        if kind not in _documents:
+            body = yaml_sane_dump(json.loads(
+                _documents['json'][0].decode('utf-8'),
+                object_pairs_hook=OrderedDict), binary=True)
+            _documents[kind] = body, etag_of(body)
+        return _documents[kind]
+
+
+def reset():
+    """Forgets the schema of this process, e.g. between tests."""
+    with _lock:
+        _documents.clear()
+
+
+class SchemaView(BaseSchemaView):
+
+    def get(self, request, version='', format=None):
+        renderer = request.accepted_renderer
+        if not isinstance(renderer, SPEC_RENDERERS):
+            # a UI page, which needs no paths
+            return super().get(request, version, format)
+        body, etag = get_document(
+            'yaml' if isinstance(renderer, SwaggerYAMLRenderer) else 'json')
+        response = HttpResponse(body, content_type='{}; charset={}'.format(
+            renderer.media_type, renderer.charset))
+        response['ETag'] = etag
+        return get_conditional_response(request, etag=etag,
+                                        response=response)
@@ -0,0 +1,57 @@
+from rest_framework import serializers
+
+
+def sparse_fields(request):
+    """The field names asked for with `?fields=a,b`, or None."""
+    fields = request.GET.get('fields')
+    if not fields:
+        return None
+    return [field for field in fields.split(',') if field]
+
+
+def fragment_name(name, fields):
+    """Object cache name for a representation limited to `fields`."""
+    if fields is None:
+        return name
+    return '{}:{}'.format(name, ','.join(sorted(fields)))
+
+
+class SparseFieldsMixin:
+    """
+    Lets a model serializer be limited to some of its fields:
+
+        ArticleSerializer(articles, many=True, fields=['id', 'title'])
+
+    `only_fields()` names the model fields those serializer fields read, to
+    pass to `QuerySet.only()`. Fields whose source is a model field are
+    found on their own; list the others, such as methods and properties,
+    in `field_sources`.
+    """
+    field_sources = {}
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+        if fields is None:
+            return
+        unknown = set(fields) - set(self.fields)
+        if unknown:
+            raise serializers.ValidationError({
+                'fields': 'Unknown fields: {}'.format(
+                    ', '.join(sorted(unknown)))})
+        for name in set(self.fields) - set(fields):
+            self.fields.pop(name)
+
+    @classmethod
+    def only_fields(cls, fields=None):
+        model = cls.Meta.model
+        concrete = {field.name for field in model._meta.concrete_fields}
+        paths = {model._meta.pk.name}
+        for name, field in cls(fields=fields).fields.items():
+            if name in cls.field_sources:
+                paths.update(cls.field_sources[name])
+                continue
+            source = field.source.split('.')[0]
+            if source in concrete:
+                paths.add(source)
+        return sorted(paths)
@@ -0,0 +1,72 @@
+"""
+Invalidates the object cache (`core/cache.py`) when the rows a cached
+representation is built from change, and creates the indexes
+(`core/indexes.py`) after migrations.
+"""
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import connections
+from django.db.models.signals import post_delete, post_migrate, post_save
+from django.dispatch import receiver
+from taggit.models import Tag, TaggedItem
+
+from authors.apps.articles.models import Article, LikeArticles
+from authors.apps.authentication.models import User
+from authors.apps.comments.models import Comment
+from authors.apps.profiles.models import Profile
+
+from .cache import invalidate, lookup_key
+from .indexes import create_indexes
+
+
+@receiver(post_save, sender=Article)
+@receiver(post_delete, sender=Article)
+def article_changed(sender, instance, **kwargs):
+    invalidate('article', instance.pk)
+    cache.delete(lookup_key('article', 'slug', instance.slug))
+
+
+@receiver(post_save, sender=LikeArticles)
+@receiver(post_delete, sender=LikeArticles)
+def article_reaction_changed(sender, instance, **kwargs):
+    invalidate('article', instance.article_id)
+
+
+@receiver(post_save, sender=TaggedItem)
+@receiver(post_delete, sender=TaggedItem)
+def article_tags_changed(sender, instance, **kwargs):
+    content_type = ContentType.objects.get_for_id(instance.content_type_id)
+    if content_type.model_class() is Article:
+        invalidate('article', instance.object_id)
+
+
+@receiver(post_save, sender=Tag)
+def tag_renamed(sender, instance, created, **kwargs):
+    if created:
+        return
+    for article_id in TaggedItem.objects.filter(
+            tag=instance).values_list('object_id', flat=True):
+        invalidate('article', article_id)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comment_changed(sender, instance, **kwargs):
+    invalidate('comment', instance.pk)
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def profile_changed(sender, instance, **kwargs):
+    invalidate('profile', instance.pk)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    invalidate('user', instance.pk)
+
+
+@receiver(post_migrate)
+def app_migrated(sender, using, **kwargs):
+    create_indexes(sender.label, connections[using])
@@ -0,0 +1,170 @@
+"""
+Process startup: lazy imports of heavy integrations, the warmup run
+before workers fork, and the import profile `python manage.py
+benchmark_startup` reports.
+
+This module imports nothing but the standard library at module level, so
+that the profile it takes (`python -m authors.apps.core.startup`) covers
+Django and the project in full.
+"""
+import importlib
+import importlib.abc
+import json
+import logging
+import os
+import sys
+import time
+import types
+
+logger = logging.getLogger(__name__)
+
+
+class LazyModule(types.ModuleType):
+    """Stands in for a module until an attribute of it is first used."""
+
+    def __getattr__(self, name):
+        module = importlib.import_module(self.__name__)
+        self.__dict__.update(module.__dict__)
+        return getattr(module, name)
+
+
+def lazy_import(name):
+    """
+    The module `name`, imported on first attribute access instead of now.
+    For integrations most requests never use, such as the social login
+    SDKs, whose import would otherwise slow every process' startup.
+    """
+    return sys.modules.get(name) or LazyModule(name)
+
+
+def serializer_classes():
+    """The project's serializer classes, those imported so far."""
+    from rest_framework.serializers import BaseSerializer
+
+    found, pending = [], [BaseSerializer]
+    while pending:
+        for subclass in pending.pop().__subclasses__():
+            pending.append(subclass)
+            if subclass.__module__.startswith('authors.'):
+                found.append(subclass)
+    return found
+
+
+def warmup():
+    """
+    Does the work each process would otherwise do on its first requests:
+    imports every view by building the URL resolver, fills the model
+    field caches, builds the fields of every serializer, loads the
+    translation catalog and the API schema and, with
+    `settings.WARMUP_SEARCH_INDEX`, the search suggestion index.
+
+    `authors/wsgi.py` calls it, so under `gunicorn --preload` it runs once
+    in the master and every worker, respawned ones included, forks with it
+    done.
+    """
+    from django.apps import apps
+    from django.conf import settings
+    from django.db import connections
+    from django.urls import get_resolver
+    from django.utils import translation
+
+    from authors.apps.core import schema
+
+    get_resolver().reverse_dict
+    for model in apps.get_models():
+        model._meta.get_fields()
+    for serializer_class in serializer_classes():
+        try:
+            serializer_class().fields
+        except Exception:
+            # some need arguments or context; they warm up on first use
+            logger.debug('Could not warm up %s', serializer_class,
+                         exc_info=True)
+    translation.activate(settings.LANGUAGE_CODE)
+    translation.deactivate()
+    schema.get_document('json')
+    if settings.WARMUP_SEARCH_INDEX:
+        from authors.apps.search import index
+        index.get_index()
+    # workers must not share the connections the master opened
+    connections.close_all()
+
+
+class ImportTimer(importlib.abc.MetaPathFinder):
+    """
+    Times the execution of every module imported while it is installed:
+    `times[name]` is `(self, cumulative)` seconds, self leaving out the
+    modules it imported in turn.
+    """
+
+    def __init__(self):
+        self.times = {}
+        self.children = []
+
+    def install(self):
+        sys.meta_path.insert(0, self)
+
+    def uninstall(self):
+        sys.meta_path.remove(self)
+
+    def find_spec(self, name, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+            spec.loader = TimedLoader(self, name, spec.loader)
+        return spec
+
+    def record(self, name, exec_module, module):
+        self.children.append(0.0)
+        started = time.perf_counter()
+        try:
+            exec_module(module)
+        finally:
+            cumulative = time.perf_counter() - started
+            self.times[name] = (cumulative - self.children.pop(), cumulative)
+            if self.children:
+                self.children[-1] += cumulative
+
+
+class TimedLoader(importlib.abc.Loader):
+
+    def __init__(self, timer, name, loader):
+        self.timer = timer
+        self.name = name
+        self.loader = loader
+
+    def create_module(self, spec):
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module):
+        self.timer.record(self.name, self.loader.exec_module, module)
+
+    def __getattr__(self, name):
+        # e.g. get_data and is_package, used by pkgutil and friends
+        return getattr(self.loader, name)
+
+
+def profile():
+    """Imports `authors.wsgi` and warms up, timing each module imported."""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'authors.settings')
+    os.environ['STARTUP_WARMUP'] = 'False'
+    timer = ImportTimer()
+    timer.install()
+    started = time.perf_counter()
+    import authors.wsgi  # noqa: F401
+    loaded = time.perf_counter()
+    warmup()
+    warmed = time.perf_counter()
+    timer.uninstall()
+    return {'application': loaded - started, 'warmup': warmed - loaded,
+            'modules': timer.times}
+
+
+if __name__ == '__main__':
+    json.dump(profile(), sys.stdout)
@@ -0,0 +1,78 @@
+import json
+
+from django.http import StreamingHttpResponse
+from rest_framework.utils.encoders import JSONEncoder
+
+
+def identity(chunk):
+    return chunk
+
+
+class StreamingJSONResponse(StreamingHttpResponse):
+    """
+    Streams a JSON object in which one key holds a list built from a queryset.
+
+    The queryset is read with `.iterator()` and serialized `chunk_size` rows
+    at a time, so memory use stays flat no matter how many rows there are.
+    The other keys of `envelope` are written around the list unchanged, which
+    keeps the response shape identical to a regular `Response(envelope)`.
+
+        return StreamingJSONResponse(
+            {"success": "All reports retrieved.", "reports": reports},
+            stream_key="reports")
+
+    `serialize` turns a list of rows into a list of JSON-ready objects, e.g.
+    `lambda chunk: ProfileSerializer(chunk, many=True).data`. Rows from a
+    `.values()` queryset can be streamed as they are.
+    """
+    chunk_size = 500
+
+    def __init__(self, envelope, stream_key, serialize=identity,
+                 chunk_size=None, status=200):
+        self.envelope = envelope
+        self.stream_key = stream_key
+        self.serialize = serialize
+        self.chunk_size = chunk_size or self.chunk_size
+        super(StreamingJSONResponse, self).__init__(
+            self.render_chunks(), status=status,
+            content_type='application/json')
+
+    def encode(self, value):
+        return json.dumps(value, cls=JSONEncoder, ensure_ascii=False)
+
+    def iter_rows(self):
+        queryset = self.envelope[self.stream_key]
+        chunk = []
+        for row in queryset.iterator(chunk_size=self.chunk_size):
+            chunk.append(row)
+            if len(chunk) == self.chunk_size:
+                yield self.serialize(chunk)
+                chunk = []
+        if chunk:
+            yield self.serialize(chunk)
+
+    def render_chunks(self):
+        yield '{'
+        for position, (key, value) in enumerate(self.envelope.items()):
+            yield '{}{}: '.format(',' if position else '', self.encode(key))
+            if key != self.stream_key:
+                yield self.encode(value)
+                continue
+            yield '['
+            separator = ''
+            for items in self.iter_rows():
+                if items:
+                    yield separator + ','.join(
+                        self.encode(item) for item in items)
+                    separator = ','
+            yield ']'
+        yield '}'
+
+    @property
+    def data(self):
+        """
+        The decoded payload, for test clients and tooling that inspect
+        `response.data`. It renders the stream again from the start instead
+        of consuming `streaming_content`.
+        """
+        return json.loads(''.join(self.render_chunks()))
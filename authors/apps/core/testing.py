@@ -0,0 +1,93 @@
+"""
+The test runner, and fakes for simulating third party services in tests,
+e.g. a Cloudinary that takes 3 seconds to answer or a SendGrid that
+refuses connections:
+
+    with fake_service('cloudinary', timeout=0.1):
+        outbound.call('cloudinary', FakeCall(delay=3))
+"""
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.test import override_settings
+from django_nose import NoseTestSuiteRunner
+
+from . import outbound
+
+
+class FakeCall:
+    """
+    Callable standing in for a client library call. It sleeps `delay`
+    seconds, then raises `error` if given and returns `result` otherwise.
+    """
+
+    def __init__(self, result=None, delay=0, error=None):
+        self.result = result
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+
+    def __call__(self, *args, **kwargs):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+def slow(delay, result=None):
+    return FakeCall(result=result, delay=delay)
+
+
+def unreachable():
+    return FakeCall(error=ConnectionRefusedError('Connection refused'))
+
+
+@contextmanager
+def fake_service(name, **config):
+    """
+    Runs the block with service `name` configured with `config` (timeout,
+    max_concurrent, failure_threshold, reset_timeout) and fresh breaker
+    state and metrics.
+    """
+    services = dict(settings.OUTBOUND_SERVICES)
+    services[name] = dict(services.get(name, {}), **config)
+    outbound.reset_services()
+    try:
+        with override_settings(OUTBOUND_SERVICES=services):
+            yield outbound.get_service(name)
+    finally:
+        outbound.reset_services()
+
+
+def local_caches():
+    """
+    Settings override that keeps every cache in local memory, so tests and
+    benchmarks neither share entries with other processes nor count the
+    database cache's queries as their own.
+    """
+    return override_settings(CACHES={
+        alias: {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                'LOCATION': 'test-' + alias}
+        for alias in settings.CACHES})
+
+
+class TestRunner(NoseTestSuiteRunner):
+    """
+    Runs the tests with nose, with local memory caches and without rate
+    limits, which the requests of one test would otherwise count against
+    the next. Tests of throttling turn it back on with `override_settings`.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.throttle_enabled = settings.THROTTLE_ENABLED
+        settings.THROTTLE_ENABLED = False
+        self.caches = local_caches()
+        self.caches.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self.caches.disable()
+        settings.THROTTLE_ENABLED = self.throttle_enabled
+        super().teardown_test_environment(**kwargs)
@@ -0,0 +1,103 @@
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from authors.apps.articles.models import Article
+from authors.apps.authentication.backends import JWTAuthentication
+from authors.apps.authentication.models import User
+from authors.apps.core import batch
+
+
+class TestBatch(TestCase):
+    """Tests for answering many API requests in one round trip"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            'writer', 'writer@mail.com', 'password123')
+        self.client.credentials(
+            HTTP_AUTHORIZATION='Bearer ' + self.user.get_token)
+        self.article = Article.objects.create(
+            title='Batched', description='About', body='Body',
+            author=self.user, is_published=True)
+        self.url = reverse('core:batch')
+
+    def post(self, *items):
+        return self.client.post(self.url, {'requests': list(items)},
+                                format='json')
+
+    def get(self, url):
+        return {'method': 'GET', 'url': url}
+
+    def test_responses_match_separate_requests(self):
+        urls = [
+            reverse('articles:details', kwargs={'slug': self.article.slug}),
+            reverse('comments:create-list',
+                    kwargs={'slug': self.article.slug}),
+            reverse('articles:create-list') + '?limit=1',
+            reverse('authentication:user-details'),
+        ]
+        response = self.post(*[self.get(url) for url in urls])
+        self.assertEqual(response.status_code, 200)
+        for url, item in zip(urls, response.data['responses']):
+            separate = self.client.get(url)
+            self.assertEqual(item['status'], separate.status_code)
+            self.assertEqual(item['body'], separate.json())
+
+    def test_caller_is_authenticated_once(self):
+        with mock.patch.object(JWTAuthentication, 'authenticate',
+                               autospec=True,
+                               side_effect=JWTAuthentication.authenticate
+                               ) as authenticate:
+            response = self.post(
+                self.get(reverse('authentication:user-details')),
+                self.get(reverse('articles:favorite-list')))
+        self.assertEqual(authenticate.call_count, 1)
+        self.assertEqual(
+            [item['status'] for item in response.data['responses']],
+            [200, 200])
+
+    def test_writes_are_seen_by_later_requests(self):
+        comments = reverse('comments:create-list',
+                           kwargs={'slug': self.article.slug})
+        response = self.post(
+            {'method': 'POST', 'url': comments,
+             'body': {'comment': {'body': 'First'}}},
+            self.get(comments))
+        created, listed = response.data['responses']
+        self.assertEqual(created['status'], 201)
+        self.assertEqual(len(listed['body']['comments']), 1)
+
+    def test_each_request_gets_its_own_status(self):
+        response = self.post(
+            self.get('/api/nowhere/'),
+            {'method': 'DELETE',
+             'url': reverse('articles:details', kwargs={'slug': 'missing'})},
+            self.get(self.url))
+        self.assertEqual(
+            [item['status'] for item in response.data['responses']],
+            [404, 404, 400])
+
+    @override_settings(BATCH_MAX_REQUESTS=2)
+    def test_invalid_batches(self):
+        for items in [[], [self.get('/api/a/')] * 3, [self.get('/admin/')],
+                      [{'method': 'TRACE', 'url': '/api/a/'}], ['/api/a/']]:
+            response = self.post(*items)
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('message', response.data)
+
+    def test_reads_run_on_the_pool_outside_transactions(self):
+        self.user.is_staff = True
+        self.user.save()
+        url = reverse('core:outbound-metrics')
+        with mock.patch.object(batch, 'connection') as connection, \
+                mock.patch.object(batch, 'get_executor',
+                                  wraps=batch.get_executor) as get_executor:
+            connection.in_atomic_block = False
+            response = self.post(self.get(url), self.get(url))
+        self.assertEqual(get_executor.call_count, 2)
+        self.assertEqual(
+            [item['status'] for item in response.data['responses']],
+            [200, 200])
@@ -0,0 +1,24 @@
+from django.test import TestCase
+
+from authors.apps.core.benchmarks import runner
+from authors.apps.core.benchmarks.dataset import seed
+from authors.apps.core.benchmarks.routes import ROUTES
+
+
+class TestEndpointBenchmarks(TestCase):
+    """Query budgets for every API route"""
+
+    def test_every_route_is_benchmarked(self):
+        self.assertEqual(set(ROUTES), runner.route_names())
+
+    def test_routes_stay_within_query_budget(self):
+        baseline = runner.load_baseline()
+        dataset = seed(baseline['scale'])
+        results = runner.run(dataset)
+        self.assertEqual(runner.check(results, baseline), [])
+
+    def test_budget_violation_is_reported(self):
+        result = runner.Result('articles:details', status=200, queries=100)
+        baseline = {'routes': {'articles:details': {'budget': 6}}}
+        self.assertEqual(runner.check([result], baseline),
+                         ['articles:details issued 100 queries, budget is 6'])
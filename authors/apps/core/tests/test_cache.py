@@ -0,0 +1,117 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from authors.apps.articles.models import Article, LikeArticles
+from authors.apps.authentication.models import User
+from authors.apps.core import cache as object_cache
+from authors.apps.core.routers import use_replicas
+from authors.apps.profiles.models import Profile
+
+
+class TestObjectCache(TestCase):
+    """Tests for caching serialized articles, profiles and comments"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            'writer', 'writer@mail.com', 'password123')
+        self.article = Article.objects.create(
+            title='Cached article', description='About', body='Body',
+            author=self.user)
+        self.article.tags.add('python')
+        self.url = reverse('articles:details',
+                           kwargs={'slug': self.article.slug})
+
+    def get_article(self):
+        return self.client.get(self.url).data['article']
+
+    def test_cached_article_is_served_without_queries(self):
+        self.get_article()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get_article()['title'], 'Cached article')
+        stats = object_cache.get_stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+
+    def test_article_update_invalidates_fragment(self):
+        self.get_article()
+        self.article.body = 'New body'
+        self.article.save()
+        self.assertEqual(self.get_article()['body'], 'New body')
+
+    def test_renamed_article_is_not_served_under_old_slug(self):
+        self.get_article()
+        self.article.title = 'Renamed article'
+        self.article.save()
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+    def test_reaction_invalidates_fragment(self):
+        self.get_article()
+        LikeArticles.objects.create(user=self.user, article=self.article,
+                                    likes=1)
+        self.assertEqual(self.get_article()['like_count'], 1)
+
+    def test_tag_change_invalidates_fragment(self):
+        self.get_article()
+        self.article.tags.add('django')
+        self.assertEqual(sorted(self.get_article()['tags']),
+                         ['django', 'python'])
+
+    def test_author_change_invalidates_fragment(self):
+        self.get_article()
+        self.user.username = 'renamed'
+        self.user.save()
+        self.assertEqual(self.get_article()['author']['username'], 'renamed')
+
+    def test_deleted_article_is_not_served(self):
+        self.get_article()
+        self.article.delete()
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+    def test_profile_update_invalidates_fragment(self):
+        profile = Profile.objects.create(user=self.user, user_bio='Bio',
+                                         name='Writer')
+        self.client.force_authenticate(self.user)
+        url = reverse('profile:profile-fetch',
+                      kwargs={'username': self.user.username})
+        self.client.get(url)
+        profile.user_bio = 'New bio'
+        profile.save()
+        response = self.client.get(url)
+        self.assertEqual(response.data['profile']['user_bio'], 'New bio')
+
+    def test_fragments_read_from_replicas_right_after_a_change(self):
+        built = []
+
+        def serialize(articles):
+            built.extend(articles)
+            return [{'title': article.title} for article in articles]
+
+        def get():
+            return object_cache.get_fragment(
+                'article', self.article,
+                lambda article: [('article', article.pk)], serialize)
+
+        object_cache.invalidate('article', self.article.pk)
+        with use_replicas():
+            # the replica may still have the row from before the change
+            get()
+            get()
+            self.assertEqual(len(built), 2)
+            cache.delete(object_cache.changed_key('article', self.article.pk))
+            get()
+            get()
+        self.assertEqual(len(built), 3)
+
+    def test_stats_command_reports_hit_ratio(self):
+        self.get_article()
+        self.get_article()
+        output = StringIO()
+        call_command('cache_stats', '--reset', stdout=output)
+        self.assertIn('Hit ratio: 50.0%', output.getvalue())
+        self.assertEqual(object_cache.get_stats()['hits'], 0)
@@ -0,0 +1,59 @@
+import json
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from authors.apps.articles.models import Article, LikeArticles
+from authors.apps.authentication.models import User
+from authors.apps.core.middleware import sql_shape
+
+
+class TestSQLShape(TestCase):
+    """Tests for grouping queries by shape"""
+
+    def test_parameters_and_in_lists_are_ignored(self):
+        self.assertEqual(
+            sql_shape('SELECT * FROM "a" WHERE "id" IN (%s, %s, %s)'),
+            sql_shape('SELECT * FROM "a"  WHERE "id" IN (%s,%s)'))
+        self.assertEqual(sql_shape("SELECT 1 FROM a WHERE b = 'x'"),
+                         'SELECT ? FROM a WHERE b = ?')
+
+
+@override_settings(SQL_INSTRUMENTATION=True, SQL_N_PLUS_ONE_THRESHOLD=3)
+class TestQueryInstrumentationMiddleware(TestCase):
+    """Tests for per-request SQL instrumentation"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            'writer', 'writer@mail.com', 'password123')
+        for number in range(4):
+            Article.objects.create(title='Article {}'.format(number),
+                                   description='About', body='Body',
+                                   author=self.user)
+
+    def test_server_timing_header(self):
+        response = self.client.get(reverse('articles:create-list'))
+        metrics = [metric.split(';')[0]
+                   for metric in response['Server-Timing'].split(', ')]
+        self.assertEqual(metrics, ['db', 'serialization', 'render', 'total'])
+        self.assertIn('queries"', response['Server-Timing'])
+
+    def test_repeated_queries_are_logged_with_view_name(self):
+        # the popular articles serializer loads each article on its own
+        for article in Article.objects.all():
+            LikeArticles.objects.create(user=self.user, article=article,
+                                        likes=1)
+        self.client.force_authenticate(self.user)
+        with self.assertLogs('authors.apps.core.middleware') as logs:
+            self.client.get(reverse('stats:popular-articles'))
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record['event'], 'n_plus_one')
+        self.assertEqual(record['view'], 'stats:popular-articles')
+        self.assertGreaterEqual(record['repeated'][0]['count'], 3)
+
+    @override_settings(SQL_INSTRUMENTATION=False)
+    def test_disabled_middleware_adds_no_header(self):
+        response = self.client.get(reverse('articles:create-list'))
+        self.assertFalse(response.has_header('Server-Timing'))
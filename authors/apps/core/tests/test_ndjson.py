@@ -0,0 +1,132 @@
+import json
+from io import StringIO
+from tempfile import NamedTemporaryFile
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import transaction
+from django.test import TestCase
+
+from authors.apps.articles.models import Article, LikeArticles
+from authors.apps.authentication.models import User
+from authors.apps.comments.models import Comment
+from authors.apps.core import ndjson
+from authors.apps.follow.models import Follows
+from authors.apps.profiles.models import Profile
+from authors.apps.tags.models import TagStat
+
+
+class TestNDJSON(TestCase):
+    """Tests for the NDJSON export and import commands"""
+
+    def setUp(self):
+        self.users = [User.objects.create_user(
+            'user{}'.format(number), 'user{}@mail.com'.format(number),
+            'password123') for number in range(3)]
+        Profile.objects.create(user=self.users[0], user_bio='Bio',
+                               name='First User')
+        for number, user in enumerate(self.users):
+            article = Article.objects.create(
+                title='Article {}'.format(number), description='About',
+                body='Body', author=user, is_published=True)
+            article.tags.add('shared', 'tag{}'.format(number))
+            Comment.objects.create(article=article, author=self.users[0],
+                                   body='Comment {}'.format(number))
+            LikeArticles.objects.create(article=article, user=self.users[0],
+                                        likes=number % 2)
+            Follows.objects.create(follower=user,
+                                   followed_user=self.users[0].username)
+
+    def export(self, *args):
+        out = StringIO()
+        call_command('export_ndjson', *args, stdout=out, stderr=StringIO())
+        return out.getvalue()
+
+    def load(self, dump, batch_size=2):
+        out = StringIO()
+        with NamedTemporaryFile('w', suffix='.ndjson') as stream:
+            stream.write(dump)
+            stream.flush()
+            call_command('import_ndjson', stream.name,
+                         batch_size=batch_size, stdout=out)
+        return out.getvalue()
+
+    def snapshot(self):
+        return {
+            'users': sorted(User.objects.values_list(
+                'username', 'email', 'password')),
+            'profiles': sorted(Profile.objects.values_list(
+                'user__username', 'name')),
+            'articles': sorted(
+                (article.slug, article.author.username, article.read_time,
+                 sorted(article.tags.names()))
+                for article in Article.objects.all()),
+            'comments': sorted(Comment.objects.values_list(
+                'article__slug', 'author__username', 'body')),
+            'likes': sorted(LikeArticles.objects.values_list(
+                'article__slug', 'user__username', 'likes')),
+            'follows': sorted(Follows.objects.values_list(
+                'follower__username', 'followed_user')),
+        }
+
+    def test_export_lists_each_kind_in_order(self):
+        rows = [json.loads(line) for line in self.export().splitlines()]
+        kinds = [row['type'] for row in rows]
+        self.assertEqual(kinds, ['user'] * 3 + ['profile'] + ['article'] * 3 +
+                         ['comment'] * 3 + ['like'] * 3 + ['follow'] * 3)
+        article = rows[4]
+        self.assertEqual(article['author'], 'user0')
+        self.assertEqual(article['tags'], ['shared', 'tag0'])
+
+    def test_import_restores_an_export(self):
+        dump = self.export()
+        before = self.snapshot()
+        User.objects.all().delete()
+        output = self.load(dump)
+        self.assertEqual(self.snapshot(), before)
+        self.assertIn('Articles: 3 created, 0 skipped', output)
+        # the tag index is updated for the imported articles
+        self.assertEqual(TagStat.objects.get(tag__name='shared').article_count,
+                         3)
+
+    def test_import_skips_existing_objects(self):
+        dump = self.export()
+        before = self.snapshot()
+        output = self.load(dump)
+        self.assertEqual(self.snapshot(), before)
+        self.assertIn('Users: 0 created, 3 skipped', output)
+        self.assertIn('Comments: 0 created, 3 skipped', output)
+
+    def test_import_adds_to_existing_tag_counts(self):
+        dump = self.export()
+        self.users[1].delete()
+        self.load(dump)
+        counts = dict(TagStat.objects.values_list(
+            'tag__name', 'article_count'))
+        self.assertEqual(counts, {'shared': 3, 'tag0': 1, 'tag1': 1,
+                                  'tag2': 1})
+
+    def test_import_scores_articles_and_retires_cached_ones(self):
+        dump = self.export()
+        LikeArticles.objects.all().delete()
+        Article.objects.filter(title='Article 0').delete()
+        liked = Article.objects.get(title='Article 1')
+        with mock.patch.object(ndjson, 'invalidate') as invalidate:
+            with mock.patch.object(transaction, 'on_commit',
+                                   lambda callback: callback()):
+                self.load(dump)
+        self.assertIn(mock.call('article', liked.pk),
+                      invalidate.call_args_list)
+        imported = Article.objects.get(title='Article 0')
+        self.assertGreater(imported.trending_score, 0)
+
+    def test_export_of_selected_kinds(self):
+        rows = [json.loads(line)
+                for line in self.export('--kinds=user,follow').splitlines()]
+        self.assertEqual({row['type'] for row in rows}, {'user', 'follow'})
+
+    def test_invalid_lines_are_reported(self):
+        with self.assertRaisesMessage(CommandError, 'Line 2'):
+            self.load('{"type": "follow", "follower": "user0", '
+                      '"followed": "user1"}\n{"type": "unknown"}\n')
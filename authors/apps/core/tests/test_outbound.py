@@ -0,0 +1,125 @@
+import time
+from unittest import mock
+
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from authors.apps.authentication.models import User
+from authors.apps.core import outbound
+from authors.apps.core.outbound import ServiceUnavailable
+from authors.apps.core.testing import FakeCall, fake_service, slow, unreachable
+
+
+class TestOutboundCalls(TestCase):
+    """Tests for calling third party services"""
+
+    def test_successful_call_returns_result(self):
+        with fake_service('cloudinary'):
+            self.assertEqual(
+                outbound.call('cloudinary', FakeCall(result='ok')), 'ok')
+            self.assertEqual(outbound.metrics()['cloudinary']['successes'], 1)
+
+    def test_slow_call_times_out(self):
+        with fake_service('cloudinary', timeout=0.05) as service:
+            started = time.monotonic()
+            with self.assertRaises(ServiceUnavailable):
+                outbound.call('cloudinary', slow(0.5))
+            self.assertLess(time.monotonic() - started, 0.4)
+            self.assertEqual(service.metrics()['timeouts'], 1)
+
+    def test_fallback_is_used_when_service_fails(self):
+        with fake_service('cloudinary'):
+            result = outbound.call('cloudinary', unreachable(),
+                                   fallback=lambda: 'fallback')
+        self.assertEqual(result, 'fallback')
+
+    def test_breaker_opens_after_repeated_failures(self):
+        with fake_service('sendgrid', failure_threshold=2,
+                          reset_timeout=60) as service:
+            failing = unreachable()
+            for attempt in range(2):
+                with self.assertRaises(ServiceUnavailable):
+                    outbound.call('sendgrid', failing)
+            with self.assertRaises(ServiceUnavailable):
+                outbound.call('sendgrid', failing)
+            self.assertEqual(failing.calls, 2)
+            self.assertEqual(service.metrics()['state'], 'open')
+            self.assertEqual(service.metrics()['rejected'], 1)
+
+    def test_breaker_closes_after_successful_trial(self):
+        with fake_service('sendgrid', failure_threshold=1,
+                          reset_timeout=0.05) as service:
+            with self.assertRaises(ServiceUnavailable):
+                outbound.call('sendgrid', unreachable())
+            time.sleep(0.06)
+            self.assertEqual(service.breaker.state, 'half-open')
+            outbound.call('sendgrid', FakeCall(result='ok'))
+            self.assertEqual(service.breaker.state, 'closed')
+
+    def test_server_error_responses_trip_the_breaker(self):
+        unavailable = mock.Mock(status_code=503)
+        with fake_service('sendgrid', failure_threshold=2) as service:
+            for attempt in range(2):
+                self.assertIs(outbound.call(
+                    'sendgrid', FakeCall(result=unavailable),
+                    is_failure=outbound.is_server_error), unavailable)
+            self.assertEqual(service.breaker.state, 'open')
+            self.assertEqual(service.metrics()['failures'], 2)
+        self.assertTrue(outbound.is_server_error(mock.Mock(status_code=429)))
+        self.assertFalse(outbound.is_server_error(mock.Mock(status_code=400)))
+
+    def test_service_errors_are_raised_without_tripping_breaker(self):
+        with fake_service('google', failure_threshold=1) as service:
+            with self.assertRaises(ValueError):
+                outbound.call('google', FakeCall(error=ValueError('token')))
+            self.assertEqual(service.breaker.state, 'closed')
+
+    def test_concurrency_limit_rejects_extra_calls(self):
+        with fake_service('twitter', max_concurrent=1, timeout=0.01):
+            with self.assertRaises(ServiceUnavailable):
+                outbound.call('twitter', slow(0.2))
+            # the first call still holds the only slot
+            with self.assertRaises(ServiceUnavailable):
+                outbound.call('twitter', FakeCall(result='ok'))
+            self.assertEqual(outbound.metrics()['twitter']['rejected'], 1)
+
+    def test_trial_rejected_for_concurrency_is_given_back(self):
+        with fake_service('twitter', max_concurrent=1, timeout=0.05,
+                          failure_threshold=1, reset_timeout=0.1) as service:
+            with self.assertRaises(ServiceUnavailable):
+                outbound.call('twitter', slow(0.4))
+            time.sleep(0.15)
+            self.assertEqual(service.breaker.state, 'half-open')
+            # the hung call still holds the only slot
+            with self.assertRaises(ServiceUnavailable):
+                outbound.call('twitter', FakeCall(result='ok'))
+            self.assertFalse(service.breaker.trial_running)
+            time.sleep(0.35)
+            self.assertEqual(
+                outbound.call('twitter', FakeCall(result='ok')), 'ok')
+            self.assertEqual(service.breaker.state, 'closed')
+
+
+class TestOutboundMetricsView(TestCase):
+    """Tests for the outbound metrics endpoint"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse('core:outbound-metrics')
+
+    def test_metrics_are_staff_only(self):
+        user = User.objects.create_user('user', 'user@mail.com', 'pass1234')
+        self.client.force_authenticate(user)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    def test_metrics_report_latency_per_service(self):
+        admin = User.objects.create_superuser(
+            'admin', 'admin@mail.com', 'pass1234')
+        self.client.force_authenticate(admin)
+        with fake_service('cloudinary'):
+            outbound.call('cloudinary', FakeCall(result='ok'))
+            response = self.client.get(self.url)
+        metrics = response.data['services']['cloudinary']
+        self.assertEqual(metrics['calls'], 1)
+        self.assertIsNotNone(metrics['latency_p95_ms'])
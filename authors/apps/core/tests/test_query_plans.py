@@ -0,0 +1,50 @@
+from unittest import mock
+
+from django.apps import apps
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from authors.apps.core.benchmarks import plans
+from authors.apps.core.indexes import INDEXES, create_indexes
+
+
+class TestQueryPlans(TestCase):
+    """Tests for the indexes behind the hot queries"""
+
+    def test_hot_queries_use_indexes(self):
+        dataset = plans.seed(articles=400)
+        self.assertEqual(plans.check(plans.explain(dataset)), [])
+
+    def test_indexes_are_created(self):
+        for index in INDEXES:
+            table = apps.get_model(index.model)._meta.db_table
+            with connection.cursor() as cursor:
+                indexes = connection.introspection.get_constraints(
+                    cursor, table)
+            self.assertIn(index.name, indexes)
+
+    def test_indexes_wait_for_their_columns(self):
+        introspection = connection.introspection
+        with CaptureQueriesContext(connection) as queries:
+            with mock.patch.object(introspection, 'table_names',
+                                   return_value=[]):
+                create_indexes('articles', connection)
+            with mock.patch.object(introspection, 'get_table_description',
+                                   return_value=[]):
+                create_indexes('articles', connection)
+        self.assertFalse([query for query in queries
+                          if query['sql'].startswith('CREATE')])
+
+    def test_sequential_scans(self):
+        self.assertEqual(plans.sequential_scans(
+            '2 0 0 SCAN articles_article\n'
+            '5 0 0 SCAN articles_highlight USING INDEX highlight_idx\n'
+            '7 0 0 SEARCH comments_comment USING INDEX comment_idx '
+            '(article_id=?)', 'sqlite'), ['articles_article'])
+        self.assertEqual(plans.sequential_scans(
+            'Limit  (cost=0.29..1.02 rows=20 width=8)\n'
+            '  ->  Seq Scan on notify_notification  (cost=0.00..35.50)\n'
+            '  ->  Index Scan using report_idx on report_report',
+            'postgresql'), ['notify_notification'])
+
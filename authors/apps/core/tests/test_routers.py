@@ -0,0 +1,84 @@
+from unittest import mock, skipUnless
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.backends.db import DatabaseCache
+from django.db import connections
+from django.test import SimpleTestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from authors.apps.authentication.models import User
+from authors.apps.core.routers import ReplicaRouter, use_replicas
+
+
+@mock.patch('authors.apps.core.routers.replica_aliases',
+            return_value=['replica_1'])
+class TestReplicaRouter(SimpleTestCase):
+    """Tests for choosing the database a query runs on"""
+
+    def setUp(self):
+        self.router = ReplicaRouter()
+
+    def test_reads_use_primary_by_default(self, replicas):
+        self.assertEqual(self.router.db_for_read(User), 'default')
+
+    def test_reads_use_replica_when_enabled(self, replicas):
+        with use_replicas():
+            self.assertEqual(self.router.db_for_read(User), 'replica_1')
+
+    def test_writes_always_use_primary(self, replicas):
+        with use_replicas():
+            self.assertEqual(self.router.db_for_write(User), 'default')
+
+    def test_reads_in_transaction_use_primary(self, replicas):
+        with use_replicas():
+            with mock.patch.object(connections['default'],
+                                   'in_atomic_block', True):
+                self.assertEqual(self.router.db_for_read(User), 'default')
+
+    def test_cache_reads_use_primary(self, replicas):
+        entry = DatabaseCache('core_cache', {}).cache_model_class
+        with use_replicas():
+            self.assertEqual(self.router.db_for_read(entry), 'default')
+
+    def test_migrations_only_run_on_primary(self, replicas):
+        self.assertTrue(self.router.allow_migrate('default', 'articles'))
+        self.assertFalse(self.router.allow_migrate('replica_1', 'articles'))
+
+
+@skipUnless('replica_1' in settings.DATABASES,
+            'set REPLICA_DATABASE_URLS to run against a replica')
+class TestReplicaRouting(TransactionTestCase):
+    """
+    Tests for routing requests, e.g. with two SQLite databases:
+
+        DATABASE_URL=sqlite:////tmp/primary.sqlite3
+        REPLICA_DATABASE_URLS=sqlite:////tmp/replica.sqlite3
+    """
+    multi_db = True
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.post(reverse('authentication:user-signup'), {
+            'user': {'email': 'reader@mail.com', 'username': 'reader',
+                     'password': 'Reader12345'}}, format='json')
+        User.objects.filter(username='reader').update(is_verified=True)
+        self.token = User.objects.get(username='reader').get_token
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + self.token)
+
+    def replica_queries(self):
+        with CaptureQueriesContext(connections['replica_1']) as replica:
+            response = self.client.get(reverse('authentication:user-details'))
+        self.assertEqual(response.status_code, 200)
+        return len(replica.captured_queries)
+
+    def test_safe_requests_read_from_replica(self):
+        self.assertGreater(self.replica_queries(), 0)
+
+    def test_reads_stick_to_primary_after_a_write(self):
+        self.client.put(reverse('authentication:user-details'), {
+            'user': {'bio': 'Writes'}}, format='json')
+        self.assertEqual(self.replica_queries(), 0)
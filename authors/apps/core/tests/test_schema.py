@@ -0,0 +1,60 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from authors.apps.core import schema
+
+
+class TestSchemaView(TestCase):
+    """Tests for serving the precomputed OpenAPI schema"""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'openapi.json')
+        settings = override_settings(API_SCHEMA_FILE=self.path)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        schema.reset()
+        self.addCleanup(schema.reset)
+        self.client = APIClient()
+        self.url = reverse('schema-swagger-ui')
+
+    def test_schema_is_served_from_the_generated_file(self):
+        call_command('generate_api_schema', stdout=StringIO())
+        with mock.patch.object(schema, 'generate') as generate:
+            response = self.client.get(self.url, {'format': 'openapi'})
+        generate.assert_not_called()
+        self.assertEqual(response.status_code, 200)
+        with open(self.path, 'rb') as generated:
+            self.assertEqual(response.content, generated.read())
+        self.assertIn('/articles/', json.loads(response.content)['paths'])
+
+    def test_schema_is_generated_when_there_is_no_file(self):
+        response = self.client.get(self.url, {'format': 'openapi'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, schema.generate())
+        with mock.patch.object(schema, 'generate') as generate:
+            self.client.get(reverse('schema-redoc'), {'format': 'openapi'})
+        generate.assert_not_called()
+
+    def test_matching_etag_gets_not_modified(self):
+        response = self.client.get(self.url, {'format': 'openapi'})
+        etag = response['ETag']
+        response = self.client.get(self.url, {'format': 'openapi'},
+                                   HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['ETag'], etag)
+
+    def test_ui_pages_still_render(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/html; charset=utf-8')
@@ -0,0 +1,80 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from authors.apps.articles.models import Article
+from authors.apps.authentication.models import User
+from authors.apps.comments.models import Comment
+from authors.apps.profiles.models import Profile
+
+
+class TestSparseFields(TestCase):
+    """Tests for limiting list responses with ?fields="""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            'writer', 'writer@mail.com', 'password123')
+        Profile.objects.create(user=self.user, user_bio='Bio', name='Writer')
+        self.article = Article.objects.create(
+            title='Long read', description='About', author=self.user,
+            body=' '.join(['word'] * 2000), is_published=True)
+        Comment.objects.create(article=self.article, author=self.user,
+                               body='Nice')
+        self.client.force_authenticate(self.user)
+
+    def get(self, url, fields=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                url, {'fields': fields} if fields else {})
+            if response.streaming:
+                response.body = b''.join(response.streaming_content).decode()
+        return response, ' '.join(query['sql'] for query in queries)
+
+    def test_article_list_shows_excerpt_instead_of_body(self):
+        response, sql = self.get(reverse('articles:create-list'))
+        article = response.data['articles'][0]
+        self.assertNotIn('body', article)
+        self.assertEqual(article['excerpt'], self.article.excerpt)
+        self.assertNotIn('"articles_article"."body"', sql)
+
+    def test_article_list_fields(self):
+        response, sql = self.get(reverse('articles:create-list'),
+                                 'slug,title')
+        self.assertEqual(set(response.data['articles'][0]),
+                         {'slug', 'title'})
+        self.assertNotIn('"articles_article"."excerpt"', sql)
+        self.assertNotIn('taggit', sql)
+
+    def test_article_list_can_ask_for_body(self):
+        response, sql = self.get(reverse('articles:create-list'),
+                                 'slug,body')
+        self.assertEqual(response.data['articles'][0]['body'],
+                         self.article.body)
+
+    def test_article_details_keep_the_body(self):
+        response = self.client.get(reverse(
+            'articles:details', kwargs={'slug': self.article.slug}))
+        self.assertEqual(response.data['article']['body'], self.article.body)
+
+    def test_unknown_fields_are_rejected(self):
+        response, sql = self.get(reverse('articles:create-list'),
+                                 'slug,secret')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('secret', str(response.data))
+
+    def test_comment_list_fields(self):
+        response, sql = self.get(reverse(
+            'comments:create-list', kwargs={'slug': self.article.slug}),
+            'id,body')
+        self.assertEqual(set(response.data['comments'][0]), {'id', 'body'})
+        self.assertNotIn('"authentication_user"', sql)
+
+    def test_profile_list_fields(self):
+        response, sql = self.get(reverse('profile:profile-all'),
+                                 'name,user_id')
+        self.assertIn('"name": "Writer"', response.body)
+        self.assertNotIn('user_bio', response.body)
+        self.assertNotIn('"profiles_profile"."user_bio"', sql)
@@ -0,0 +1,63 @@
+import sys
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connections
+from django.test import SimpleTestCase
+
+from authors.apps.core import schema, startup
+
+
+class TestStartup(SimpleTestCase):
+    """Tests for lazy imports, warming up and profiling startup"""
+
+    def forget(self, name):
+        module = sys.modules.pop(name, None)
+        if module is not None:
+            self.addCleanup(sys.modules.__setitem__, name, module)
+
+    def test_lazy_import_waits_for_first_use(self):
+        self.forget('colorsys')
+        colorsys = startup.lazy_import('colorsys')
+        self.assertNotIn('colorsys', sys.modules)
+        self.assertEqual(colorsys.rgb_to_hsv(1, 0, 0), (0, 1, 1))
+        self.assertIn('colorsys', sys.modules)
+
+    def test_patching_a_lazy_module(self):
+        self.forget('colorsys')
+        colorsys = startup.lazy_import('colorsys')
+        with mock.patch.object(colorsys, 'rgb_to_hsv') as rgb_to_hsv:
+            colorsys.rgb_to_hsv(1, 0, 0)
+        rgb_to_hsv.assert_called_once_with(1, 0, 0)
+        self.assertEqual(colorsys.rgb_to_hsv(1, 0, 0), (0, 1, 1))
+
+    def test_import_timer(self):
+        self.forget('colorsys')
+        timer = startup.ImportTimer()
+        timer.install()
+        try:
+            import colorsys  # noqa: F401
+        finally:
+            timer.uninstall()
+        own, cumulative = timer.times['colorsys']
+        self.assertLessEqual(own, cumulative)
+
+    def test_warmup_leaves_no_connections_open(self):
+        schema.reset()
+        self.addCleanup(schema.reset)
+        with mock.patch.object(connections, 'close_all') as close_all:
+            startup.warmup()
+        close_all.assert_called_once_with()
+        # loaded before workers would fork
+        self.assertIn('json', schema._documents)
+        self.assertIn('authors.apps.articles.serializers.ArticleSerializer', [
+            '{}.{}'.format(serializer.__module__, serializer.__name__)
+            for serializer in startup.serializer_classes()])
+
+    def test_command(self):
+        out = StringIO()
+        call_command('benchmark_startup', runs=1, top=5, packages=True,
+                     stdout=out)
+        self.assertIn('application', out.getvalue())
+        self.assertIn('django', out.getvalue())
@@ -0,0 +1,56 @@
+import json
+
+from django.test import TestCase
+
+from authors.apps.authentication.models import User
+from authors.apps.core.streaming import StreamingJSONResponse
+
+
+class TestStreamingJSONResponse(TestCase):
+    """Tests for streaming querysets as JSON"""
+
+    def setUp(self):
+        for number in range(5):
+            User.objects.create_user(
+                'user{}'.format(number), 'user{}@mail.com'.format(number),
+                'password123')
+        self.users = User.objects.order_by('id').values('username')
+
+    def render(self, response):
+        return b''.join(response.streaming_content).decode('utf-8')
+
+    def test_envelope_keys_are_kept_in_order(self):
+        response = StreamingJSONResponse(
+            {"success": "ok", "users": self.users, "count": 5},
+            stream_key="users", chunk_size=2)
+        content = self.render(response)
+        self.assertTrue(content.startswith('{"success": "ok","users": ['))
+        payload = json.loads(content)
+        self.assertEqual(payload['count'], 5)
+        self.assertEqual([user['username'] for user in payload['users']],
+                         ['user{}'.format(number) for number in range(5)])
+
+    def test_rows_are_serialized_chunk_by_chunk(self):
+        chunks = []
+
+        def serialize(chunk):
+            chunks.append(len(chunk))
+            return chunk
+
+        response = StreamingJSONResponse(
+            {"users": self.users}, stream_key="users", serialize=serialize,
+            chunk_size=2)
+        self.render(response)
+        self.assertEqual(chunks, [2, 2, 1])
+        # the queryset was streamed, not cached
+        self.assertIsNone(self.users._result_cache)
+
+    def test_empty_queryset_renders_empty_list(self):
+        response = StreamingJSONResponse(
+            {"users": User.objects.none()}, stream_key="users")
+        self.assertEqual(json.loads(self.render(response)), {"users": []})
+
+    def test_data_matches_streamed_content(self):
+        response = StreamingJSONResponse(
+            {"users": self.users}, stream_key="users")
+        self.assertEqual(response.data, json.loads(self.render(response)))
@@ -0,0 +1,113 @@
+from unittest import mock
+
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from authors.apps.articles.models import Article
+from authors.apps.authentication.models import ResetPasswordToken, User
+from authors.apps.core import throttling
+
+
+class ThrottlingTestCase(TestCase):
+
+    def setUp(self):
+        throttling.get_store().clear()
+        self.addCleanup(throttling.get_store().clear)
+        enabled = override_settings(THROTTLE_ENABLED=True)
+        enabled.enable()
+        self.addCleanup(enabled.disable)
+
+    def with_rule(self, name, **rule):
+        rules = dict(settings.THROTTLE_RULES)
+        rules[name] = dict(rules[name], **rule)
+        changed = override_settings(THROTTLE_RULES=rules)
+        changed.enable()
+        self.addCleanup(changed.disable)
+
+
+class TestAlgorithms(ThrottlingTestCase):
+    """Tests for the token bucket and sliding window limits"""
+
+    def test_token_bucket_allows_a_burst_then_refills(self):
+        bucket = throttling.TokenBucket(3, 60)
+        self.assertEqual([bucket.attempt('key', 1000) for _ in range(3)],
+                         [None] * 3)
+        self.assertAlmostEqual(bucket.attempt('key', 1000), 20)
+        self.assertAlmostEqual(bucket.attempt('key', 1010), 10)
+        self.assertIsNone(bucket.attempt('key', 1020))
+        self.assertAlmostEqual(bucket.attempt('key', 1020), 20)
+
+    def test_sliding_window_weighs_the_previous_window(self):
+        window = throttling.SlidingWindow(4, 60)
+        for _ in range(4):
+            self.assertIsNone(window.attempt('key', 6030))
+        self.assertAlmostEqual(window.attempt('key', 6030), 30)
+        # a sixth into the next window, 5/6 of the previous 4 still count
+        self.assertIsNone(window.attempt('key', 6070))
+        self.assertAlmostEqual(window.attempt('key', 6070), 5)
+        self.assertIsNone(window.attempt('key', 6076))
+
+    def test_disabled(self):
+        self.with_rule('password_reset', rate='1/day')
+        with override_settings(THROTTLE_ENABLED=False):
+            self.assertIsNone(throttling.attempt('password_reset', 1))
+            self.assertIsNone(throttling.attempt('password_reset', 1))
+
+
+class TestThrottledViews(ThrottlingTestCase):
+    """Tests for rate limits on auth and write endpoints"""
+
+    def setUp(self):
+        super().setUp()
+        # mid-window, so a window boundary cannot fall between requests
+        clock = mock.patch.object(throttling, 'time')
+        clock.start().time.return_value = 6030.0
+        self.addCleanup(clock.stop)
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            'writer', 'writer@mail.com', 'password123')
+
+    def test_login_is_limited_per_address(self):
+        self.with_rule('login', rate='2/min')
+        data = {'user': {'email': 'writer@mail.com', 'password': 'wrong'}}
+        url = reverse('authentication:user-login')
+        for _ in range(2):
+            self.assertEqual(
+                self.client.post(url, data, format='json').status_code, 400)
+        response = self.client.post(url, data, format='json')
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(int(response['Retry-After']), 0)
+        # another client address has its own limit
+        response = self.client.post(url, data, format='json',
+                                    HTTP_X_FORWARDED_FOR='10.0.0.2')
+        self.assertEqual(response.status_code, 400)
+
+    def test_only_writes_are_limited_per_user(self):
+        self.with_rule('reactions', rate='1/min')
+        article = Article.objects.create(
+            title='Liked', description='About', body='Body',
+            author=self.user, is_published=True)
+        self.client.force_authenticate(self.user)
+        url = reverse('articles:like-article', kwargs={'slug': article.slug})
+        self.assertEqual(self.client.post(url).status_code, 201)
+        self.assertEqual(self.client.post(url).status_code, 429)
+        response = self.client.get(reverse(
+            'articles:details', kwargs={'slug': article.slug}))
+        self.assertEqual(response.status_code, 200)
+
+    def test_password_reset_emails_are_limited_per_user(self):
+        self.with_rule('password_reset', rate='2/day')
+        url = reverse('authentication:password-reset')
+        for _ in range(2):
+            response = self.client.post(url, {'email': self.user.email},
+                                        format='json')
+            self.assertEqual(response.status_code, 202)
+        response = self.client.post(url, {'email': self.user.email},
+                                    format='json')
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('You have exceeded the request limit',
+                      response.data['detail'])
+        self.assertIn('Retry-After', response)
+        self.assertEqual(ResetPasswordToken.objects.count(), 2)
@@ -0,0 +1,129 @@
+"""
+Rate limits kept in a shared store, so every process counts the same
+requests.
+
+The store is `settings.CACHES['throttle']`, a table in the primary
+database unless configured otherwise.
+
+Each rule in `settings.THROTTLE_RULES` has a name and a `rate` such as
+'10/min'. It also sets the `algorithm` that enforces the rate:
+
+- 'token_bucket' allows bursts up to the rate's count, then refills
+  evenly over its period.
+- 'sliding_window' weighs the previous window's count by how much of it
+  still overlaps the last period.
+
+A view names its rule with `throttle_scope`, and `ScopedThrottle` applies
+the rule to the view's writes. With `by: 'user'` each signed in user is
+counted separately; anonymous requests and rules with `by: 'ip'` are
+counted per client address. Throttled requests get a 429 with a
+Retry-After header.
+
+Code outside views calls `attempt(rule, key)` directly, e.g. the limit
+on password reset emails per user.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.throttling import BaseThrottle
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate):
+    """'10/min' as `(10, 60)`: requests allowed and period in seconds."""
+    count, period = rate.split('/')
+    return int(count), PERIODS[period[0]]
+
+
+def get_store():
+    return caches['throttle']
+
+
+class TokenBucket:
+
+    def __init__(self, count, period):
+        self.capacity = count
+        self.refill = count / period
+
+    def attempt(self, key, now):
+        store = get_store()
+        tokens, updated = store.get(key, (self.capacity, now))
+        tokens = min(self.capacity, tokens + (now - updated) * self.refill)
+        if tokens < 1:
+            return (1 - tokens) / self.refill
+        # a read then a write: two processes taking the last token at once
+        # may both get it, an overshoot of one request each
+        store.set(key, (tokens - 1, now),
+                  timeout=int(self.capacity / self.refill) + 1)
+        return None
+
+
+class SlidingWindow:
+
+    def __init__(self, count, period):
+        self.limit = count
+        self.period = period
+
+    def attempt(self, key, now):
+        store = get_store()
+        window, elapsed = divmod(now, self.period)
+        current_key = '{}:{}'.format(key, int(window))
+        previous_key = '{}:{}'.format(key, int(window) - 1)
+        counts = store.get_many([current_key, previous_key])
+        current = counts.get(current_key, 0)
+        previous = counts.get(previous_key, 0)
+        if previous * (1 - elapsed / self.period) + current >= self.limit:
+            if current >= self.limit:
+                # this window's count carries over into the next one
+                return (self.period - elapsed +
+                        self.period * (1 - self.limit / current))
+            return (self.period * (1 - (self.limit - current) / previous) -
+                    elapsed)
+        if not store.add(current_key, 1, timeout=2 * self.period):
+            store.incr(current_key)
+        return None
+
+
+ALGORITHMS = {
+    'token_bucket': TokenBucket,
+    'sliding_window': SlidingWindow,
+}
+
+
+def get_algorithm(name):
+    rule = settings.THROTTLE_RULES[name]
+    return ALGORITHMS[rule['algorithm']](*parse_rate(rule['rate']))
+
+
+def attempt(name, key):
+    """
+    Counts a request against rule `name` for `key`, a user's pk or a
+    client address. Returns None if the request is allowed, and otherwise
+    the seconds until one would be.
+    """
+    if not settings.THROTTLE_ENABLED:
+        return None
+    return get_algorithm(name).attempt(
+        'throttle:{}:{}'.format(name, key), time.time())
+
+
+class ScopedThrottle(BaseThrottle):
+    """Applies the rule named by the view's `throttle_scope` to writes."""
+
+    def allow_request(self, request, view):
+        name = getattr(view, 'throttle_scope', None)
+        if name is None or request.method in SAFE_METHODS:
+            return True
+        rule = settings.THROTTLE_RULES[name]
+        if rule.get('by') == 'user' and request.user.is_authenticated:
+            key = 'user:{}'.format(request.user.pk)
+        else:
+            key = 'ip:{}'.format(self.get_ident(request))
+        self.retry_after = attempt(name, key)
+        return self.retry_after is None
+
+    def wait(self):
+        return self.retry_after
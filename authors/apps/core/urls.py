@@ -0,0 +1,9 @@
+from django.urls import path
+
+from .views import BatchView, OutboundMetricsView
+
+urlpatterns = [
+    path('batch/', BatchView.as_view(), name='batch'),
+    path('outbound/metrics/', OutboundMetricsView.as_view(),
+         name='outbound-metrics'),
+]
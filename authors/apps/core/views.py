@@ -0,0 +1,27 @@
+from rest_framework.permissions import AllowAny, IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from . import batch, outbound
+
+
+class OutboundMetricsView(APIView):
+    """Latency, failure and circuit breaker state of each outbound service
+    as seen by the process that answers the request"""
+    permission_classes = (IsAdminUser,)
+
+    def get(self, request):
+        return Response({"services": outbound.metrics()})
+
+
+class BatchView(APIView):
+    """Answers a list of API requests in one round trip, see core/batch.py"""
+    # each sub-request is checked by its own view
+    permission_classes = (AllowAny,)
+
+    def post(self, request):
+        items = request.data.get('requests')
+        message = batch.validate(items)
+        if message:
+            return Response({"message": message}, status=400)
+        return Response({"responses": batch.run(request, items)})
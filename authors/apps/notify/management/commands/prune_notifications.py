@@ -0,0 +1,56 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from authors.apps.notify.retention import get_stats, prune
+
+
+class Command(BaseCommand):
+    help = ('Deletes notifications older than their retention period, '
+            'optionally archiving them first.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=None,
+            help='Notifications deleted per batch '
+                 '(NOTIFICATION_PRUNE_BATCH_SIZE).')
+        parser.add_argument(
+            '--archive-dir', default=None,
+            help='Directory to write gzipped NDJSON archives to '
+                 '(NOTIFICATION_ARCHIVE_DIR).')
+        parser.add_argument(
+            '--pause', type=float, default=0.0,
+            help='Seconds to sleep between batches.')
+        parser.add_argument(
+            '--every', type=float, default=None,
+            help='Prune every this many seconds until interrupted.')
+        parser.add_argument(
+            '--stats', action='store_true',
+            help='Report what earlier runs deleted and exit.')
+
+    def handle(self, *args, **options):
+        if options['stats']:
+            self.report()
+            return
+        while True:
+            deleted = prune(
+                batch_size=options['batch_size'],
+                archive_dir=options['archive_dir'],
+                pause=options['pause'], progress=self.progress)
+            self.stdout.write('Deleted {} read and {} unread '
+                              'notifications'.format(
+                                  deleted.get('read', 0),
+                                  deleted.get('unread', 0)))
+            if options['every'] is None:
+                return
+            time.sleep(options['every'])
+
+    def progress(self, state, count):
+        self.stdout.write('  {}: {} deleted so far'.format(state, count))
+
+    def report(self):
+        stats = get_stats()
+        self.stdout.write(
+            'Runs: {runs}\nDeleted read: {deleted_read}\n'
+            'Deleted unread: {deleted_unread}\nArchived: {archived}\n'
+            'Last run: {last_run} ({last_duration}s)'.format(**stats))
@@ -0,0 +1,57 @@
+# Generated by Django 2.1.7 on 2026-10-19 17:02
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Notification',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('body', models.TextField()),
+                ('createdAt', models.DateTimeField(auto_now_add=True)),
+                ('is_read', models.BooleanField(default=False)),
+                ('recepient', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-createdAt'],
+            },
+        ),
+        migrations.CreateModel(
+            name='PruneRun',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ranAt', models.DateTimeField(default=django.utils.timezone.now)),
+                ('duration', models.FloatField()),
+                ('deleted_read', models.PositiveIntegerField(null=True)),
+                ('deleted_unread', models.PositiveIntegerField(null=True)),
+                ('archived', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['-ranAt'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['recepient', '-createdAt'], name='notify_noti_recepie_9427e0_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['recepient', 'is_read', '-createdAt'], name='notify_noti_recepie_5d558a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['is_read', 'createdAt'], name='notify_noti_is_read_1a23b8_idx'),
+        ),
+    ]
@@ -1,4 +1,6 @@
 from django.db import models
+from django.utils import timezone
+
 from authors.apps.authentication.models import User
 
 
@@ -13,3 +15,24 @@ class Notification(models.Model):
 
     class Meta:
         ordering = ['-createdAt']
+        indexes = [
+            # a user's inbox, newest first
+            models.Index(fields=['recepient', '-createdAt']),
+            # a user's read or unread notifications, newest first
+            models.Index(fields=['recepient', 'is_read', '-createdAt']),
+            # what retention prunes, oldest first
+            models.Index(fields=['is_read', 'createdAt']),
+        ]
+
+
+class PruneRun(models.Model):
+    """What one run of `retention.prune()` deleted; a count is null when
+    that state was kept forever."""
+    ranAt = models.DateTimeField(default=timezone.now)
+    duration = models.FloatField()
+    deleted_read = models.PositiveIntegerField(null=True)
+    deleted_unread = models.PositiveIntegerField(null=True)
+    archived = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['-ranAt']
@@ -0,0 +1,147 @@
+"""
+Notification retention.
+
+Read and unread notifications are kept for their own number of days
+(`settings.NOTIFICATION_TTL_DAYS`) and deleted after that by `prune()`,
+which `python manage.py prune_notifications` runs once or periodically.
+
+Rows are deleted oldest first in batches of primary keys picked through
+the (is_read, createdAt) index, each batch its own short statement, so a
+prune never holds locks on much of the table at a time. With an archive,
+every batch is written to a gzipped NDJSON file before it is deleted:
+
+    {"id": 7, "recepient": "jane", "body": "...", "is_read": true,
+     "createdAt": "2019-03-01T10:00:00+00:00"}
+
+What each run deleted is kept in a `PruneRun` row, so the totals of
+earlier runs survive restarts; see `get_stats()`.
+"""
+import gzip
+import json
+import os
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from .models import Notification, PruneRun
+
+STATES = {'read': True, 'unread': False}
+
+
+def cutoffs(now=None, ttl_days=None):
+    """Creation time before which notifications of each state are pruned,
+    leaving out states that are kept forever."""
+    now = now or timezone.now()
+    ttl_days = settings.NOTIFICATION_TTL_DAYS if ttl_days is None else ttl_days
+    return {state: now - timedelta(days=days)
+            for state, days in ttl_days.items() if days}
+
+
+def archive_path(directory, now=None):
+    now = now or timezone.now()
+    return os.path.join(directory, 'notifications-{}.ndjson.gz'.format(
+        now.strftime('%Y%m%d%H%M%S')))
+
+
+class Pruner:
+    """
+    Deletes expired notifications in batches of `batch_size`, writing them
+    to `archive` (a text stream) first when given. `progress(state, count)`
+    is called after every batch.
+    """
+
+    def __init__(self, batch_size=None, archive=None, pause=0,
+                 progress=None):
+        self.batch_size = batch_size or settings.NOTIFICATION_PRUNE_BATCH_SIZE
+        self.archive = archive
+        self.pause = pause
+        self.progress = progress or (lambda state, count: None)
+
+    def prune(self, now=None, ttl_days=None):
+        """Returns how many notifications of each state were deleted."""
+        deleted = {}
+        for state, cutoff in cutoffs(now, ttl_days).items():
+            deleted[state] = 0
+            while True:
+                count = self.prune_batch(STATES[state], cutoff)
+                if not count:
+                    break
+                deleted[state] += count
+                self.progress(state, deleted[state])
+                if count < self.batch_size:
+                    break
+                if self.pause:
+                    time.sleep(self.pause)
+        return deleted
+
+    def prune_batch(self, is_read, cutoff):
+        expired = Notification.objects.filter(
+            is_read=is_read, createdAt__lt=cutoff).order_by('createdAt', 'pk')
+        if self.archive is None:
+            ids = list(expired.values_list('pk', flat=True)[:self.batch_size])
+        else:
+            rows = list(expired.values(
+                'id', 'recepient__username', 'body', 'is_read',
+                'createdAt')[:self.batch_size])
+            for row in rows:
+                row['recepient'] = row.pop('recepient__username')
+                row['createdAt'] = row['createdAt'].isoformat()
+                self.archive.write(json.dumps(row) + '\n')
+            self.archive.flush()
+            ids = [row['id'] for row in rows]
+        if ids:
+            # no signals or relations point at notifications, so this is a
+            # single DELETE by primary key
+            Notification.objects.filter(pk__in=ids).delete()
+        return len(ids)
+
+
+def prune(now=None, ttl_days=None, batch_size=None, archive_dir=None,
+          pause=0, progress=None):
+    """
+    Deletes the notifications that have outlived their TTL, archiving them
+    under `archive_dir` first if given. Returns the counts deleted by state
+    and records them in the stats.
+    """
+    started = time.monotonic()
+    archive_dir = (settings.NOTIFICATION_ARCHIVE_DIR if archive_dir is None
+                   else archive_dir)
+    if archive_dir:
+        path = archive_path(archive_dir, now)
+        existed = os.path.exists(path)
+        with gzip.open(path, 'at', encoding='utf-8') as archive:
+            deleted = Pruner(batch_size, archive, pause, progress).prune(
+                now, ttl_days)
+        if not existed and not any(deleted.values()):
+            os.remove(path)
+    else:
+        deleted = Pruner(batch_size, None, pause, progress).prune(
+            now, ttl_days)
+    record(deleted, time.monotonic() - started, archived=bool(archive_dir))
+    return deleted
+
+
+def record(deleted, duration, archived=False):
+    PruneRun.objects.create(
+        duration=round(duration, 3),
+        deleted_read=deleted.get('read'),
+        deleted_unread=deleted.get('unread'),
+        archived=sum(deleted.values()) if archived else 0)
+
+
+def get_stats():
+    stats = PruneRun.objects.aggregate(
+        runs=Count('pk'), deleted_read=Sum('deleted_read'),
+        deleted_unread=Sum('deleted_unread'), archived=Sum('archived'))
+    for total in ('deleted_read', 'deleted_unread', 'archived'):
+        stats[total] = stats[total] or 0
+    last = PruneRun.objects.first()
+    stats['last_run'] = last and last.ranAt.isoformat()
+    stats['last_duration'] = last and last.duration
+    stats['last_deleted'] = {} if last is None else {
+        state: getattr(last, 'deleted_' + state) for state in STATES
+        if getattr(last, 'deleted_' + state) is not None}
+    return stats
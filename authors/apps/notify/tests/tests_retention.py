@@ -0,0 +1,90 @@
+import gzip
+import json
+import os
+import tempfile
+from datetime import timedelta
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from authors.apps.authentication.models import User
+from authors.apps.notify import retention
+from authors.apps.notify.models import Notification
+
+
+class TestRetention(TestCase):
+    """Tests for pruning old notifications"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="test@mail.com",
+            username="test",
+            password="test1234"
+        )
+        self.now = timezone.now()
+        self.ttl_days = {'read': 30, 'unread': 180}
+
+    def notify(self, days_ago, is_read, count=1):
+        notifications = [
+            Notification.objects.create(
+                body='Notification', recepient=self.user, is_read=is_read)
+            for _ in range(count)]
+        Notification.objects.filter(
+            pk__in=[notification.pk for notification in notifications]
+        ).update(createdAt=self.now - timedelta(days=days_ago))
+
+    def test_each_state_has_its_own_ttl(self):
+        self.notify(40, is_read=True, count=3)
+        self.notify(10, is_read=True)
+        self.notify(40, is_read=False)
+        self.notify(200, is_read=False, count=2)
+
+        deleted = retention.prune(self.now, self.ttl_days, batch_size=2,
+                                  archive_dir='')
+        self.assertEqual(deleted, {'read': 3, 'unread': 2})
+        self.assertEqual(Notification.objects.count(), 2)
+
+    def test_zero_ttl_keeps_notifications(self):
+        self.notify(400, is_read=False)
+        deleted = retention.prune(self.now, {'read': 30, 'unread': 0},
+                                  archive_dir='')
+        self.assertEqual(deleted, {'read': 0})
+        self.assertEqual(Notification.objects.count(), 1)
+
+    def test_pruned_notifications_are_archived(self):
+        self.notify(40, is_read=True, count=3)
+        with tempfile.TemporaryDirectory() as directory:
+            retention.prune(self.now, self.ttl_days, batch_size=2,
+                            archive_dir=directory)
+            path, = [os.path.join(directory, name)
+                     for name in os.listdir(directory)]
+            with gzip.open(path, 'rt') as archive:
+                rows = [json.loads(line) for line in archive]
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0]['recepient'], 'test')
+        self.assertTrue(rows[0]['is_read'])
+        self.assertFalse(Notification.objects.exists())
+
+    def test_command_records_stats(self):
+        self.notify(40, is_read=True, count=2)
+        out = StringIO()
+        call_command('prune_notifications', batch_size=1, archive_dir='',
+                     stdout=out)
+        self.assertIn('Deleted 2 read and 0 unread notifications',
+                      out.getvalue())
+        self.assertIn('read: 2 deleted so far', out.getvalue())
+        stats = retention.get_stats()
+        self.assertGreaterEqual(stats['deleted_read'], 2)
+        self.assertEqual(stats['last_deleted'], {'read': 2, 'unread': 0})
+
+    def test_stats_outlive_the_cache(self):
+        self.notify(40, is_read=True)
+        retention.prune(self.now, {'read': 30, 'unread': 0})
+        cache.clear()
+        stats = retention.get_stats()
+        self.assertEqual(stats['runs'], 1)
+        self.assertEqual(stats['deleted_read'], 1)
+        self.assertEqual(stats['last_deleted'], {'read': 1})
@@ -1,4 +1,3 @@
-import os
 from django.core.exceptions import ObjectDoesNotExist
 from rest_framework import status
 from rest_framework.views import APIView
@@ -7,12 +6,11 @@ from rest_framework.permissions import IsAuthenticated
 from authors.apps.notify.models import Notification
 from authors.apps.notify.serializers import NotificationSerializer
 from authors.apps.authentication.models import User
-from authors.apps.articles.models import Article
 from authors.apps.profiles.models import Profile
 from authors.apps.follow.models import Follows
 from authors.apps.articles.models import FavoriteModel
-from sendgrid import SendGridAPIClient
-from sendgrid.helpers.mail import *
+from authors.apps.outbox.utils import enqueue_email
+from authors.apps.core.streaming import StreamingJSONResponse
 
 
 class NotificationsAPIView(APIView):
@@ -23,13 +21,17 @@ class NotificationsAPIView(APIView):
     permission_classes = (IsAuthenticated, )
 
     def get(self, request):
-        all_notifs = Notification.objects.filter(recepient=self.request.user)
-        serializer = NotificationSerializer(all_notifs, many=True)
+        all_notifs = Notification.objects.filter(
+            recepient=self.request.user
+        ).select_related('recepient')
 
-        return Response(
+        return StreamingJSONResponse(
             {
-                "notifications": serializer.data
-            }
+                "notifications": all_notifs
+            },
+            stream_key="notifications",
+            serialize=lambda chunk: NotificationSerializer(
+                chunk, many=True).data
         )
 
 
@@ -242,67 +244,38 @@ class NotificationsView():
         Get the users who should receive the notification
         """
         user_email = instance.get('author').get('email')
-        user = User.objects.get(email=user_email)
         recepients = []
 
         if _type == 'new-article':
-            qs = Follows.objects.filter(
-                followed_user=user.username
-            )
-            for item in qs:
-                recepients.append(item.follower.email)
+            recepients = Follows.objects.filter(
+                followed_user__in=User.objects.filter(
+                    email=user_email).values('username')
+            ).values_list('follower__email', flat=True)
 
         elif _type == 'new-comment':
-            comment_article = Article.objects.get(
-                slug=instance.get('article').get('slug')
-            )
-            qs = FavoriteModel.objects.filter(
-                article=comment_article
-            )
-
-            for item in qs:
-                recepients.append(item.user.email)
+            recepients = FavoriteModel.objects.filter(
+                article__slug=instance.get('article').get('slug')
+            ).values_list('user__email', flat=True)
 
-        return recepients
+        return list(recepients)
 
     @classmethod
     def send_notification(cls, message, instance, _type):
         """
-        Sends notifications to users and updates the notifications table
+        Sends notifications to users and updates the notifications table.
+        The email is queued in the outbox as a single message addressed to
+        every subscribed recipient, so call this inside the transaction that
+        saves `instance`.
         """
-        recepients = cls.get_recepients(instance, _type)
-        for user_email in recepients:
-            user_recepient = User.objects.get(email=user_email)
-            if user_recepient.is_subscribed:
-                Notification.objects.create(
-                    body=message,
-                    recepient=User.objects.get(email=user_email)
-                )
-
-            cls.send_email(user_email, message)
+        recepients = list(User.objects.filter(
+            email__in=cls.get_recepients(instance, _type),
+            is_subscribed=True
+        ))
+        Notification.objects.bulk_create([
+            Notification(body=message, recepient=user)
+            for user in recepients
+        ])
+        enqueue_email([user.email for user in recepients],
+                      'Authors Haven', message)
 
         return
-
-    @classmethod
-    def send_email(cls, user_email, message):
-        """
-        Sends an email notification to users
-        """
-        sg = SendGridAPIClient(apikey=os.getenv('SENDGRID_API_KEY'))
-        to_email = Email(email=user_email)
-        from_email = Email(email=os.getenv('FROM_EMAIL'))
-        user = User.objects.get(email=user_email)
-
-        if user.is_subscribed:
-            subject = 'Authors Haven'
-            content = Content("text/plain", message)
-
-            try:
-                mail = Mail(from_email, subject, to_email, content)
-                response = sg.client.mail.send.post(request_body=mail.get())
-                cls.count += 1
-                if response.status_code is not 202:
-                    return "check sender email and API key settings"
-                return "Email sent to {}".format(user_email)
-            except Exception:
-                return "Error while sending mail to provided account"
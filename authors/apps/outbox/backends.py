@@ -0,0 +1,103 @@
+import json
+import os
+
+import requests
+from django.conf import settings
+from django.core import mail
+from django.utils.module_loading import import_string
+from sendgrid.helpers.mail import Content, Email, Mail, Personalization
+
+from authors.apps.core import outbound
+
+
+class DeliveryError(Exception):
+    """Raised by a backend when a message could not be handed over."""
+
+
+class SendGridBackend:
+    """
+    Delivers messages through the SendGrid v3 API. A single HTTP session is
+    shared by every message the worker sends so connections are reused, and
+    each recipient gets its own personalization so a message addressed to many
+    users goes out in one API call.
+    """
+    url = 'https://api.sendgrid.com/v3/mail/send'
+    # SendGrid accepts at most 1000 personalizations per request.
+    max_personalizations = 1000
+
+    def __init__(self):
+        self.session = requests.Session()
+        self.session.headers.update({
+            'Authorization': 'Bearer {}'.format(
+                os.getenv('SENDGRID_API_KEY')),
+            'Content-Type': 'application/json'
+        })
+
+    def build_payload(self, message, recipients):
+        payload = Mail()
+        payload.from_email = Email(email=message.from_email)
+        payload.subject = message.subject
+        payload.add_content(Content(message.content_type, message.body))
+        for recipient in recipients:
+            personalization = Personalization()
+            personalization.add_to(Email(email=recipient))
+            payload.add_personalization(personalization)
+        return payload.get()
+
+    def send(self, message):
+        recipients = message.recipient_list
+        for start in range(0, len(recipients), self.max_personalizations):
+            payload = self.build_payload(
+                message, recipients[start:start + self.max_personalizations])
+            response = outbound.call(
+                'sendgrid', self.session.post, self.url,
+                data=json.dumps(payload),
+                timeout=settings.OUTBOX_SEND_TIMEOUT,
+                is_failure=outbound.is_server_error)
+            if response.status_code != 202:
+                raise DeliveryError('SendGrid returned {}: {}'.format(
+                    response.status_code, response.text[:200]))
+
+
+class DjangoMailBackend:
+    """
+    Delivers messages through Django's configured `EMAIL_BACKEND`, e.g. a
+    local SMTP server during development. One connection is opened per
+    message and reused for all of its recipients.
+    """
+
+    def send(self, message):
+        emails = []
+        for recipient in message.recipient_list:
+            email = mail.EmailMessage(
+                message.subject, message.body, message.from_email,
+                [recipient])
+            if message.content_type == 'text/html':
+                email.content_subtype = 'html'
+            emails.append(email)
+        with mail.get_connection() as connection:
+            connection.send_messages(emails)
+
+
+class FileBackend:
+    """
+    Appends every message as a JSON line to `OUTBOX_FILE_PATH`. Used as a
+    local sink in tests and development.
+    """
+
+    def send(self, message):
+        record = {
+            'id': message.pk,
+            'from': message.from_email,
+            'to': message.recipient_list,
+            'subject': message.subject,
+            'content_type': message.content_type,
+            'body': message.body
+        }
+        with open(settings.OUTBOX_FILE_PATH, 'a') as sink:
+            sink.write(json.dumps(record) + '\n')
+
+
+def get_backend(path=None):
+    """Returns an instance of the configured outbox backend."""
+    return import_string(path or settings.OUTBOX_BACKEND)()
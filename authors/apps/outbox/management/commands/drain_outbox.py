@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from authors.apps.outbox.backends import get_backend
+from authors.apps.outbox.worker import drain
+
+
+class Command(BaseCommand):
+    help = 'Delivers queued outbox emails, polling until interrupted.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Deliver what is currently due and exit.')
+        parser.add_argument(
+            '--batch-size', type=int, default=None,
+            help='Messages claimed per batch (OUTBOX_BATCH_SIZE).')
+        parser.add_argument(
+            '--interval', type=float, default=5.0,
+            help='Seconds to sleep when the outbox is empty.')
+
+    def handle(self, *args, **options):
+        backend = get_backend()
+        while True:
+            sent, failed = drain(options['batch_size'], backend)
+            if sent or failed:
+                self.stdout.write('Sent {}, failed {}'.format(sent, failed))
+            if options['once']:
+                return
+            time.sleep(options['interval'])
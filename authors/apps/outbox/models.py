@@ -0,0 +1,46 @@
+from django.db import models
+from django.utils import timezone
+
+
+class OutboxMessage(models.Model):
+    """
+    An email waiting to be delivered by the outbox worker. Rows are written
+    in the same transaction as the change that triggers the email, so a
+    request that rolls back never sends mail and a committed one always does.
+    """
+    PENDING = 'pending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, 'Pending'),
+        (SENT, 'Sent'),
+        (FAILED, 'Failed'),
+    )
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    content_type = models.CharField(max_length=20, default='text/plain')
+    from_email = models.EmailField()
+    # One address per line. Every recipient receives the same message, which
+    # lets the worker deliver it in a single batched call.
+    recipients = models.TextField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES,
+                              default=PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(blank=True, null=True)
+
+    def __str__(self):
+        return '{} ({})'.format(self.subject, self.status)
+
+    @property
+    def recipient_list(self):
+        return [email for email in self.recipients.split('\n') if email]
+
+    class Meta:
+        ordering = ('created_at',)
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
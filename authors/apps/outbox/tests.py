@@ -0,0 +1,120 @@
+import json
+import os
+import tempfile
+from datetime import timedelta
+
+from django.core import mail
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from .backends import DjangoMailBackend, FileBackend, SendGridBackend
+from .models import OutboxMessage
+from .utils import enqueue_email
+from .worker import drain
+
+
+class FailingBackend:
+    """Backend stand-in that fails a set number of times before succeeding."""
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.sent = []
+
+    def send(self, message):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError('SendGrid is unavailable')
+        self.sent.append(message.pk)
+
+
+class TestEnqueueEmail(TestCase):
+    """Tests for queueing emails in the outbox"""
+
+    def test_enqueue_email_creates_pending_message(self):
+        message, = enqueue_email(['a@mail.com', 'b@mail.com'], 'Hi', 'Hello')
+        self.assertEqual(message.status, OutboxMessage.PENDING)
+        self.assertEqual(message.recipient_list, ['a@mail.com', 'b@mail.com'])
+
+    def test_enqueue_email_without_recipients_is_skipped(self):
+        self.assertEqual(enqueue_email([], 'Hi', 'Hello'), [])
+        self.assertFalse(OutboxMessage.objects.exists())
+
+    @override_settings(OUTBOX_MAX_RECIPIENTS=2)
+    def test_enqueue_email_splits_many_recipients(self):
+        messages = enqueue_email(
+            ['a@mail.com', 'b@mail.com', 'c@mail.com'], 'Hi', 'Hello')
+        self.assertEqual([message.recipient_list for message in messages],
+                         [['a@mail.com', 'b@mail.com'], ['c@mail.com']])
+
+    def test_rolled_back_transaction_discards_email(self):
+        try:
+            with transaction.atomic():
+                enqueue_email(['a@mail.com'], 'Hi', 'Hello')
+                raise ValueError
+        except ValueError:
+            pass
+        self.assertFalse(OutboxMessage.objects.exists())
+
+
+class TestOutboxWorker(TestCase):
+    """Tests for delivering queued emails"""
+
+    def setUp(self):
+        self.sink = tempfile.NamedTemporaryFile(suffix='.jsonl', delete=False)
+        self.sink.close()
+        self.addCleanup(os.remove, self.sink.name)
+
+    def test_drain_delivers_to_file_sink(self):
+        enqueue_email(['a@mail.com', 'b@mail.com'], 'Hi', 'Hello')
+        with override_settings(OUTBOX_FILE_PATH=self.sink.name):
+            sent, failed = drain(backend=FileBackend())
+        self.assertEqual((sent, failed), (1, 0))
+        with open(self.sink.name) as sink:
+            records = [json.loads(line) for line in sink]
+        self.assertEqual(records[0]['to'], ['a@mail.com', 'b@mail.com'])
+        message = OutboxMessage.objects.get()
+        self.assertEqual(message.status, OutboxMessage.SENT)
+        self.assertIsNotNone(message.sent_at)
+
+    def test_drain_delivers_through_django_mail(self):
+        enqueue_email(['a@mail.com', 'b@mail.com'], 'Hi', '<p>Hello</p>',
+                      content_type='text/html')
+        drain(backend=DjangoMailBackend())
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(mail.outbox[0].to, ['a@mail.com'])
+        self.assertEqual(mail.outbox[0].content_subtype, 'html')
+
+    def test_failed_delivery_is_retried_with_backoff(self):
+        enqueue_email(['a@mail.com'], 'Hi', 'Hello')
+        backend = FailingBackend(failures=1)
+        self.assertEqual(drain(backend=backend), (0, 1))
+        message = OutboxMessage.objects.get()
+        self.assertEqual(message.status, OutboxMessage.PENDING)
+        self.assertEqual(message.attempts, 1)
+        self.assertGreater(message.next_attempt_at, timezone.now())
+
+        # Nothing is due until the backoff has passed
+        self.assertEqual(drain(backend=backend), (0, 0))
+        OutboxMessage.objects.update(
+            next_attempt_at=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(drain(backend=backend), (1, 0))
+        self.assertEqual(backend.sent, [message.pk])
+
+    @override_settings(OUTBOX_MAX_ATTEMPTS=2, OUTBOX_RETRY_BACKOFF=0)
+    def test_message_fails_after_max_attempts(self):
+        enqueue_email(['a@mail.com'], 'Hi', 'Hello')
+        backend = FailingBackend(failures=5)
+        drain(backend=backend)
+        drain(backend=backend)
+        message = OutboxMessage.objects.get()
+        self.assertEqual(message.status, OutboxMessage.FAILED)
+        self.assertIn('unavailable', message.last_error)
+
+    def test_sendgrid_payload_has_one_personalization_per_recipient(self):
+        message, = enqueue_email(['a@mail.com', 'b@mail.com'], 'Hi', 'Hello')
+        payload = SendGridBackend().build_payload(
+            message, message.recipient_list)
+        self.assertEqual(len(payload['personalizations']), 2)
+        self.assertEqual(payload['personalizations'][1]['to'],
+                         [{'email': 'b@mail.com'}])
@@ -0,0 +1,27 @@
+from django.conf import settings
+
+from .models import OutboxMessage
+
+
+def enqueue_email(recipients, subject, content, content_type='text/plain',
+                  from_email=None):
+    """
+    Queues an email for delivery by the outbox worker and returns the queued
+    messages. Call it inside the transaction that makes the change the email
+    is about; the rows commit or roll back together with that change.
+
+    Recipients are split into messages of at most `OUTBOX_MAX_RECIPIENTS`,
+    each delivered and retried on its own, so a failure part way through
+    never sends the email twice to those who already got it.
+    """
+    recipients = [email for email in recipients if email]
+    size = settings.OUTBOX_MAX_RECIPIENTS
+    return [
+        OutboxMessage.objects.create(
+            subject=subject,
+            body=content,
+            content_type=content_type,
+            from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+            recipients='\n'.join(recipients[start:start + size])
+        )
+        for start in range(0, len(recipients), size)]
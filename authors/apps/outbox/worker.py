@@ -0,0 +1,81 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .backends import get_backend
+from .models import OutboxMessage
+
+logger = logging.getLogger(__name__)
+
+
+def retry_delay(attempts):
+    """Exponential backoff, capped at `OUTBOX_RETRY_MAX_DELAY` seconds."""
+    delay = settings.OUTBOX_RETRY_BACKOFF * (2 ** (attempts - 1))
+    return timedelta(seconds=min(delay, settings.OUTBOX_RETRY_MAX_DELAY))
+
+
+def claim_batch(batch_size):
+    """
+    Reserves up to `batch_size` due messages for this worker. The rows are
+    locked only while their lease is extended, so several workers can drain
+    the outbox without sending the same message twice and without holding
+    locks during network calls.
+    """
+    now = timezone.now()
+    lease = now + timedelta(seconds=settings.OUTBOX_LEASE_SECONDS)
+    with transaction.atomic():
+        ids = list(
+            OutboxMessage.objects.select_for_update(skip_locked=True)
+            .filter(status=OutboxMessage.PENDING, next_attempt_at__lte=now)
+            .order_by('next_attempt_at')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        OutboxMessage.objects.filter(id__in=ids).update(next_attempt_at=lease)
+    return list(OutboxMessage.objects.filter(id__in=ids))
+
+
+def deliver(message, backend):
+    """Sends one message and records the outcome. Returns True on success."""
+    message.attempts += 1
+    try:
+        backend.send(message)
+    except Exception as error:
+        message.last_error = str(error)
+        if message.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+            message.status = OutboxMessage.FAILED
+            logger.error('Giving up on outbox message %s after %s attempts: '
+                         '%s', message.pk, message.attempts, error)
+        else:
+            message.next_attempt_at = (
+                timezone.now() + retry_delay(message.attempts))
+        message.save(update_fields=['attempts', 'last_error', 'status',
+                                    'next_attempt_at'])
+        return False
+    message.status = OutboxMessage.SENT
+    message.sent_at = timezone.now()
+    message.last_error = ''
+    message.save(update_fields=['attempts', 'last_error', 'status',
+                                'sent_at'])
+    return True
+
+
+def drain(batch_size=None, backend=None):
+    """
+    Delivers every message that is currently due, one batch at a time.
+    Returns a `(sent, failed)` tuple of delivery attempts.
+    """
+    batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+    backend = backend or get_backend()
+    sent = failed = 0
+    while True:
+        batch = claim_batch(batch_size)
+        if not batch:
+            return sent, failed
+        for message in batch:
+            if deliver(message, backend):
+                sent += 1
+            else:
+                failed += 1
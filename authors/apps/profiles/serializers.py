@@ -1,9 +1,10 @@
 from rest_framework.serializers import (ModelSerializer, ReadOnlyField,
                                         ValidationError, CharField)
 from .models import Profile
+from authors.apps.core.serializers import SparseFieldsMixin
 
 
-class ProfileSerializer(ModelSerializer):
+class ProfileSerializer(SparseFieldsMixin, ModelSerializer):
     """ Profile Serializer for serializing data into json
     format for human readability
     and deserilization from json to db ready format
@@ -13,9 +14,15 @@ class ProfileSerializer(ModelSerializer):
     """
 
     username = ReadOnlyField(source='get_username')
-    user_id = ReadOnlyField(source='user.id')
+    user_id = ReadOnlyField()
     avatar_url = ReadOnlyField(source='get_cloudinary_url')
 
+    field_sources = {
+        'username': ['user__username'],
+        'user_id': ['user'],
+        'avatar_url': ['avatar'],
+    }
+
     class Meta:
         model = Profile
         fields = ('username', 'user_bio', 'name',
@@ -8,11 +8,29 @@ from rest_framework.views import APIView
 from drf_yasg.utils import swagger_auto_schema
 
 
-import cloudinary
-
 from .models import Profile
 from ..authentication.models import User
 from .serializers import ProfileSerializer
+from authors.apps.core import cache as object_cache
+from authors.apps.core import outbound
+from authors.apps.core.serializers import fragment_name, sparse_fields
+from authors.apps.core.startup import lazy_import
+from authors.apps.core.streaming import StreamingJSONResponse
+
+cloudinary_uploader = lazy_import('cloudinary.uploader')
+
+
+def profile_dependencies(profile):
+    """Objects the serialized form of a profile is built from"""
+    return [('profile', profile.pk), ('user', profile.user_id)]
+
+
+def get_profiles_data(profiles, fields=None):
+    """Serialized profiles, from the object cache where possible"""
+    return object_cache.get_fragments(
+        fragment_name('profile', fields), profiles, profile_dependencies,
+        lambda missing: ProfileSerializer(
+            missing, many=True, fields=fields).data)
 
 
 class ProfilesListAPIview(APIView):
@@ -20,13 +38,19 @@ class ProfilesListAPIview(APIView):
     permission_classes = (IsAuthenticated,)
 
     def get(self, request):
-        profiles = Profile.objects.all()
-        serializer = ProfileSerializer(profiles, many=True)
-        if not profiles:
+        fields = sparse_fields(request)
+        profiles = Profile.objects.only(
+            'user', *ProfileSerializer.only_fields(fields))
+        if fields is None or 'username' in fields:
+            profiles = profiles.select_related('user')
+        if not profiles.exists():
             return Response(
                 {"message": "No profile available"}
             )
-        return Response({"profiles": serializer.data})
+        return StreamingJSONResponse(
+            {"profiles": profiles},
+            stream_key="profiles",
+            serialize=lambda chunk: get_profiles_data(chunk, fields))
 
 
 class CreateRetrieveProfileView(APIView):
@@ -41,8 +65,8 @@ class CreateRetrieveProfileView(APIView):
         user = User.objects.get(username=username)
         uid = user.pk
         profile = get_object_or_404(Profile.objects.all(), user_id=uid)
-        serializer = ProfileSerializer(profile, many=False)
-        return Response({"profile": serializer.data})
+        profile.user = user
+        return Response({"profile": get_profiles_data([profile])[0]})
 
     @swagger_auto_schema(request_body=ProfileSerializer,
                          responses={201: ProfileSerializer(),
@@ -169,7 +193,12 @@ class AvatarView(APIView):
                 raise APIException(
                     {"message": "This is image is too large, avatars cannot be more than 5mb"})
 
-            data = {"avatar": upload_info}
+            # upload here rather than in CloudinaryField.pre_save, so the
+            # upload runs through the outbound layer with a timeout
+            avatar = outbound.call(
+                'cloudinary', cloudinary_uploader.upload_resource, content,
+                type='upload', resource_type='image')
+            data = {"avatar": avatar.get_prep_value()}
             serializer = ProfileSerializer(
                 instance=saved_profile, data=data, partial=True)
             if serializer.is_valid(raise_exception=True):
@@ -180,6 +209,8 @@ class AvatarView(APIView):
                         "profile": serializer.data
 
                     }, status=200)
+        except outbound.ServiceUnavailable:
+            raise
         except Exception as e:
             APIException.status_code = status.HTTP_400_BAD_REQUEST
             raise APIException({
@@ -0,0 +1,37 @@
+# Generated by Django 2.1.7 on 2026-10-19 17:02
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('articles', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Report',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('reporter', models.EmailField(default=None, max_length=254)),
+                ('createdAt', models.DateTimeField(auto_now_add=True)),
+                ('resolvedAt', models.DateField(blank=True, null=True)),
+                ('violation', models.CharField(choices=[('Hate Speech', 'Hate Speech'), ('Harrassment', 'Harassment'), ('Privacy and Reputation', 'Privacy and Reputation'), ('Spam', 'Spam'), ('Bot Account', 'Bot Account'), ('Deceptive Conduct', 'Deceptive Conduct'), ('Graphic Content', 'Graphic Content'), ('Exploitation of Minors', 'Exploitation of Minors'), ('Promotion of Self-harm', 'Promotion of Self-harm'), ('Other', 'Other')], max_length=30)),
+                ('reportDetails', models.TextField(default='No Comment.', max_length=1000)),
+                ('isResolved', models.BooleanField(default=False)),
+                ('adminNote', models.TextField(default='No Comment.', max_length=1000)),
+                ('article', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='articles.Article')),
+            ],
+            options={
+                'ordering': ['createdAt'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='report',
+            index=models.Index(fields=['article', 'isResolved'], name='report_repo_article_b4e411_idx'),
+        ),
+    ]
@@ -34,6 +34,10 @@ class Report(models.Model):
 
     class Meta:
         ordering = ["createdAt"]
+        indexes = [
+            # an article's reports, or only its open ones
+            models.Index(fields=['article', 'isResolved']),
+        ]
 
 
 
@@ -8,6 +8,7 @@ from rest_framework.views import APIView
 from rest_framework import status
 from rest_framework.response import Response
 
+from authors.apps.core.streaming import StreamingJSONResponse
 from .serializers import ReportSerializer
 from .models import Report
 from ..authentication.models import User
@@ -132,9 +133,10 @@ class GetAllReportsView(APIView):
         permission_classes = (IsAuthenticated,)
 
         reports = Report.objects.all().values()
-        return Response(
+        return StreamingJSONResponse(
             {
                 "success": "All reports retrieved.",
                 "reports": reports
             },
+            stream_key="reports",
             status=status.HTTP_200_OK)
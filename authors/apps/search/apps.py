@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class SearchConfig(AppConfig):
+    name = 'authors.apps.search'
+
+    def ready(self):
+        from . import signals  # noqa: F401
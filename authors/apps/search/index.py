@@ -0,0 +1,517 @@
+"""
+In-memory prefix index for search suggestions over article titles,
+usernames and tag names.
+
+Every indexed string is kept lowercased in sorted order, so the entries
+starting with a prefix are a contiguous run found with binary searches.
+The keys are split into blocks of a thousand or so, so adding or
+removing one moves only the keys of its block. Titles are indexed from
+the start of each word, so "dja" suggests "Getting started with
+Django". Matches are ranked by popularity: likes for articles, followers
+for users and articles tagged for tags. A prefix of one or two
+characters matches a large part of the index, so the best entries of
+each kind matching it are kept ranked, and updated as entries change,
+rather than ranked on every request.
+
+Only published articles are indexed.
+
+Each process holds its own index. It is built on first use, from the
+snapshot file (`settings.SEARCH_INDEX_SNAPSHOT`) when there is a recent
+one and from the database otherwise. `search/signals.py` applies changes
+made by the process once they commit, and records each one as an
+`IndexChange`. Every `settings.SEARCH_INDEX_REFRESH` seconds one request
+runs `catch_up()`, which re-reads only the entries changed since, while
+other requests go on using the index as it is.
+"""
+import gzip
+import heapq
+import itertools
+import json
+import os
+import re
+import threading
+import time
+from bisect import bisect_left, insort
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Count, Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from taggit.models import Tag
+
+from authors.apps.articles.models import Article
+from authors.apps.authentication.models import User
+from authors.apps.core.routers import use_replicas
+
+from .models import IndexChange
+
+KINDS = ('article', 'user', 'tag')
+# suggestions for longer prefixes remembered until an entry they could
+# include changes
+MEMO_SIZE = 1000
+# prefixes up to this long match too many keys to rank on every request,
+# so the best RANKED entries of each kind are kept ranked for them; at
+# least the suggest view's largest limit
+SHORT_PREFIX = 2
+RANKED = 50
+# keys are held in blocks of BLOCK_SIZE to twice that
+BLOCK_SIZE = 1000
+# marks the end of a prefix range: sorts after any character in a key
+END = '\U0010ffff'
+# changes stamped this long before a catch up are read again by the next
+# one: their transactions may have committed after it, or been stamped by
+# a clock running behind
+CHANGE_OVERLAP = timedelta(minutes=1)
+
+
+WORD_START = re.compile(r'(?<!\S)\S')
+
+
+def keys_for(kind, text):
+    text = text.lower()
+    if kind != 'article':
+        return [text]
+    return list({text[match.start():]
+                 for match in WORD_START.finditer(text)})
+
+
+class Ranking:
+    """
+    The best entries of one kind matching a short prefix, as `ranks` best
+    first, each rank ending with the entry's (kind, pk). `partial` when
+    other entries match too, all of them ranking below the last kept.
+    """
+
+    __slots__ = ('ranks', 'partial')
+
+    def __init__(self, ranks, partial):
+        self.ranks = ranks
+        self.partial = partial
+
+    def discard(self, ref):
+        for position, rank in enumerate(self.ranks):
+            if rank[-1] == ref:
+                del self.ranks[position]
+                return
+
+    def place(self, rank):
+        """Ranks an entry that is not kept, if it belongs among those
+        that are."""
+        if self.partial and not (self.ranks and rank < self.ranks[-1]):
+            return
+        insort(self.ranks, rank)
+        if len(self.ranks) > RANKED:
+            self.ranks.pop()
+            self.partial = True
+
+
+class SortedKeys:
+    """
+    (key, (kind, pk)) pairs in key order, held as blocks of between
+    BLOCK_SIZE and twice as many keys, and the (kind, pk) of each, with
+    the first key of every block to find blocks by.
+    """
+
+    def __init__(self, pairs=()):
+        pairs = sorted(pairs, key=lambda pair: pair[0])
+        blocks = [pairs[start:start + BLOCK_SIZE]
+                  for start in range(0, len(pairs), BLOCK_SIZE)]
+        self.keys = [[key for key, _ in block] for block in blocks]
+        self.refs = [[ref for _, ref in block] for block in blocks]
+        self.firsts = [keys[0] for keys in self.keys]
+
+    def __len__(self):
+        return sum(map(len, self.keys))
+
+    def __iter__(self):
+        for keys, refs in zip(self.keys, self.refs):
+            yield from zip(keys, refs)
+
+    def block(self, key):
+        """The first block that can hold `key`."""
+        return max(bisect_left(self.firsts, key) - 1, 0)
+
+    def add(self, key, ref):
+        if not self.keys:
+            self.keys, self.refs, self.firsts = [[key]], [[ref]], [key]
+            return
+        number = self.block(key)
+        keys, refs = self.keys[number], self.refs[number]
+        position = bisect_left(keys, key)
+        keys.insert(position, key)
+        refs.insert(position, ref)
+        self.firsts[number] = keys[0]
+        if len(keys) > 2 * BLOCK_SIZE:
+            self.keys.insert(number + 1, keys[BLOCK_SIZE:])
+            self.refs.insert(number + 1, refs[BLOCK_SIZE:])
+            self.firsts.insert(number + 1, keys[BLOCK_SIZE])
+            del keys[BLOCK_SIZE:], refs[BLOCK_SIZE:]
+
+    def remove(self, key, ref):
+        number = self.block(key)
+        while True:
+            keys, refs = self.keys[number], self.refs[number]
+            position = bisect_left(keys, key)
+            while position < len(keys) and refs[position] != ref:
+                position += 1
+            if position < len(keys):
+                break
+            # equal keys can carry on into the next block
+            number += 1
+        del keys[position], refs[position]
+        if keys:
+            self.firsts[number] = keys[0]
+        else:
+            del self.keys[number], self.refs[number], self.firsts[number]
+
+    def matching(self, prefix):
+        """The (kind, pk) of every key starting with `prefix`."""
+        refs = set()
+        for number in range(self.block(prefix), len(self.keys)):
+            keys = self.keys[number]
+            start = bisect_left(keys, prefix)
+            end = bisect_left(keys, prefix + END, start)
+            refs.update(self.refs[number][start:end])
+            if end < len(keys):
+                break
+        return refs
+
+
+class SuggestIndex:
+
+    def __init__(self):
+        self.keys = SortedKeys()
+        # (kind, pk) -> {'text': ..., 'score': ..., and e.g. 'slug'}
+        self.docs = {}
+        # (prefix, kind) -> Ranking, for prefixes up to SHORT_PREFIX long
+        self.rankings = {}
+        self.memo = {}
+        self.lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.docs)
+
+    def rank(self, ref):
+        doc = self.docs[ref]
+        return (-doc['score'], len(doc['text']), ref)
+
+    def rankings_of(self, kind, keys):
+        """The rankings kept for the short prefixes of `keys`."""
+        prefixes = {key[:length] for key in keys
+                    for length in range(1, SHORT_PREFIX + 1)}
+        return [self.rankings[prefix, kind] for prefix in prefixes
+                if (prefix, kind) in self.rankings]
+
+    def add(self, kind, pk, text, score=0, **extra):
+        """Indexes `text`, replacing what was indexed for `kind`/`pk`."""
+        with self.lock:
+            ref = (kind, pk)
+            doc = dict(extra, text=text, score=score)
+            keys = keys_for(kind, text)
+            self.forget(keys)
+            if self.docs.get(ref, {}).get('text') == text:
+                # same keys, only the ranking or extras change
+                rankings = self.rankings_of(kind, keys)
+                for ranking in rankings:
+                    ranking.discard(ref)
+                self.docs[ref] = doc
+                for ranking in rankings:
+                    ranking.place(self.rank(ref))
+                return
+            self.remove(kind, pk)
+            self.docs[ref] = doc
+            for key in keys:
+                self.keys.add(key, ref)
+            for ranking in self.rankings_of(kind, keys):
+                ranking.place(self.rank(ref))
+
+    def remove(self, kind, pk):
+        with self.lock:
+            ref = (kind, pk)
+            doc = self.docs.pop(ref, None)
+            if doc is None:
+                return
+            keys = keys_for(kind, doc['text'])
+            self.forget(keys)
+            for ranking in self.rankings_of(kind, keys):
+                ranking.discard(ref)
+            for key in keys:
+                self.keys.remove(key, ref)
+
+    def forget(self, keys):
+        """Drops remembered suggestions for prefixes of `keys`."""
+        stale = [memo_key for memo_key in self.memo
+                 if any(key.startswith(memo_key[0]) for key in keys)]
+        for memo_key in stale:
+            del self.memo[memo_key]
+
+    def rank_prefix(self, prefix):
+        """Ranks the entries matching the short `prefix` afresh. Returns
+        False, keeping nothing, if none match."""
+        matching = self.keys.matching(prefix)
+        if not matching:
+            return False
+        refs = {kind: [] for kind in KINDS}
+        for ref in matching:
+            refs[ref[0]].append(ref)
+        for kind, kind_refs in refs.items():
+            self.rankings[prefix, kind] = Ranking(
+                heapq.nsmallest(RANKED, map(self.rank, kind_refs)),
+                len(kind_refs) > RANKED)
+        return True
+
+    def ranked(self, prefix, kinds, limit):
+        """The ranks of the best `limit` entries of `kinds` matching the
+        short `prefix`, from the rankings kept for it."""
+        rankings = [self.rankings.get((prefix, kind)) for kind in kinds]
+        if any(ranking is None or
+               ranking.partial and len(ranking.ranks) < limit
+               for ranking in rankings):
+            if not self.rank_prefix(prefix):
+                return []
+            rankings = [self.rankings[prefix, kind] for kind in kinds]
+        return heapq.nsmallest(limit, itertools.chain.from_iterable(
+            ranking.ranks[:limit] for ranking in rankings))
+
+    def suggest(self, prefix, kinds=KINDS, limit=10):
+        """The `limit` most popular entries of `kinds` matching `prefix`."""
+        prefix = prefix.strip().lower()
+        if not prefix:
+            return []
+        kinds = tuple(sorted(set(kinds)))
+        memo_key = (prefix, kinds, limit)
+        with self.lock:
+            if len(prefix) <= SHORT_PREFIX:
+                best = self.ranked(prefix, kinds, limit)
+            elif memo_key in self.memo:
+                return self.memo[memo_key]
+            else:
+                best = heapq.nsmallest(limit, (
+                    self.rank(ref) for ref in self.keys.matching(prefix)
+                    if ref[0] in kinds))
+            suggestions = [dict(self.docs[rank[-1]], type=rank[-1][0],
+                                id=rank[-1][1]) for rank in best]
+            if len(prefix) > SHORT_PREFIX:
+                if len(self.memo) >= MEMO_SIZE:
+                    self.memo.clear()
+                self.memo[memo_key] = suggestions
+            return suggestions
+
+    # snapshots
+
+    def dump(self):
+        with self.lock:
+            return [[kind, pk, doc] for (kind, pk), doc in self.docs.items()]
+
+    def load(self, rows):
+        """Indexes `(kind, pk, doc)` rows in one go, which unlike adding
+        them one by one sorts the keys only once, and ranks the entries of
+        every short prefix."""
+        rows = list(rows)
+        with self.lock:
+            for kind, pk, doc in rows:
+                self.remove(kind, pk)
+            pairs = list(self.keys)
+            for kind, pk, doc in rows:
+                ref = (kind, pk)
+                self.docs[ref] = doc
+                pairs.extend(
+                    (key, ref) for key in keys_for(kind, doc['text']))
+            self.keys = SortedKeys(pairs)
+            self.memo.clear()
+            self.rankings = {}
+            for prefix in {key[:length] for key, _ in pairs
+                           for length in range(1, SHORT_PREFIX + 1)}:
+                self.rank_prefix(prefix)
+
+
+# loading from the database
+
+def article_rows(articles):
+    for pk, title, slug, likes in articles.annotate(
+            likes=Count('liked', filter=Q(liked__likes=1))).values_list(
+            'pk', 'title', 'slug', 'likes').order_by():
+        yield 'article', pk, {'text': title, 'score': likes, 'slug': slug}
+
+
+def user_rows(users):
+    for pk, username, followers in users.values_list(
+            'pk', 'username', 'profile__number_of_followers').order_by():
+        yield 'user', pk, {'text': username, 'score': followers or 0}
+
+
+def tag_rows(tags):
+    for pk, name, count in tags.values_list(
+            'pk', 'name', 'stat__article_count').order_by():
+        yield 'tag', pk, {'text': name, 'score': count or 0}
+
+
+def indexed(kind):
+    """The objects of `kind` the index holds, and the rows for them."""
+    if kind == 'article':
+        return Article.objects.filter(is_published=True), article_rows
+    if kind == 'user':
+        return User.objects.all(), user_rows
+    return Tag.objects.all(), tag_rows
+
+
+def load_rows(index, rows):
+    for kind, pk, doc in rows:
+        index.add(kind, pk, **doc)
+
+
+def refresh(index, kind, pks):
+    """Re-reads the entries of `kind` with `pks`, dropping those that no
+    longer exist or, for articles, are no longer published."""
+    objects, rows = indexed(kind)
+    missing = set(pks)
+    for _, pk, doc in rows(objects.filter(pk__in=missing)):
+        index.add(kind, pk, **doc)
+        missing.discard(pk)
+    for pk in missing:
+        index.remove(kind, pk)
+
+
+def build():
+    index = SuggestIndex()
+    index.load(itertools.chain.from_iterable(
+        rows(objects) for objects, rows in map(indexed, KINDS)))
+    return index
+
+
+def record_change(kind, pk):
+    IndexChange.objects.create(kind=kind, object_id=pk)
+
+
+def record_rebuild():
+    """Asks every process to rebuild its index, for changes made without
+    signals."""
+    IndexChange.objects.create()
+
+
+def catch_up(index, since):
+    """
+    Applies the changes recorded since `since` to `index`, re-reading only
+    the entries they name, and deletes changes no index needs any more.
+    Returns False, having changed nothing, if the index has to be rebuilt
+    instead: it is older than the changes kept, or a rebuild was asked for.
+    """
+    now = timezone.now()
+    kept = timedelta(seconds=settings.SEARCH_INDEX_CHANGES_KEPT)
+    if since < now - kept + CHANGE_OVERLAP:
+        return False
+    pks = {}
+    for kind, pk in IndexChange.objects.filter(
+            changed_at__gte=since - CHANGE_OVERLAP).values_list(
+            'kind', 'object_id').distinct():
+        if not kind:
+            return False
+        pks.setdefault(kind, set()).add(pk)
+    for kind, kind_pks in pks.items():
+        refresh(index, kind, kind_pks)
+    IndexChange.objects.filter(changed_at__lt=now - kept).delete()
+    return True
+
+
+# snapshots
+
+def save_snapshot(index, path, taken_at):
+    """Writes `index` to `path`, replacing any earlier snapshot at once."""
+    temporary = '{}.{}.tmp'.format(path, os.getpid())
+    with gzip.open(temporary, 'wt', encoding='utf-8') as snapshot:
+        json.dump({'taken_at': taken_at.isoformat(),
+                   'entries': index.dump()}, snapshot)
+    os.replace(temporary, path)
+
+
+def snapshot_age(path):
+    try:
+        return time.time() - os.path.getmtime(path)
+    except OSError:
+        return float('inf')
+
+
+def load_snapshot(path, max_age):
+    """`(index, taken_at)` from the snapshot at `path`, or None if there is
+    none younger than `max_age` seconds."""
+    if snapshot_age(path) > max_age:
+        return None
+    try:
+        with gzip.open(path, 'rt', encoding='utf-8') as snapshot:
+            data = json.load(snapshot)
+    except (OSError, ValueError):
+        return None
+    index = SuggestIndex()
+    index.load(data['entries'])
+    return index, parse_datetime(data['taken_at'])
+
+
+# the process' index
+
+_index = None
+_synced_at = None
+_checked = 0
+_refreshing = False
+_lock = threading.Lock()
+
+
+def synced(index, since):
+    """`index` brought up to date from `since`, or rebuilt."""
+    # read from the primary: a lagging replica could hide recent changes
+    with use_replicas(False):
+        if index is not None and catch_up(index, since):
+            return index
+        return build()
+
+
+def get_index():
+    """
+    The index of this process, loaded or brought up to date if due. While
+    one request brings it up to date the others use it as it is, so only
+    the first load makes requests wait.
+    """
+    global _index, _synced_at, _checked, _refreshing
+    refreshing = False
+    with _lock:
+        if _index is None:
+            started = timezone.now()
+            loaded = None
+            if settings.SEARCH_INDEX_SNAPSHOT:
+                loaded = load_snapshot(settings.SEARCH_INDEX_SNAPSHOT,
+                                       settings.SEARCH_INDEX_SNAPSHOT_MAX_AGE)
+            _index = synced(*(loaded or (None, None)))
+            _synced_at, _checked = started, time.monotonic()
+            index = _index
+        elif (_refreshing or time.monotonic() - _checked <
+                settings.SEARCH_INDEX_REFRESH):
+            return _index
+        else:
+            _refreshing = refreshing = True
+            index, since = _index, _synced_at
+    if refreshing:
+        started = timezone.now()
+        try:
+            index = synced(index, since)
+            with _lock:
+                _index, _synced_at = index, started
+        finally:
+            with _lock:
+                _checked, _refreshing = time.monotonic(), False
+    path = settings.SEARCH_INDEX_SNAPSHOT
+    max_age = settings.SEARCH_INDEX_SNAPSHOT_MAX_AGE
+    if path and snapshot_age(path) > max_age / 2:
+        save_snapshot(index, path, started)
+    return index
+
+
+def loaded_index():
+    """The index of this process if it has been loaded, else None."""
+    return _index
+
+
+def reset():
+    """Forgets the index of this process, e.g. between tests."""
+    global _index, _synced_at, _checked, _refreshing
+    with _lock:
+        _index, _synced_at, _checked, _refreshing = None, None, 0, False
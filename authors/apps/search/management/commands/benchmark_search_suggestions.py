@@ -0,0 +1,81 @@
+import random
+import string
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from authors.apps.search.index import SuggestIndex
+
+
+class Command(BaseCommand):
+    help = ('Times suggestions for every one and two letter prefix, and '
+            'updates, on a synthetic index without the database. Fails if '
+            'the slowest suggestion takes longer than --max-ms.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--articles', type=int, default=250000,
+                            help='Titles of three words, each a key.')
+        parser.add_argument('--users', type=int, default=50000)
+        parser.add_argument('--updates', type=int, default=5000,
+                            help='New articles and likes applied.')
+        parser.add_argument('--max-ms', type=float, default=1.0)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        shuffle = random.Random(options['seed'])
+        words = [''.join(shuffle.choice(string.ascii_lowercase)
+                         for _ in range(shuffle.randint(3, 10)))
+                 for _ in range(20000)]
+
+        def title():
+            return ' '.join(shuffle.sample(words, 3))
+
+        rows = [('article', pk, {'text': title(), 'slug': str(pk),
+                                 'score': shuffle.randrange(100)})
+                for pk in range(options['articles'])]
+        rows.extend(('user', pk, {'text': shuffle.choice(words) + str(pk),
+                                  'score': shuffle.randrange(100)})
+                    for pk in range(options['users']))
+        index = SuggestIndex()
+        started = time.monotonic()
+        index.load(rows)
+        self.stdout.write('Indexed {} entries, {} keys: {:.2f}s'.format(
+            len(index), len(index.keys), time.monotonic() - started))
+
+        prefixes = list(string.ascii_lowercase) + [
+            first + second for first in string.ascii_lowercase
+            for second in string.ascii_lowercase]
+        slowest = self.report('Suggested', [
+            self.time(index.suggest, prefix) for prefix in prefixes])
+
+        updates = []
+        for update in range(options['updates']):
+            if update % 2:
+                kind, pk, doc = shuffle.choice(rows)
+                doc = dict(doc, score=doc['score'] + 1)
+            else:
+                kind, pk = 'article', options['articles'] + update
+                doc = {'text': title(), 'slug': str(pk), 'score': 0}
+            updates.append(self.time(index.add, kind, pk, **doc))
+        self.report('Added or liked', updates)
+        slowest = max(slowest, self.report('Suggested after updates', [
+            self.time(index.suggest, prefix) for prefix in prefixes]))
+
+        if slowest > options['max_ms']:
+            raise CommandError(
+                'The slowest suggestion took {:.3f} ms, over {} ms'.format(
+                    slowest, options['max_ms']))
+
+    def time(self, function, *args, **kwargs):
+        started = time.perf_counter()
+        function(*args, **kwargs)
+        return (time.perf_counter() - started) * 1000
+
+    def report(self, what, timings):
+        timings = sorted(timings)
+        self.stdout.write(
+            '{} {} times: median {:.3f} ms, 99th percentile {:.3f} ms, '
+            'slowest {:.3f} ms'.format(
+                what, len(timings), timings[len(timings) // 2],
+                timings[len(timings) * 99 // 100], timings[-1]))
+        return timings[-1]
@@ -0,0 +1,28 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from authors.apps.search.index import build, save_snapshot
+
+
+class Command(BaseCommand):
+    help = ('Builds the search suggestion index from the database and '
+            'writes it to the snapshot processes start from.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path', default=None,
+            help='Where to write the snapshot (SEARCH_INDEX_SNAPSHOT).')
+
+    def handle(self, *args, **options):
+        path = options['path'] or settings.SEARCH_INDEX_SNAPSHOT
+        if not path:
+            raise CommandError('No snapshot path: set SEARCH_INDEX_SNAPSHOT '
+                               'or pass --path.')
+        started, taken_at = time.monotonic(), timezone.now()
+        index = build()
+        save_snapshot(index, path, taken_at)
+        self.stdout.write('Indexed {} entries in {:.2f}s, written to {}'.format(
+            len(index), time.monotonic() - started, path))
@@ -0,0 +1,14 @@
+from django.db import models
+from django.utils import timezone
+
+
+class IndexChange(models.Model):
+    """
+    An entry of the suggestion index that changed, recorded in the same
+    transaction as the change so every process can pick it up in
+    `index.catch_up()`. A row without a `kind` asks them to rebuild their
+    index instead, e.g. after a bulk import.
+    """
+    kind = models.CharField(max_length=10, blank=True)
+    object_id = models.IntegerField(null=True)
+    changed_at = models.DateTimeField(default=timezone.now, db_index=True)
@@ -0,0 +1,82 @@
+"""
+Records changes to indexed articles, users, profiles, tags and reactions
+as `IndexChange` rows, for other processes to catch up with, and applies
+them to this process' suggestion index, if it has been loaded, once they
+commit.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from taggit.models import Tag
+
+from authors.apps.articles.models import (Article, LikeArticles,
+                                          reaction_changed)
+from authors.apps.authentication.models import User
+from authors.apps.profiles.models import Profile
+from authors.apps.tags.models import ArticleTag
+
+from . import index
+
+
+def changed(kind, pk):
+    index.record_change(kind, pk)
+
+    def apply():
+        suggest_index = index.loaded_index()
+        if suggest_index is not None:
+            index.refresh(suggest_index, kind, [pk])
+    transaction.on_commit(apply)
+
+
+@receiver(post_save, sender=Article)
+@receiver(post_delete, sender=Article)
+def article_changed(sender, instance, **kwargs):
+    # also covers articles being published or unpublished
+    changed('article', instance.pk)
+
+
+@receiver(post_save, sender=Article)
+def article_published(sender, instance, created, **kwargs):
+    # tags are ranked by their published articles
+    if not created and getattr(instance, 'saved_is_published',
+                               None) != instance.is_published:
+        for tag_id in ArticleTag.objects.filter(
+                article_id=instance.pk).values_list('tag_id', flat=True):
+            changed('tag', tag_id)
+
+
+@receiver(post_save, sender=LikeArticles)
+@receiver(post_delete, sender=LikeArticles)
+def article_liked(sender, instance, **kwargs):
+    # articles are ranked by likes, which leave the article unmodified
+    changed('article', instance.article_id)
+
+
+@receiver(reaction_changed)
+def article_reacted_to(sender, article_id, **kwargs):
+    changed('article', article_id)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    changed('user', instance.pk)
+
+
+@receiver(post_save, sender=Profile)
+def profile_saved(sender, instance, **kwargs):
+    # followers are counted on the profile
+    changed('user', instance.user_id)
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def tag_changed(sender, instance, **kwargs):
+    changed('tag', instance.pk)
+
+
+@receiver(post_save, sender=ArticleTag)
+@receiver(post_delete, sender=ArticleTag)
+def article_tags_changed(sender, instance, **kwargs):
+    # the tag's article count changed
+    changed('tag', instance.tag_id)
@@ -0,0 +1,192 @@
+import os
+import random
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from authors.apps.articles.models import Article, LikeArticles
+from authors.apps.authentication.models import User
+
+from . import index
+from .index import SuggestIndex
+
+
+def texts(suggestions):
+    return [suggestion['text'] for suggestion in suggestions]
+
+
+class TestSuggestIndex(TestCase):
+
+    def setUp(self):
+        self.index = SuggestIndex()
+        self.index.add('article', 1, 'Getting started with Django', 3,
+                       slug='getting-started')
+        self.index.add('article', 2, 'Django tips', 7, slug='django-tips')
+        self.index.add('user', 1, 'djangonaut', 1)
+        self.index.add('tag', 1, 'django', 10)
+        self.index.add('tag', 2, 'flask', 20)
+
+    def test_matches_are_ranked_by_popularity(self):
+        self.assertEqual(texts(self.index.suggest('Djan')), [
+            'django', 'Django tips', 'Getting started with Django',
+            'djangonaut'])
+
+    def test_titles_match_from_any_word(self):
+        suggestions = self.index.suggest('sta', kinds=['article'])
+        self.assertEqual(suggestions, [{
+            'type': 'article', 'id': 1, 'text': 'Getting started with Django',
+            'score': 3, 'slug': 'getting-started'}])
+
+    def test_kinds_and_limit(self):
+        self.assertEqual(texts(self.index.suggest('d', ['user', 'tag'], 1)),
+                         ['django'])
+
+    def test_updates_apply_at_once(self):
+        self.index.suggest('djan')
+        self.index.add('article', 2, 'Flask tips', 7, slug='flask-tips')
+        self.index.remove('tag', 1)
+        self.assertEqual(texts(self.index.suggest('djan')), [
+            'Getting started with Django', 'djangonaut'])
+        self.assertEqual(texts(self.index.suggest('fl')), [
+            'flask', 'Flask tips'])
+
+    @mock.patch.object(index, 'BLOCK_SIZE', 4)
+    @mock.patch.object(index, 'RANKED', 3)
+    def test_kept_rankings_match_a_full_ranking(self):
+        words = ['apple', 'apricot', 'avocado', 'banana', 'blueberry']
+        shuffle = random.Random(0)
+        self.index.load([])
+        for _ in range(300):
+            kind = shuffle.choice(index.KINDS)
+            pk = shuffle.randrange(15)
+            if shuffle.random() < 0.2:
+                self.index.remove(kind, pk)
+            else:
+                self.index.add(kind, pk, ' '.join(shuffle.sample(words, 2)),
+                               shuffle.randrange(5))
+            for prefix in ('a', 'ap', 'b', 'blu', 'django'):
+                expected = sorted(
+                    (ref for ref, doc in self.index.docs.items()
+                     if any(key.startswith(prefix)
+                            for key in index.keys_for(ref[0], doc['text']))),
+                    key=self.index.rank)[:2]
+                self.assertEqual(
+                    [(suggestion['type'], suggestion['id'])
+                     for suggestion in self.index.suggest(prefix, limit=2)],
+                    expected)
+
+    def test_snapshot_round_trip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'index.json.gz')
+            index.save_snapshot(self.index, path, index.timezone.now())
+            loaded, taken_at = index.load_snapshot(path, max_age=60)
+        self.assertEqual(len(loaded), 5)
+        self.assertEqual(loaded.suggest('djan'), self.index.suggest('djan'))
+
+
+@override_settings(SEARCH_INDEX_SNAPSHOT='')
+class TestSuggestView(TestCase):
+
+    def setUp(self):
+        index.reset()
+        self.addCleanup(index.reset)
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            'pythonista', 'pythonista@mail.com', 'password123')
+        self.popular = Article.objects.create(
+            title='Python packaging', description='About', body='Body',
+            author=self.user, is_published=True)
+        Article.objects.create(
+            title='Learning python', description='About', body='Body',
+            author=self.user, is_published=True)
+        Article.objects.create(
+            title='Python drafts', description='About', body='Body',
+            author=self.user)
+        LikeArticles.objects.create(
+            user=self.user, article=self.popular, likes=1)
+        self.popular.tags.add('python')
+        self.url = reverse('search:suggest')
+
+    def test_suggest(self):
+        response = self.client.get(self.url, {'q': 'pyth'})
+        self.assertEqual(response.status_code, 200)
+        # equally popular matches come shortest first
+        self.assertEqual(texts(response.data['suggestions']), [
+            'python', 'Python packaging', 'pythonista', 'Learning python'])
+        self.assertEqual(response.data['suggestions'][1]['slug'],
+                         self.popular.slug)
+
+    def test_suggest_types(self):
+        response = self.client.get(self.url, {'q': 'pyth', 'types': 'tag'})
+        self.assertEqual(texts(response.data['suggestions']), ['python'])
+        response = self.client.get(self.url, {'q': 'pyth', 'types': 'post'})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get(self.url, {'q': 'pyth', 'limit': 100})
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(SEARCH_INDEX_SNAPSHOT='', SEARCH_INDEX_REFRESH=3600)
+class TestSuggestIndexUpdates(TransactionTestCase):
+
+    def setUp(self):
+        index.reset()
+        self.addCleanup(index.reset)
+        self.user = User.objects.create_user(
+            'writer', 'writer@mail.com', 'password123')
+        self.article = Article.objects.create(
+            title='Old title', description='About', body='Body',
+            author=self.user, is_published=True)
+
+    def test_saves_and_deletes_update_a_loaded_index(self):
+        suggest_index = index.get_index()
+        self.article.title = 'New title'
+        self.article.save()
+        self.article.tags.add('news')
+        self.assertEqual(texts(suggest_index.suggest('new')),
+                         ['news', 'New title'])
+        self.assertEqual(suggest_index.suggest('news')[0]['score'], 1)
+
+        self.article.delete()
+        self.assertEqual(texts(suggest_index.suggest('new')), ['news'])
+        self.assertEqual(suggest_index.suggest('news')[0]['score'], 0)
+
+    def test_likes_and_publishing_update_a_loaded_index(self):
+        suggest_index = index.get_index()
+        LikeArticles.react_to_article(self.user, self.article, 1)
+        self.assertEqual(suggest_index.suggest('old')[0]['score'], 1)
+        self.article.is_published = False
+        self.article.save()
+        self.assertEqual(texts(suggest_index.suggest('old')), [])
+
+    def test_catch_up_applies_changes_made_elsewhere(self):
+        doomed = Article.objects.create(
+            title='Doomed', description='About', body='Body',
+            author=self.user, is_published=True)
+        suggest_index = index.get_index()
+        synced_at = index.timezone.now()
+        # as another process would, so without applying them here
+        with mock.patch.object(index, 'loaded_index', return_value=None):
+            Article.objects.filter(pk=self.article.pk).update(title='Renamed')
+            index.record_change('article', self.article.pk)
+            User.objects.create_user('other', 'other@mail.com',
+                                     'password123')
+            doomed.delete()
+        self.assertEqual(texts(suggest_index.suggest('oth')), [])
+        self.assertTrue(index.catch_up(suggest_index, synced_at))
+        self.assertEqual(texts(suggest_index.suggest('renam')), ['Renamed'])
+        self.assertEqual(texts(suggest_index.suggest('old')), [])
+        self.assertEqual(texts(suggest_index.suggest('oth')), ['other'])
+        self.assertEqual(texts(suggest_index.suggest('doom')), [])
+
+    def test_catch_up_asks_for_a_rebuild(self):
+        suggest_index = index.get_index()
+        synced_at = index.timezone.now()
+        index.record_rebuild()
+        self.assertFalse(index.catch_up(suggest_index, synced_at))
+        with override_settings(SEARCH_INDEX_CHANGES_KEPT=60):
+            self.assertFalse(index.catch_up(
+                suggest_index, synced_at - timedelta(minutes=5)))
@@ -0,0 +1,7 @@
+from django.urls import path
+
+from .views import SuggestView
+
+urlpatterns = [
+    path('search/suggest/', SuggestView.as_view(), name='suggest'),
+]
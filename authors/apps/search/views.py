@@ -0,0 +1,36 @@
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .index import KINDS, get_index
+
+
+class SuggestView(APIView):
+    """
+    Typeahead suggestions: the most popular article titles, usernames and
+    tags starting with `?q=`, optionally limited to `?types=article,tag`
+    """
+    permission_classes = (AllowAny,)
+    DEFAULT_LIMIT = 10
+    MAX_LIMIT = 25
+
+    def get(self, request):
+        kinds = [kind for kind in request.GET.get(
+            'types', ','.join(KINDS)).split(',') if kind]
+        unknown = set(kinds) - set(KINDS)
+        if unknown:
+            return Response({
+                "message": "Unknown types: {}. Use {}".format(
+                    ', '.join(sorted(unknown)), ', '.join(KINDS))
+            }, status=400)
+        try:
+            limit = int(request.GET.get('limit', self.DEFAULT_LIMIT))
+        except ValueError:
+            limit = 0
+        if not 0 < limit <= self.MAX_LIMIT:
+            return Response({
+                "message": "limit must be between 1 and {}".format(
+                    self.MAX_LIMIT)
+            }, status=400)
+        return Response({"suggestions": get_index().suggest(
+            request.GET.get('q', ''), kinds, limit)}, status=200)
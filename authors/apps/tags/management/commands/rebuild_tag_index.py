@@ -0,0 +1,46 @@
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Count
+from taggit.models import TaggedItem
+
+from authors.apps.articles.models import Article
+from authors.apps.tags.models import ArticleTag, TagStat
+
+
+class Command(BaseCommand):
+    help = ('Rebuilds the article tag index and the counts of published '
+            'articles per tag from the tags stored by taggit.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--if-empty', action='store_true',
+            help='Only rebuild when the index has never been built.')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        if options['if_empty'] and ArticleTag.objects.exists():
+            return
+        content_type = ContentType.objects.get_for_model(Article)
+        tagged = TaggedItem.objects.filter(
+            content_type=content_type).values_list('tag_id', 'object_id')
+        with transaction.atomic():
+            # plain SQL, so the count signals do not fire for every row
+            with connection.cursor() as cursor:
+                for model in (ArticleTag, TagStat):
+                    cursor.execute('DELETE FROM {}'.format(
+                        connection.ops.quote_name(model._meta.db_table)))
+            batch = []
+            for tag_id, article_id in tagged.distinct().iterator():
+                batch.append(ArticleTag(tag_id=tag_id, article_id=article_id))
+                if len(batch) == options['batch_size']:
+                    ArticleTag.objects.bulk_create(batch)
+                    batch = []
+            ArticleTag.objects.bulk_create(batch)
+            TagStat.objects.bulk_create(
+                TagStat(tag_id=row['tag_id'], article_count=row['count'])
+                for row in ArticleTag.objects.filter(
+                    article__is_published=True).values('tag_id').annotate(
+                    count=Count('id')).order_by())
+        self.stdout.write('Indexed {} tags on {} articles.'.format(
+            TagStat.objects.count(), ArticleTag.objects.count()))
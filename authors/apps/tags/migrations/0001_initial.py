@@ -0,0 +1,43 @@
+# Generated by Django 2.1.7 on 2026-10-19 17:02
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('taggit', '0003_taggeditem_add_unique_index'),
+        ('articles', '0002_auto_20261019_1702'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArticleTag',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('article', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tag_index', to='articles.Article')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='TagStat',
+            fields=[
+                ('tag', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stat', serialize=False, to='taggit.Tag')),
+                ('article_count', models.PositiveIntegerField(db_index=True, default=0)),
+            ],
+            options={
+                'ordering': ('-article_count', 'tag__name'),
+            },
+        ),
+        migrations.AddField(
+            model_name='articletag',
+            name='tag',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='article_index', to='taggit.Tag'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='articletag',
+            unique_together={('tag', 'article')},
+        ),
+    ]
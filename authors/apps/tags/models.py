@@ -0,0 +1,99 @@
+from django.db import models
+from django.db.models import Count, F
+from taggit.models import Tag
+
+from authors.apps.articles.models import Article
+
+
+class ArticleTagQuerySet(models.QuerySet):
+
+    def articles(self, names, match_all=False):
+        """
+        Articles tagged with any of `names`, or with all of them when
+        `match_all` is set. Every tag is matched through the (tag, article)
+        index, so a popular tag costs no more than a rare one.
+        """
+        names = set(names)
+        tag_ids = list(Tag.objects.filter(
+            name__in=names).values_list('id', flat=True))
+        if not tag_ids or (match_all and len(tag_ids) < len(names)):
+            return Article.objects.none()
+        if match_all:
+            articles = Article.objects.all()
+            for tag_id in tag_ids:
+                articles = articles.filter(tag_index__tag_id=tag_id)
+            return articles
+        return Article.objects.filter(id__in=self.filter(
+            tag_id__in=tag_ids).values('article_id'))
+
+
+class ArticleTag(models.Model):
+    """
+    One row per tag on an article, mirroring taggit's `TaggedItem` for
+    articles. Unlike `TaggedItem` it is indexed on (tag, article), which
+    lets articles for a tag be read in id order straight off the index.
+    Kept in sync by `tags/signals.py`.
+    """
+    tag = models.ForeignKey(Tag, related_name='article_index',
+                            on_delete=models.CASCADE)
+    article = models.ForeignKey(Article, related_name='tag_index',
+                                on_delete=models.CASCADE)
+
+    objects = ArticleTagQuerySet.as_manager()
+
+    class Meta:
+        unique_together = ('tag', 'article')
+
+
+class TagStat(models.Model):
+    """How many published articles carry a tag, kept up to date
+    incrementally."""
+    tag = models.OneToOneField(Tag, primary_key=True, related_name='stat',
+                               on_delete=models.CASCADE)
+    article_count = models.PositiveIntegerField(default=0, db_index=True)
+
+    class Meta:
+        ordering = ('-article_count', 'tag__name')
+
+    @staticmethod
+    def increment(tag_id):
+        TagStat.objects.get_or_create(tag_id=tag_id)
+        TagStat.objects.filter(tag_id=tag_id).update(
+            article_count=F('article_count') + 1)
+
+    @staticmethod
+    def decrement(tag_id):
+        TagStat.objects.filter(tag_id=tag_id, article_count__gt=0).update(
+            article_count=F('article_count') - 1)
+
+    @staticmethod
+    def add(counts):
+        """
+        Adds `counts`, articles by tag id, in one UPDATE per distinct
+        count, creating the rows of tags not counted yet. Counts may be
+        negative, but never take a tag's count below zero.
+        """
+        counted = set(TagStat.objects.filter(
+            tag_id__in=counts).values_list('tag_id', flat=True))
+        TagStat.objects.bulk_create(
+            TagStat(tag_id=tag_id, article_count=count)
+            for tag_id, count in counts.items()
+            if tag_id not in counted and count > 0)
+        by_count = {}
+        for tag_id in counted:
+            by_count.setdefault(counts[tag_id], []).append(tag_id)
+        for count, tag_ids in by_count.items():
+            TagStat.objects.filter(
+                tag_id__in=tag_ids, article_count__gte=-count).update(
+                article_count=F('article_count') + count)
+
+    @staticmethod
+    def recount(tag_ids):
+        """Counts the published articles of `tag_ids` afresh."""
+        counts = dict(ArticleTag.objects.filter(
+            tag_id__in=tag_ids, article__is_published=True).values_list(
+            'tag_id').annotate(count=Count('id')).order_by())
+        for tag_id in tag_ids:
+            TagStat.objects.update_or_create(
+                tag_id=tag_id,
+                defaults={'article_count': counts.get(tag_id, 0)})
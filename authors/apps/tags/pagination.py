@@ -0,0 +1,9 @@
+from rest_framework.pagination import CursorPagination
+
+
+class TaggedArticlesPagination(CursorPagination):
+    """Newest first. Pages are found by article id, so a deep page costs
+    the same as the first."""
+    ordering = '-id'
+    page_size_query_param = 'limit'
+    max_page_size = 100
@@ -0,0 +1,12 @@
+from rest_framework import serializers
+
+from .models import TagStat
+
+
+class TagStatSerializer(serializers.ModelSerializer):
+    name = serializers.ReadOnlyField(source='tag.name')
+    slug = serializers.ReadOnlyField(source='tag.slug')
+
+    class Meta:
+        model = TagStat
+        fields = ('name', 'slug', 'article_count')
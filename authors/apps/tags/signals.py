@@ -0,0 +1,67 @@
+"""
+Keeps `ArticleTag` in step with taggit's `TaggedItem` for articles, and
+`TagStat` counts in step with `ArticleTag` rows of published articles.
+Counting on `ArticleTag` itself also covers rows removed by cascade when
+an article is deleted, which happens before the article row goes.
+"""
+from django.contrib.contenttypes.models import ContentType
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from taggit.models import TaggedItem
+
+from authors.apps.articles.models import Article
+
+from .models import ArticleTag, TagStat
+
+
+def is_article(tagged_item):
+    content_type = ContentType.objects.get_for_id(tagged_item.content_type_id)
+    return content_type.model_class() is Article
+
+
+@receiver(post_save, sender=TaggedItem)
+def article_tagged(sender, instance, created, **kwargs):
+    if created and is_article(instance):
+        ArticleTag.objects.get_or_create(
+            tag_id=instance.tag_id, article_id=instance.object_id)
+
+
+@receiver(post_delete, sender=TaggedItem)
+def article_untagged(sender, instance, **kwargs):
+    if is_article(instance):
+        for article_tag in ArticleTag.objects.filter(
+                tag_id=instance.tag_id, article_id=instance.object_id):
+            article_tag.delete()
+
+
+def is_published(article_id):
+    return Article.objects.filter(pk=article_id, is_published=True).exists()
+
+
+@receiver(post_save, sender=ArticleTag)
+def count_article_tag(sender, instance, created, **kwargs):
+    if created and is_published(instance.article_id):
+        TagStat.increment(instance.tag_id)
+
+
+@receiver(post_delete, sender=ArticleTag)
+def uncount_article_tag(sender, instance, **kwargs):
+    if is_published(instance.article_id):
+        TagStat.decrement(instance.tag_id)
+
+
+@receiver(post_save, sender=Article)
+def count_published_article(sender, instance, created, **kwargs):
+    if created:
+        # tags are added to an article once it exists
+        return
+    previous = getattr(instance, 'saved_is_published', None)
+    if previous == instance.is_published:
+        return
+    tag_ids = list(ArticleTag.objects.filter(
+        article_id=instance.pk).values_list('tag_id', flat=True))
+    if previous is None:
+        TagStat.recount(tag_ids)
+    else:
+        TagStat.add(dict.fromkeys(
+            tag_ids, 1 if instance.is_published else -1))
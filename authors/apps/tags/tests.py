@@ -0,0 +1,130 @@
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from authors.apps.articles.models import Article
+from authors.apps.authentication.models import User
+
+from .models import ArticleTag, TagStat
+
+
+class TagTestCase(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            'writer', 'writer@mail.com', 'password123')
+
+    def create_article(self, title, *tags, is_published=True):
+        article = Article.objects.create(
+            title=title, description='About', body='Body', author=self.user,
+            is_published=is_published)
+        article.tags.add(*tags)
+        return article
+
+    def counts(self):
+        return {stat.tag.name: stat.article_count
+                for stat in TagStat.objects.select_related('tag')}
+
+
+class TestTagCounts(TagTestCase):
+    """Tests for keeping tag counts up to date"""
+
+    def test_tagging_articles_counts_them(self):
+        self.create_article('One', 'python', 'django')
+        self.create_article('Two', 'python')
+        self.assertEqual(self.counts(), {'python': 2, 'django': 1})
+
+    def test_removing_tags_and_articles_uncounts_them(self):
+        first = self.create_article('One', 'python', 'django')
+        second = self.create_article('Two', 'python')
+        first.tags.remove('django')
+        second.delete()
+        self.assertEqual(self.counts(), {'python': 1, 'django': 0})
+
+    def test_replacing_tags_updates_counts(self):
+        article = self.create_article('One', 'python', 'django')
+        article.tags.set('api')
+        self.assertEqual(self.counts(), {'python': 0, 'django': 0, 'api': 1})
+
+    def test_only_published_articles_are_counted(self):
+        draft = self.create_article('Draft', 'python', is_published=False)
+        self.create_article('One', 'python')
+        self.assertEqual(self.counts(), {'python': 1})
+        draft.is_published = True
+        draft.save()
+        self.assertEqual(self.counts(), {'python': 2})
+        draft = Article.objects.get(pk=draft.pk)
+        draft.is_published = False
+        draft.save()
+        self.assertEqual(self.counts(), {'python': 1})
+        draft.delete()
+        self.assertEqual(self.counts(), {'python': 1})
+
+    def test_rebuild_matches_incremental_counts(self):
+        self.create_article('One', 'python', 'django')
+        self.create_article('Two', 'python')
+        self.create_article('Draft', 'python', is_published=False)
+        counts = self.counts()
+        TagStat.objects.all().delete()
+        call_command('rebuild_tag_index', stdout=open('/dev/null', 'w'))
+        self.assertEqual(self.counts(), counts)
+        self.assertEqual(ArticleTag.objects.count(), 4)
+
+    def test_tag_list_is_ordered_by_article_count(self):
+        self.create_article('One', 'django', 'python')
+        self.create_article('Two', 'python')
+        self.create_article('Three', 'python', 'api')
+        response = self.client.get(reverse('tags:tag-list'))
+        self.assertEqual(
+            [(tag['name'], tag['article_count'])
+             for tag in response.data['tags']],
+            [('python', 3), ('api', 1), ('django', 1)])
+
+
+class TestTagFilter(TagTestCase):
+    """Tests for listing articles by tag"""
+
+    def setUp(self):
+        super().setUp()
+        self.both = self.create_article('Both', 'python', 'django')
+        self.python = self.create_article('Python', 'python')
+        self.django = self.create_article('Django', 'django')
+        self.create_article('Other', 'api')
+
+    def titles(self, query):
+        response = self.client.get(reverse('articles:create-list') + query)
+        return [article['title'] for article in response.data['articles']]
+
+    def test_any_tag_matches_each_article_once(self):
+        self.assertEqual(self.titles('?tags=python,django'),
+                         ['Django', 'Python', 'Both'])
+
+    def test_all_tags_must_match(self):
+        self.assertEqual(self.titles('?tags=python,django&match=all'),
+                         ['Both'])
+
+    def test_unknown_tag_matches_nothing_when_all_required(self):
+        self.assertEqual(self.titles('?tags=python,missing&match=all'), [])
+
+    def test_invalid_match_is_rejected(self):
+        response = self.client.get(
+            reverse('articles:create-list') + '?tags=python&match=some')
+        self.assertEqual(response.status_code, 400)
+
+    def test_results_are_paginated_by_cursor(self):
+        url = reverse('articles:create-list') + '?tags=python,django&limit=2'
+        first = self.client.get(url)
+        self.assertEqual([article['title']
+                          for article in first.data['articles']],
+                         ['Django', 'Python'])
+        second = self.client.get(first.data['next'])
+        self.assertEqual([article['title']
+                          for article in second.data['articles']], ['Both'])
+        self.assertIsNone(second.data['next'])
+
+    def test_search_falls_back_to_tags_without_duplicates(self):
+        response = self.client.get(
+            reverse('articles:create-list') + '?search=python,django')
+        self.assertEqual(len(response.data['articles']), 3)
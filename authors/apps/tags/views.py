@@ -0,0 +1,26 @@
+from collections import OrderedDict
+
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .models import TagStat
+from .serializers import TagStatSerializer
+
+
+class TagListView(APIView):
+    """Lists tags in use, most used first"""
+    permission_classes = (AllowAny,)
+    pagination_class = LimitOffsetPagination
+
+    def get(self, request):
+        tags = TagStat.objects.filter(
+            article_count__gt=0).select_related('tag')
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(tags, request)
+        page_results = paginator.get_paginated_response(
+            TagStatSerializer(page, many=True).data)
+        return Response(OrderedDict(
+            ('tags', value) if key == 'results' else (key, value)
+            for key, value in page_results.data.items()))
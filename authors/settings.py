@@ -9,10 +9,7 @@ https://docs.djangoproject.com/en/1.11/ref/settings/
 
 import os
 import dj_database_url
-import cloudinary
 from decouple import config
-import cloudinary
-import dj_database_url
 
 # Build paths inside the project like this: os.path.join(BASE_DIR, ...)
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -38,7 +35,6 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
-    'django_nose',
 
     'corsheaders',
     'django_extensions',
@@ -55,7 +51,7 @@ INSTALLED_APPS = [
 
 
     'authors.apps.authentication',
-    'authors.apps.core',
+    'authors.apps.core.apps.CoreConfig',
     'authors.apps.profiles',
     'authors.apps.follow',
     'authors.apps.articles.apps.ArticlesConfig',
@@ -63,10 +59,15 @@ INSTALLED_APPS = [
     'authors.apps.report',
     'authors.apps.notify',
     'authors.apps.bookmark',
-    'authors.apps.stats'
+    'authors.apps.stats',
+    'authors.apps.outbox',
+    'authors.apps.tags.apps.TagsConfig',
+    'authors.apps.search.apps.SearchConfig',
 ]
 
 MIDDLEWARE = [
+    'authors.apps.core.middleware.QueryInstrumentationMiddleware',
+    'authors.apps.core.middleware.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -114,8 +115,58 @@ DATABASES = {
     'default': dj_database_url.config(default=config('DATABASE_URL'))
 }
 
-# Use nose to run all tests
-TEST_RUNNER = 'django_nose.NoseTestSuiteRunner'
+# Read replicas, as a comma separated list of database URLs. Safe-method
+# requests read from a replica unless the client wrote in the last
+# REPLICA_PIN_SECONDS; see authors.apps.core.routers.
+REPLICA_DATABASE_URLS = [
+    url.strip() for url in os.getenv('REPLICA_DATABASE_URLS', '').split(',')
+    if url.strip()
+]
+for number, url in enumerate(REPLICA_DATABASE_URLS, start=1):
+    DATABASES['replica_{}'.format(number)] = dict(
+        dj_database_url.parse(url), TEST={'MIRROR': 'default'})
+DATABASE_ROUTERS = ['authors.apps.core.routers.ReplicaRouter']
+
+# Cache. A table in the primary database by default, which every process
+# shares, so a write invalidates the object versions seen by all of them;
+# release-tasks.sh creates it with `createcachetable`. CACHE_BACKEND and
+# CACHE_LOCATION can point it at e.g. memcached instead. The test runner
+# swaps in local memory.
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND',
+            default='django.core.cache.backends.db.DatabaseCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', default='core_cache'),
+        'KEY_PREFIX': os.getenv('CACHE_KEY_PREFIX', default='ah'),
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.getenv('CACHE_MAX_ENTRIES',
+                                         default=100000)),
+        },
+    },
+    # rate limit counters, see authors.apps.core.throttling; a table of
+    # their own so culling the object cache never resets them
+    'throttle': {
+        'BACKEND': os.getenv(
+            'THROTTLE_CACHE_BACKEND',
+            default='django.core.cache.backends.db.DatabaseCache'),
+        'LOCATION': os.getenv('THROTTLE_CACHE_LOCATION',
+                              default='core_throttle'),
+        'KEY_PREFIX': os.getenv('CACHE_KEY_PREFIX', default='ah'),
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.getenv('THROTTLE_CACHE_MAX_ENTRIES',
+                                         default=100000)),
+        },
+    },
+}
+# Seconds a serialized article, profile or comment is kept
+OBJECT_CACHE_TIMEOUT = int(os.getenv('OBJECT_CACHE_TIMEOUT', default=3600))
+REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', default=5))
+
+# Use nose to run all tests. django_nose is left out of INSTALLED_APPS: the
+# runner adds the nose options to `manage.py test` itself, and as an app it
+# would import nose into every process. The runner turns throttling off.
+TEST_RUNNER = 'authors.apps.core.testing.TestRunner'
 
 # Password validation
 # https://docs.djangoproject.com/en/1.11/ref/settings/#auth-password-validators
@@ -179,7 +230,12 @@ REST_FRAMEWORK = {
         'authors.apps.authentication.backends.JWTAuthentication',
     ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
-    'PAGE_SIZE': 10
+    'PAGE_SIZE': 10,
+    'DEFAULT_THROTTLE_CLASSES': (
+        'authors.apps.core.throttling.ScopedThrottle',
+    ),
+    # Heroku's router appends the client's address to X-Forwarded-For
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES', default=1)),
 }
 SWAGGER_SETTINGS = {
     'SUPPORTED_SUBMIT_METHODS': [
@@ -198,6 +254,11 @@ SWAGGER_SETTINGS = {
         },
     },
 }
+# The OpenAPI schema, read from this file if it exists, e.g. one written
+# by `python manage.py generate_api_schema` into the build, and generated
+# by each process otherwise; see authors.apps.core.schema.
+API_SCHEMA_FILE = os.getenv(
+    'API_SCHEMA_FILE', default=os.path.join(BASE_DIR, 'openapi.json'))
 
 
 # Email configurations
@@ -208,14 +269,147 @@ EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD', default='')
 EMAIL_PORT = os.getenv('EMAIL_PORT', default=587)
 EMAIL_USE_TLS = os.getenv('EMAIL_USE_TLS', default=True)
 
-EMAIL_BACKEND = 'djcelery_email.backends.CeleryEmailBackend'
-CELERY_EMAIL_TASK_CONFIG = {
-    'queue': 'email',
-    'rate_limit': '50/m',
+EMAIL_BACKEND = os.getenv(
+    'EMAIL_BACKEND', default='django.core.mail.backends.smtp.EmailBackend')
+DEFAULT_FROM_EMAIL = os.getenv('FROM_EMAIL', default='webmaster@localhost')
+
+# Outbox configurations. Emails are queued in the database by the request
+# that triggers them and delivered by `python manage.py drain_outbox`. An
+# email to more than OUTBOX_MAX_RECIPIENTS is queued as several messages,
+# each sent in one SendGrid request and retried on its own.
+OUTBOX_BACKEND = os.getenv(
+    'OUTBOX_BACKEND', default='authors.apps.outbox.backends.SendGridBackend')
+OUTBOX_FILE_PATH = os.getenv(
+    'OUTBOX_FILE_PATH', default=os.path.join(BASE_DIR, 'outbox.jsonl'))
+OUTBOX_BATCH_SIZE = int(os.getenv('OUTBOX_BATCH_SIZE', default=50))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv('OUTBOX_MAX_ATTEMPTS', default=6))
+OUTBOX_RETRY_BACKOFF = int(os.getenv('OUTBOX_RETRY_BACKOFF', default=30))
+OUTBOX_RETRY_MAX_DELAY = int(os.getenv('OUTBOX_RETRY_MAX_DELAY', default=3600))
+OUTBOX_LEASE_SECONDS = int(os.getenv('OUTBOX_LEASE_SECONDS', default=300))
+OUTBOX_SEND_TIMEOUT = int(os.getenv('OUTBOX_SEND_TIMEOUT', default=10))
+OUTBOX_MAX_RECIPIENTS = int(os.getenv('OUTBOX_MAX_RECIPIENTS', default=1000))
+
+# Notification retention, see authors.apps.notify.retention. Notifications
+# older than their state's TTL (days, 0 keeps them forever) are deleted by
+# `python manage.py prune_notifications`, optionally archived first.
+NOTIFICATION_TTL_DAYS = {
+    'read': int(os.getenv('NOTIFICATION_READ_TTL_DAYS', default=30)),
+    'unread': int(os.getenv('NOTIFICATION_UNREAD_TTL_DAYS', default=180)),
+}
+NOTIFICATION_PRUNE_BATCH_SIZE = int(
+    os.getenv('NOTIFICATION_PRUNE_BATCH_SIZE', default=500))
+NOTIFICATION_ARCHIVE_DIR = os.getenv('NOTIFICATION_ARCHIVE_DIR', default='')
+
+# Search suggestions, see authors.apps.search.index. Each process checks
+# for changes made by others every SEARCH_INDEX_REFRESH seconds. With a
+# SEARCH_INDEX_SNAPSHOT path, e.g. /tmp/search-index.json.gz, processes
+# share a snapshot of the index and start from it instead of the database
+# while it is younger than SEARCH_INDEX_SNAPSHOT_MAX_AGE seconds. Changes
+# are kept for SEARCH_INDEX_CHANGES_KEPT seconds; a process whose index is
+# older than that rebuilds it.
+SEARCH_INDEX_REFRESH = int(os.getenv('SEARCH_INDEX_REFRESH', default=60))
+SEARCH_INDEX_SNAPSHOT = os.getenv('SEARCH_INDEX_SNAPSHOT', default='')
+SEARCH_INDEX_SNAPSHOT_MAX_AGE = int(
+    os.getenv('SEARCH_INDEX_SNAPSHOT_MAX_AGE', default=3600))
+SEARCH_INDEX_CHANGES_KEPT = int(
+    os.getenv('SEARCH_INDEX_CHANGES_KEPT', default=86400))
+
+# Related articles, see authors.apps.articles.related. Each article lists
+# its RELATED_ARTICLES_COUNT most similar articles by the TF-IDF of the
+# RELATED_ARTICLES_TERMS most common words, RELATED_ARTICLES_BLOCK_SIZE
+# articles being compared with the others at a time. The words and their
+# weights are worked out again once the number of published articles has
+# changed by RELATED_ARTICLES_REBUILD_DRIFT (a fraction) since, or after
+# RELATED_ARTICLES_REBUILD_DAYS.
+RELATED_ARTICLES_COUNT = int(os.getenv('RELATED_ARTICLES_COUNT', default=5))
+RELATED_ARTICLES_TERMS = int(
+    os.getenv('RELATED_ARTICLES_TERMS', default=20000))
+RELATED_ARTICLES_BLOCK_SIZE = int(
+    os.getenv('RELATED_ARTICLES_BLOCK_SIZE', default=256))
+RELATED_ARTICLES_REBUILD_DRIFT = float(
+    os.getenv('RELATED_ARTICLES_REBUILD_DRIFT', default=0.2))
+RELATED_ARTICLES_REBUILD_DAYS = float(
+    os.getenv('RELATED_ARTICLES_REBUILD_DAYS', default=7))
+
+# Trending scores, see authors.apps.articles.trending. Each event weighs its
+# TRENDING_WEIGHTS entry, halving every TRENDING_HALF_LIFE_HOURS; a review
+# weighs its rating out of 5 times its entry. The 'article' entry, for the
+# article's creation, must be above 0.
+TRENDING_HALF_LIFE_HOURS = float(
+    os.getenv('TRENDING_HALF_LIFE_HOURS', default=48))
+TRENDING_WEIGHTS = {
+    'article': float(os.getenv('TRENDING_ARTICLE_WEIGHT', default=1)),
+    'like': float(os.getenv('TRENDING_LIKE_WEIGHT', default=1)),
+    'comment': float(os.getenv('TRENDING_COMMENT_WEIGHT', default=2)),
+    'favorite': float(os.getenv('TRENDING_FAVORITE_WEIGHT', default=2)),
+    'bookmark': float(os.getenv('TRENDING_BOOKMARK_WEIGHT', default=2)),
+    'review': float(os.getenv('TRENDING_REVIEW_WEIGHT', default=3)),
+}
+
+# Rate limits, see authors.apps.core.throttling. Views name their rule with
+# `throttle_scope`; rates are 'count/period', the period one of s, m, h or d.
+THROTTLE_ENABLED = os.getenv(
+    'THROTTLE_ENABLED', default='True').lower() == 'true'
+THROTTLE_RULES = {
+    'login': {'algorithm': 'sliding_window', 'by': 'ip',
+              'rate': os.getenv('THROTTLE_LOGIN_RATE', default='10/min')},
+    'registration': {
+        'algorithm': 'sliding_window', 'by': 'ip',
+        'rate': os.getenv('THROTTLE_REGISTRATION_RATE', default='5/hour')},
+    # reset emails per user, counted by User.dispatch_reset_token
+    'password_reset': {
+        'algorithm': 'sliding_window',
+        'rate': os.getenv('THROTTLE_PASSWORD_RESET_RATE', default='3/day')},
+    'reactions': {
+        'algorithm': 'token_bucket', 'by': 'user',
+        'rate': os.getenv('THROTTLE_REACTIONS_RATE', default='60/min')},
+    'comments': {
+        'algorithm': 'token_bucket', 'by': 'user',
+        'rate': os.getenv('THROTTLE_COMMENTS_RATE', default='20/min')},
+    'highlights': {
+        'algorithm': 'token_bucket', 'by': 'user',
+        'rate': os.getenv('THROTTLE_HIGHLIGHTS_RATE', default='30/min')},
 }
 
-cloudinary.config(
-    cloud_name=os.getenv("CLOUDINARY_NAME"),
-    api_key=os.getenv("CLOUDINARY_API_KEY"),
-    api_secret=os.getenv("CLOUDINARY_API_SECRET")
-)
+# Batched requests, see authors.apps.core.batch. Consecutive GETs in a batch
+# run concurrently on BATCH_MAX_WORKERS threads per process.
+BATCH_MAX_REQUESTS = int(os.getenv('BATCH_MAX_REQUESTS', default=20))
+BATCH_MAX_WORKERS = int(os.getenv('BATCH_MAX_WORKERS', default=4))
+
+# Startup, see authors.apps.core.startup. authors/wsgi.py warms the process
+# up before serving, which under `gunicorn --preload` happens once before the
+# workers fork; WARMUP_SEARCH_INDEX also loads the search suggestion index.
+STARTUP_WARMUP = os.getenv('STARTUP_WARMUP', default='True').lower() == 'true'
+WARMUP_SEARCH_INDEX = os.getenv(
+    'WARMUP_SEARCH_INDEX', default='False').lower() == 'true'
+
+# SQL instrumentation. When enabled, every response carries a Server-Timing
+# header and requests with N+1 query patterns are logged.
+SQL_INSTRUMENTATION = os.getenv(
+    'SQL_INSTRUMENTATION', default='False').lower() == 'true'
+SQL_N_PLUS_ONE_THRESHOLD = int(os.getenv('SQL_N_PLUS_ONE_THRESHOLD', default=5))
+SQL_QUERY_LOG_THRESHOLD = int(os.getenv('SQL_QUERY_LOG_THRESHOLD', default=50))
+
+# Outbound calls to third party services, see authors.apps.core.outbound.
+# Each service gets a timeout (seconds), a limit on concurrent calls and a
+# circuit breaker that opens after `failure_threshold` consecutive failures
+# for `reset_timeout` seconds.
+OUTBOUND_MAX_WORKERS = int(os.getenv('OUTBOUND_MAX_WORKERS', default=16))
+OUTBOUND_TIMEOUT = float(os.getenv('OUTBOUND_TIMEOUT', default=5))
+OUTBOUND_SERVICES = {
+    'cloudinary': {
+        'timeout': float(os.getenv('CLOUDINARY_TIMEOUT', default=20)),
+        'max_concurrent': 4,
+    },
+    'sendgrid': {'timeout': OUTBOX_SEND_TIMEOUT, 'max_concurrent': 2},
+    'google': {'timeout': OUTBOUND_TIMEOUT},
+    'facebook': {'timeout': OUTBOUND_TIMEOUT},
+    'twitter': {'timeout': OUTBOUND_TIMEOUT},
+}
+
+# read by cloudinary when it is first imported
+CLOUDINARY = {
+    'cloud_name': os.getenv("CLOUDINARY_NAME"),
+    'api_key': os.getenv("CLOUDINARY_API_KEY"),
+    'api_secret': os.getenv("CLOUDINARY_API_SECRET"),
+}
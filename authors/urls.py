@@ -20,20 +20,7 @@ from django.contrib import admin
 from django.conf.urls import url
 
 
-from rest_framework import permissions
-from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
-
-schema_view = get_schema_view(
-    openapi.Info(
-        title="Authors Haven API",
-        default_version='v1',
-        description="Auhtors Haven is an app for the creative at heart",
-        contact=openapi.Contact(email="authorshaven24@gmail.com"),
-        license=openapi.License(name="MIT License"),
-    ),
-    public=True,
-    permission_classes=(permissions.AllowAny,))
+from authors.apps.core.schema import SchemaView
 
 
 urlpatterns = [
@@ -49,6 +36,12 @@ urlpatterns = [
                          namespace='follow')),
     path('api/', include(('authors.apps.report.urls', 'authors.apps.report'),
                          namespace='report')),
+    path('api/', include(('authors.apps.core.urls', 'authors.apps.core'),
+                         namespace='core')),
+    path('api/', include(('authors.apps.tags.urls', 'authors.apps.tags'),
+                         namespace='tags')),
+    path('api/', include(('authors.apps.search.urls', 'authors.apps.search'),
+                         namespace='search')),
     path(
         'api/',
         include(
@@ -71,11 +64,11 @@ urlpatterns = [
         )
     ),
 
-    path('api/redoc/', schema_view.with_ui('redoc',
-                                           cache_timeout=0),
+    path('api/redoc/', SchemaView.with_ui('redoc',
+                                          cache_timeout=0),
          name='schema-redoc'),
-    path('api/swagger/', schema_view.with_ui('swagger',
-                                             cache_timeout=0),
+    path('api/swagger/', SchemaView.with_ui('swagger',
+                                            cache_timeout=0),
          name='schema-swagger-ui'),
     path(
         'api/',
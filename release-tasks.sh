@@ -1,5 +1,7 @@
+python manage.py createcachetable
 python manage.py makemigrations authentication
 python manage.py migrate authentication
+python manage.py dedupe_article_reactions
 python manage.py makemigrations articles
 python manage.py migrate articles
 python manage.py makemigrations comments
@@ -9,4 +11,9 @@ python manage.py migrate follow
 python manage.py makemigrations profiles
 python manage.py migrate profiles
 python manage.py makemigrations
-python manage.py migrate
\ No newline at end of file
+python manage.py migrate
+python manage.py rebuild_tag_index --if-empty
+python manage.py rebuild_article_ratings --if-empty
+python manage.py backfill_article_excerpts
+python manage.py relate_articles
+python manage.py compute_trending_scores